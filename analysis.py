@@ -0,0 +1,242 @@
+"""
+Single-pass analysis of the Graphgif AST.
+SemanticValidator, GraphAnalyzer and GraphStatisticsVisitor each walk the whole program, and
+the validator makes three passes of its own. AnalysisPass walks a program once, in the order
+of BaseASTVisitor, and hands every node to the hooks of its plugins. The built-in plugins fill
+the same objects the separate visitors produce, with the same errors, warnings, graph
+information and statistics; new checks are added with register_plugin.
+"""
+
+from typing import Callable, Dict, Iterable, List, Optional
+
+from models import (
+    Program, VarDecl, GraphDecl, NodeDecl, EdgeDecl, Command,
+    AttrList, NodeList, EdgeList, NodeVarRef, Statement
+)
+from validation import GraphAnalyzer, SemanticValidator
+from visitors.statistics_visitor import GraphStatisticsVisitor
+
+# Methods a plugin may define; each is called with the node it is named after
+HOOKS = (
+    'begin_program', 'visit_var_decl', 'visit_graph_decl', 'visit_node_decl', 'visit_edge_decl',
+    'visit_attr_list', 'visit_node_list', 'end_graph_decl', 'visit_command', 'end_program',
+)
+
+
+class AnalysisPass:
+    """
+    Runs plugins over a program in one traversal.
+    A plugin is any object defining some of HOOKS; visit_edge_decl, visit_attr_list and
+    visit_node_list are also called for the contents of variable declarations, outside any
+    graph. Plugins keep their findings in a result attribute.
+    """
+
+    def __init__(self, plugins: Iterable[object] = ()):
+        self.plugins: List[object] = []
+        self._hooks: Dict[str, List[Callable]] = {name: [] for name in HOOKS}
+        for plugin in plugins:
+            self.register(plugin)
+
+    def register(self, plugin: object) -> object:
+        self.plugins.append(plugin)
+        for name in HOOKS:
+            hook = getattr(plugin, name, None)
+            if hook is not None:
+                self._hooks[name].append(hook)
+        return plugin
+
+    def run(self, program: Program) -> None:
+        hooks = self._hooks
+        var_decl_hooks, graph_decl_hooks = hooks['visit_var_decl'], hooks['visit_graph_decl']
+        node_decl_hooks, edge_decl_hooks = hooks['visit_node_decl'], hooks['visit_edge_decl']
+        attr_list_hooks, node_list_hooks = hooks['visit_attr_list'], hooks['visit_node_list']
+
+        for hook in hooks['begin_program']:
+            hook(program)
+
+        for var_decl in program.variable_declarations:
+            for hook in var_decl_hooks:
+                hook(var_decl)
+            value = var_decl.value
+            if isinstance(value, NodeList):
+                for hook in node_list_hooks:
+                    hook(value)
+            elif isinstance(value, AttrList):
+                for hook in attr_list_hooks:
+                    hook(value)
+            elif isinstance(value, EdgeList):
+                for edge in value.edges:
+                    self._edge_decl(edge, edge_decl_hooks, attr_list_hooks)
+
+        for graph_decl in program.graph_declarations:
+            for hook in graph_decl_hooks:
+                hook(graph_decl)
+            for global_attr in graph_decl.global_attributes:
+                if isinstance(global_attr.attributes, AttrList):
+                    for hook in attr_list_hooks:
+                        hook(global_attr.attributes)
+            for statement in graph_decl.statements:
+                if isinstance(statement, EdgeDecl):
+                    for hook in edge_decl_hooks:
+                        hook(statement)
+                    if isinstance(statement.attributes, AttrList):
+                        for hook in attr_list_hooks:
+                            hook(statement.attributes)
+                elif isinstance(statement, NodeDecl):
+                    for hook in node_decl_hooks:
+                        hook(statement)
+                    if isinstance(statement.nodes, NodeList):
+                        for hook in node_list_hooks:
+                            hook(statement.nodes)
+                    if isinstance(statement.attributes, AttrList):
+                        for hook in attr_list_hooks:
+                            hook(statement.attributes)
+            for hook in hooks['end_graph_decl']:
+                hook(graph_decl)
+
+        for command in program.commands:
+            for hook in hooks['visit_command']:
+                hook(command)
+
+        for hook in hooks['end_program']:
+            hook(program)
+
+    @staticmethod
+    def _edge_decl(edge: EdgeDecl, edge_decl_hooks: List[Callable], attr_list_hooks: List[Callable]):
+        for hook in edge_decl_hooks:
+            hook(edge)
+        if isinstance(edge.attributes, AttrList):
+            for hook in attr_list_hooks:
+                hook(edge.attributes)
+
+
+class ValidationPlugin:
+    """
+    SemanticValidator checks in one pass; result is the SemanticValidator.
+    Edge endpoints may be declared by later statements of their graph, so the validator
+    declares a graph's nodes before checking its statements; here the statements are queued
+    as the graph is traversed and checked at its end, in the same order.
+    """
+
+    def __init__(self):
+        self.result = SemanticValidator()
+
+    def begin_program(self, program: Program) -> None:
+        self.result = SemanticValidator()
+        self._program = program
+        self._graphs_collected = False
+        self._graph: Optional[GraphDecl] = None
+        self._statements: List[Statement] = []
+
+    def visit_var_decl(self, node: VarDecl) -> None:
+        self.result.visit_var_decl(node)
+
+    def _collect_graphs(self):
+        for graph_decl in self._program.graph_declarations:
+            self.result.declare_graph(graph_decl)
+        self._graphs_collected = True
+
+    def visit_graph_decl(self, node: GraphDecl) -> None:
+        if not self._graphs_collected:
+            self._collect_graphs()
+        self.result.begin_graph(node)
+        self._graph = node
+
+    def visit_node_decl(self, node: NodeDecl) -> None:
+        self.result.declare_nodes(node, self._graph)
+        if isinstance(node.nodes, NodeVarRef) or node.attributes:
+            self._statements.append(node)
+
+    def visit_edge_decl(self, node: EdgeDecl) -> None:
+        if self._graph is not None:
+            self._statements.append(node)
+
+    def end_graph_decl(self, node: GraphDecl) -> None:
+        # Every node of the graph is known by now
+        validator = self.result
+        for statement in self._statements:
+            if isinstance(statement, EdgeDecl):
+                validator.validate_edge_endpoints(statement)
+                validator.validate_attributes(statement)
+            else:
+                validator.visit_node_decl(statement)
+        self._statements.clear()
+        validator.end_graph()
+        self._graph = None
+
+    def visit_command(self, node: Command) -> None:
+        if not self._graphs_collected:
+            self._collect_graphs()
+        self.result.visit_command(node)
+
+
+class GraphInfoPlugin:
+    """GraphAnalyzer's graph information; result is the GraphAnalyzer."""
+
+    def __init__(self):
+        self.result = GraphAnalyzer()
+
+    def begin_program(self, program: Program) -> None:
+        self.result.reset()
+
+    def visit_graph_decl(self, node: GraphDecl) -> None:
+        self.result.begin_graph_decl(node)
+
+    def visit_node_decl(self, node: NodeDecl) -> None:
+        self.result.visit_node_decl(node)
+
+    def visit_edge_decl(self, node: EdgeDecl) -> None:
+        self.result.visit_edge_decl(node)
+
+    def end_graph_decl(self, node: GraphDecl) -> None:
+        self.result.end_graph_decl(node)
+
+
+class StatisticsPlugin:
+    """GraphStatisticsVisitor's counts; result is the GraphStatisticsVisitor."""
+
+    def __init__(self):
+        self.result = GraphStatisticsVisitor()
+
+    def begin_program(self, program: Program) -> None:
+        self.result.reset()
+
+    def visit_var_decl(self, node: VarDecl) -> None:
+        self.result.count_variable(node)
+
+    def visit_graph_decl(self, node: GraphDecl) -> None:
+        self.result.count_graph(node)
+
+    def visit_edge_decl(self, node: EdgeDecl) -> None:
+        self.result.count_edge(node)
+
+    def visit_node_list(self, node: NodeList) -> None:
+        self.result.visit_node_list(node)
+
+    def visit_command(self, node: Command) -> None:
+        self.result.count_command(node)
+
+
+# Plugin factories run by analyze_program, by name
+PLUGINS: Dict[str, Callable[[], object]] = {
+    'validation': ValidationPlugin,
+    'graphs': GraphInfoPlugin,
+    'statistics': StatisticsPlugin,
+}
+
+
+def register_plugin(name: str, factory: Callable[[], object]) -> Callable[[], object]:
+    """Add a plugin factory, usually its class, to those run by analyze_program."""
+    PLUGINS[name] = factory
+    return factory
+
+
+def analyze_program(program: Program, names: Optional[Iterable[str]] = None) -> Dict[str, object]:
+    """
+    Run the named plugins (all registered ones by default) over program in one traversal and
+    return their results by name, e.g. result['validation'].is_valid().
+    """
+    names = list(PLUGINS if names is None else names)
+    plugins = [PLUGINS[name]() for name in names]
+    AnalysisPass(plugins).run(program)
+    return {name: plugin.result for name, plugin in zip(names, plugins)}
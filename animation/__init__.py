@@ -0,0 +1,48 @@
+"""
+Algorithm animation for GraphGif.
+This package runs the algorithms requested by `run` commands and renders their steps as animations.
+Names are imported from their submodules on first use, so importing the package does not load
+numpy or Pillow.
+"""
+
+from importlib import import_module
+
+# Public names and the submodules defining them
+_LAZY = {
+    'TraversalLog': '.algorithms',
+    'TraversalStep': '.algorithms',
+    'traverse': '.algorithms',
+    'command_arguments': '.commands',
+    'traverse_command': '.commands',
+    'FrameDelta': '.frames',
+    'FrameLog': '.frames',
+    'FrameState': '.frames',
+    'TraversalStyle': '.frames',
+    'frames_from_traversal': '.frames',
+    'rasterize_frames': '.rasterize',
+    'render_dot': '.rasterize',
+    'RenderCache': '.cache',
+    'Layout': '.layout',
+    'compute_layout': '.layout',
+    'SvgCompositor': '.compositor',
+    'iter_dot_frames': '.export',
+    'export_dot_sequence': '.export',
+    'export_image_sequence': '.export',
+    'export_gif': '.export',
+    'run_command': '.runner',
+    'run_program': '.runner',
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
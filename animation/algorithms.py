@@ -0,0 +1,143 @@
+"""
+Graph traversal algorithms for animation commands.
+This module runs BFS and DFS over a frozen CSR snapshot and records every step in a compact traversal log.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, Optional
+
+import numpy as np
+
+from models.csr_graph import CSRGraph
+
+
+@dataclass(frozen=True)
+class TraversalStep:
+    """Visitation state added by one step: the frontier reached and the tree edges used."""
+    index: int
+    frontier: np.ndarray
+    tree_edges: np.ndarray
+
+
+@dataclass(frozen=True, eq=False)
+class TraversalLog:
+    """
+    Per-step visitation states of a traversal over a CSR snapshot.
+    order lists node indices in visiting order and via the edge id each was reached
+    through (-1 for the start node); step k covers order[offsets[k]:offsets[k + 1]].
+    The visited set and tree edges up to any step are prefixes of these arrays.
+    """
+    algorithm: str
+    graph: CSRGraph
+    start: str
+    order: np.ndarray
+    via: np.ndarray
+    offsets: np.ndarray
+
+    @property
+    def step_count(self) -> int:
+        return len(self.offsets) - 1
+
+    def _step_range(self, step: int) -> tuple:
+        if not 0 <= step < self.step_count:
+            raise IndexError(f"Step {step} out of range for {self.step_count} steps")
+        return int(self.offsets[step]), int(self.offsets[step + 1])
+
+    def frontier(self, step: int) -> np.ndarray:
+        """Node indices first reached at the given step."""
+        begin, end = self._step_range(step)
+        return self.order[begin:end]
+
+    def visited(self, step: int) -> np.ndarray:
+        """Node indices visited up to and including the given step."""
+        _, end = self._step_range(step)
+        return self.order[:end]
+
+    def tree_edges(self, step: int) -> np.ndarray:
+        """Ids of the traversal tree edges used up to and including the given step."""
+        _, end = self._step_range(step)
+        via = self.via[:end]
+        return via[via >= 0]
+
+    def steps(self) -> Iterator[TraversalStep]:
+        """Iterate over the steps, yielding only what each step adds."""
+        for step in range(self.step_count):
+            begin, end = self._step_range(step)
+            via = self.via[begin:end]
+            yield TraversalStep(step, self.order[begin:end], via[via >= 0])
+
+
+def bfs(graph: CSRGraph, start: str) -> TraversalLog:
+    """Breadth-first search; one step per level, expanded with vectorised frontier operations."""
+    levels = list(graph.bfs_levels(start))
+    offsets = np.zeros(len(levels) + 1, dtype=np.int64)
+    np.cumsum([len(nodes) for nodes, _ in levels], out=offsets[1:])
+    return TraversalLog(
+        'bfs', graph, start,
+        np.concatenate([nodes for nodes, _ in levels]),
+        np.concatenate([edges for _, edges in levels]),
+        offsets,
+    )
+
+
+def dfs(graph: CSRGraph, start: str) -> TraversalLog:
+    """
+    Depth-first search in recursive pre-order; one step per visited node.
+    Each step depends on the previous one, so the search itself is sequential, but it
+    walks plain integer lists taken from the CSR arrays rather than dict adjacency.
+    """
+    indptr = graph.indptr.tolist()
+    indices = graph.indices.tolist()
+    edge_ids = graph.edge_ids.tolist()
+
+    root = graph.index_of(start)
+    visited = bytearray(graph.node_count)
+    visited[root] = 1
+    order = [root]
+    via = [-1]
+
+    # Stack of (node, position of its next adjacency entry to examine)
+    stack = [(root, indptr[root])]
+    while stack:
+        node, entry = stack[-1]
+        end = indptr[node + 1]
+        while entry < end and visited[indices[entry]]:
+            entry += 1
+        if entry == end:
+            stack.pop()
+            continue
+
+        neighbour = indices[entry]
+        visited[neighbour] = 1
+        order.append(neighbour)
+        via.append(edge_ids[entry])
+        stack[-1] = (node, entry + 1)
+        stack.append((neighbour, indptr[neighbour]))
+
+    return TraversalLog(
+        'dfs', graph, start,
+        np.array(order, dtype=np.int64),
+        np.array(via, dtype=np.int64),
+        np.arange(len(order) + 1, dtype=np.int64),
+    )
+
+
+ALGORITHMS: Dict[str, Callable[[CSRGraph, str], TraversalLog]] = {
+    'bfs': bfs,
+    'dfs': dfs,
+}
+
+
+def traverse(graph, algorithm: str = 'bfs', start: Optional[str] = None) -> TraversalLog:
+    """
+    Run a traversal algorithm and return its log.
+    graph may be a CSRGraph or any graph with freeze(); start defaults to the first node.
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+    snapshot = graph if isinstance(graph, CSRGraph) else graph.freeze()
+    if start is None:
+        if not snapshot.node_count:
+            raise ValueError(f"Graph '{snapshot.name}' has no nodes")
+        start = snapshot.node_ids[0]
+    return ALGORITHMS[algorithm](snapshot, start)
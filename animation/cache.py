@@ -0,0 +1,119 @@
+"""
+Content-addressed render cache.
+Rendered images are stored on disk under the hash of the canonical frame source, engine,
+format and resolution, so identical frames are rendered once across runs. The cache is bounded
+in size; the least recently used entries are evicted first.
+"""
+
+import hashlib
+import os
+import tempfile
+from typing import Callable, Optional
+
+DEFAULT_CACHE_SIZE = 256 * 1024 * 1024  # bytes
+# Eviction frees space down to this fraction of the bound so it is not repeated on every store
+EVICTION_TARGET = 0.9
+
+
+def default_cache_dir() -> str:
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'graphgif')
+
+
+def canonical_source(source: str) -> str:
+    """Frame source with line endings and trailing whitespace normalised."""
+    return '\n'.join(line.rstrip() for line in source.strip().splitlines())
+
+
+class RenderCache:
+    """
+    On-disk store of rendered frames, one file per entry in <directory>/<key[:2]>/<key>.
+    Entry mtimes track recency: hits touch the entry, eviction removes the oldest.
+    hits and misses count lookups made through this instance.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_size: int = DEFAULT_CACHE_SIZE):
+        self.directory = directory or default_cache_dir()
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._size = None
+
+    @staticmethod
+    def key(source: str, engine: str, image_format: str, dpi: Optional[int] = None,
+            neato_no_op: Optional[int] = None) -> str:
+        digest = hashlib.sha256()
+        for part in (engine, image_format, str(dpi or ''), str(neato_no_op or ''), canonical_source(source)):
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key)
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path)
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data
+
+    def put(self, key: str, data: bytes):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename, so concurrent runs sharing the directory never read partial entries
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+        if self._size is None:
+            self._size = sum(size for _, _, size in self._entries())
+        else:
+            self._size += len(data)
+        if self._size > self.max_size:
+            self._evict()
+
+    def _entries(self):
+        """(mtime, path, size) of every entry."""
+        entries = []
+        for shard in os.scandir(self.directory) if os.path.isdir(self.directory) else ():
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.is_file() and not entry.name.startswith('.tmp'):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, entry.path, stat.st_size))
+        return entries
+
+    def _evict(self):
+        entries = sorted(self._entries())
+        self._size = sum(size for _, _, size in entries)
+        target = self.max_size * EVICTION_TARGET
+        for _, path, size in entries:
+            if self._size <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self._size -= size
+
+    def render(self, render: Callable[..., bytes], source: str, engine: str, image_format: str,
+               timeout: Optional[float] = None, neato_no_op: Optional[int] = None,
+               dpi: Optional[int] = None) -> bytes:
+        """Look a frame up, rendering and storing it on a miss."""
+        key = self.key(source, engine, image_format, dpi, neato_no_op)
+        data = self.get(key)
+        if data is None:
+            data = render(source, engine, image_format, timeout, neato_no_op)
+            self.put(key, data)
+        return data
+
+    def summary(self) -> str:
+        return f"cache: {self.hits} hits, {self.misses} misses"
@@ -0,0 +1,51 @@
+"""
+Interpretation of `run ... with (...)` commands.
+This module turns command arguments into plain values and runs the requested traversal.
+"""
+
+from typing import Any, Dict, Optional
+
+from errors.exceptions import RuntimeError as GraphgifRuntimeError
+from models import Command, Path, Value
+from models.graph_model import GraphModel
+from .algorithms import ALGORITHMS, TraversalLog, traverse
+
+
+def command_arguments(command: Command) -> Dict[str, Any]:
+    """Map argument names to values: paths become dotted strings, values their literal."""
+    arguments = {}
+    for argument in command.arguments:
+        value = argument.argument_value
+        if isinstance(value, Path):
+            arguments[argument.name] = '.'.join(value.components)
+        elif isinstance(value, Value):
+            arguments[argument.name] = value.value
+        else:
+            arguments[argument.name] = value
+    return arguments
+
+
+def traverse_command(graph_model: GraphModel, command: Command, snapshots: Optional[dict] = None) -> TraversalLog:
+    """
+    Run the traversal requested by a command: algorithm=bfs|dfs (default bfs) from
+    start=<node> (default the graph's first node). snapshots, when given, caches the
+    frozen graphs by name so several commands on one graph share a CSR snapshot.
+    """
+    if command.graph_name not in graph_model.graphs:
+        raise GraphgifRuntimeError(f"Graph '{command.graph_name}' not found")
+    arguments = command_arguments(command)
+
+    algorithm = str(arguments.get('algorithm', 'bfs')).lower()
+    if algorithm not in ALGORITHMS:
+        raise GraphgifRuntimeError(f"Unknown algorithm '{algorithm}' in command on '{command.graph_name}'")
+
+    snapshot = snapshots.get(command.graph_name) if snapshots is not None else None
+    if snapshot is None:
+        snapshot = graph_model.get_graph(command.graph_name).freeze()
+        if snapshots is not None:
+            snapshots[command.graph_name] = snapshot
+
+    start = arguments.get('start')
+    if start is not None and str(start) not in snapshot.node_index:
+        raise GraphgifRuntimeError(f"Start node '{start}' not found in graph '{command.graph_name}'")
+    return traverse(snapshot, algorithm, None if start is None else str(start))
@@ -0,0 +1,183 @@
+"""
+In-process compositing of style-only frames.
+Over a fixed layout most frames differ from the base graph only in colours and pen widths. The
+base graph is rendered to SVG once; each frame is produced by patching the style attributes of
+the affected node and edge elements and, for raster output, rasterising the SVG with cairosvg.
+Frames changing anything else (labels, shapes, ...) are left to Graphviz.
+"""
+
+import importlib.util
+import re
+import xml.etree.ElementTree as ET
+from typing import Any, Dict, Iterator, Mapping, Optional
+
+from .dot import frame_to_dot
+from .frames import FrameLog, FrameState
+from .rasterize import render_dot
+
+SVG_NS = 'http://www.w3.org/2000/svg'
+ET.register_namespace('', SVG_NS)
+ET.register_namespace('xlink', 'http://www.w3.org/1999/xlink')
+
+# Attributes a frame may override and still be composited
+NODE_STYLE_ATTRIBUTES = frozenset({'color', 'fillcolor', 'fontcolor', 'penwidth', 'style'})
+EDGE_STYLE_ATTRIBUTES = frozenset({'color', 'fontcolor', 'penwidth'})
+# Node styles that only decide whether the shape is filled
+FILL_STYLES = frozenset({'filled', 'solid', ''})
+
+COMPOSITED_FORMATS = ('svg', 'png')
+DEFAULT_DPI = 96  # Graphviz's bitmap resolution
+
+_SHAPE_TAGS = {f'{{{SVG_NS}}}{tag}' for tag in ('ellipse', 'polygon', 'polyline', 'path')}
+_TEXT_TAG = f'{{{SVG_NS}}}text'
+_PLAIN_COLOR = re.compile(r'#[0-9a-fA-F]{3,8}|[A-Za-z]+[0-9]*')
+_POINTS = re.compile(r'([0-9.]+)pt')
+
+
+def compositor_available(image_format: str) -> bool:
+    """Whether frames of this format can be composited here; raster output needs cairosvg."""
+    if image_format == 'svg':
+        return True
+    return image_format in COMPOSITED_FORMATS and importlib.util.find_spec('cairosvg') is not None
+
+
+def _is_plain_color(value: Any) -> bool:
+    """Single colour usable in SVG as it is (no colour lists, gradients or HSV triples)."""
+    return _PLAIN_COLOR.fullmatch(str(value)) is not None
+
+
+def _style_tokens(value: Any) -> set:
+    return {token.strip() for token in str(value).split(',')}
+
+
+class SvgCompositor:
+    """
+    Patches frame styles into the SVG of a graph's base frame.
+    Graphviz numbers SVG groups node1, node2, ... and edge1, edge2, ... in creation order,
+    which for frame_to_dot output is the order of graph.nodes and graph.edges.
+    """
+
+    def __init__(self, graph, base_svg: bytes, dpi: Optional[int] = None):
+        self.graph = graph
+        self.root = ET.fromstring(base_svg)
+        if dpi:
+            self._scale(dpi)
+
+        groups = {}
+        for group in self.root.iter(f'{{{SVG_NS}}}g'):
+            if group.get('class') in ('node', 'edge'):
+                groups[group.get('id')] = group
+        self._nodes = {node_id: groups.get(f"node{i + 1}") for i, node_id in enumerate(graph.nodes)}
+        self._edges = [groups.get(f"edge{i + 1}") for i in range(len(graph.edges))]
+        # Original attributes of the elements patched by the previous frame
+        self._dirty: Dict[ET.Element, Dict[str, str]] = {}
+
+    def _scale(self, dpi: int):
+        """Size the document in pixels at dpi, as Graphviz does for bitmaps."""
+        for dimension in ('width', 'height'):
+            match = _POINTS.fullmatch(self.root.get(dimension, ''))
+            if match:
+                self.root.set(dimension, f"{float(match.group(1)) * dpi / 72:.0f}px")
+
+    def _set(self, element: ET.Element, name: str, value: Any):
+        if element not in self._dirty:
+            self._dirty[element] = dict(element.attrib)
+        element.set(name, str(value))
+
+    def _restore(self):
+        for element, attributes in self._dirty.items():
+            element.attrib.clear()
+            element.attrib.update(attributes)
+        self._dirty.clear()
+
+    def _patch_node(self, node_id: str, override: Mapping[str, Any]) -> bool:
+        group = self._nodes.get(node_id)
+        if group is None or not NODE_STYLE_ATTRIBUTES.issuperset(override):
+            return False
+        shapes = [child for child in group if child.tag in _SHAPE_TAGS]
+        if not shapes:
+            return False
+        if 'style' in override and not FILL_STYLES.issuperset(_style_tokens(override['style'])):
+            return False
+        attributes = {**self.graph.global_node_attributes, **self.graph.nodes[node_id].attributes, **override}
+        if not all(_is_plain_color(attributes[key]) for key in ('color', 'fillcolor', 'fontcolor')
+                   if key in attributes):
+            return False
+
+        if 'color' in override:
+            for shape in shapes:
+                self._set(shape, 'stroke', override['color'])
+        if override.keys() & {'color', 'fillcolor', 'style'}:
+            if 'filled' in _style_tokens(attributes.get('style', '')):
+                fill = attributes.get('fillcolor', attributes.get('color', 'lightgrey'))
+            else:
+                fill = 'none'
+            self._set(shapes[0], 'fill', fill)
+        if 'penwidth' in override:
+            for shape in shapes:
+                self._set(shape, 'stroke-width', float(override['penwidth']))
+        if 'fontcolor' in override:
+            for text in group.iter(_TEXT_TAG):
+                self._set(text, 'fill', override['fontcolor'])
+        return True
+
+    def _patch_edge(self, edge_id: int, override: Mapping[str, Any]) -> bool:
+        group = self._edges[edge_id] if edge_id < len(self._edges) else None
+        if group is None or not EDGE_STYLE_ATTRIBUTES.issuperset(override):
+            return False
+        if not all(_is_plain_color(override[key]) for key in ('color', 'fontcolor') if key in override):
+            return False
+
+        for child in group:
+            if child.tag not in _SHAPE_TAGS:
+                continue
+            # Paths are the spline, polygons the arrowheads
+            if 'color' in override:
+                self._set(child, 'stroke', override['color'])
+                if child.get('fill', 'none') != 'none':
+                    self._set(child, 'fill', override['color'])
+            if 'penwidth' in override:
+                self._set(child, 'stroke-width', float(override['penwidth']))
+        if 'fontcolor' in override:
+            for text in group.iter(_TEXT_TAG):
+                self._set(text, 'fill', override['fontcolor'])
+        return True
+
+    def composite(self, state: FrameState) -> Optional[bytes]:
+        """SVG of a frame, or None if the frame changes more than styles."""
+        self._restore()
+        for node_id, override in state.nodes.items():
+            if not self._patch_node(node_id, override):
+                return None
+        for edge_id, override in state.edges.items():
+            if not self._patch_edge(edge_id, override):
+                return None
+        return ET.tostring(self.root, encoding='utf-8', xml_declaration=True)
+
+
+def iter_composited_frames(frame_log: FrameLog, base_svg: bytes, layout, image_format: str = 'png',
+                           dpi: Optional[int] = None,
+                           graph_attributes: Optional[Mapping[str, Any]] = None) -> Iterator[str]:
+    """
+    Generate every frame as composited SVG, or as DOT source over the layout for frames
+    the compositor cannot produce. Both are understood by render_frame.
+    """
+    # SVG output keeps Graphviz's point sizes; bitmaps are sized at dpi
+    compositor = SvgCompositor(frame_log.graph, base_svg, None if image_format == 'svg' else dpi or DEFAULT_DPI)
+    for state in frame_log.iter_states():
+        svg = compositor.composite(state)
+        if svg is None:
+            yield frame_to_dot(frame_log.graph, state, graph_attributes, layout)
+        else:
+            yield svg.decode('utf-8')
+
+
+def render_frame(source: str, engine: str = 'dot', image_format: str = 'png',
+                 timeout: Optional[float] = None, neato_no_op: Optional[int] = None) -> bytes:
+    """Rasterise a composited SVG frame in process, or render a DOT frame with Graphviz."""
+    if not source.startswith('<'):
+        return render_dot(source, engine, image_format, timeout, neato_no_op)
+    if image_format == 'svg':
+        return source.encode('utf-8')
+    import cairosvg
+    return cairosvg.svg2png(bytestring=source.encode('utf-8'))
@@ -0,0 +1,60 @@
+"""
+DOT source generation for animation frames.
+"""
+
+from typing import Any, Mapping, Optional
+
+from .frames import FrameState
+
+
+def quote(value: Any) -> str:
+    """Format a DOT ID: numbers as they are, anything else as a quoted string."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    text = str(value).replace('\\', '\\\\').replace('"', '\\"')
+    return f'"{text}"'
+
+
+def format_attributes(attributes: Mapping[str, Any]) -> str:
+    return ', '.join(f"{key}={quote(value)}" for key, value in attributes.items())
+
+
+def frame_to_dot(graph, state: Optional[FrameState] = None,
+                 graph_attributes: Optional[Mapping[str, Any]] = None, layout=None) -> str:
+    """
+    Render a concrete graph as DOT source, with a frame's attribute overrides applied.
+    graph_attributes are added to the graph's own global graph attributes; a Layout pins
+    node positions and edge splines for rendering with `neato -n2`.
+    """
+    lines = [f"{'digraph' if graph.directed else 'graph'} {quote(graph.name)} {{"]
+    edge_op = '->' if graph.directed else '--'
+
+    global_graph_attributes = {**graph.global_graph_attributes, **(graph_attributes or {})}
+    if layout is not None and layout.bounding_box:
+        global_graph_attributes['bb'] = layout.bounding_box
+    for target, attributes in (('graph', global_graph_attributes),
+                               ('node', graph.global_node_attributes),
+                               ('edge', graph.global_edge_attributes)):
+        if attributes:
+            lines.append(f"  {target} [{format_attributes(attributes)}];")
+
+    node_overrides = state.nodes if state is not None else {}
+    for node_id, node in graph.nodes.items():
+        override = node_overrides.get(node_id)
+        attributes = {**node.attributes, **override} if override else node.attributes
+        if layout is not None:
+            attributes = {**attributes, **layout.node_attributes(node_id)}
+        attr_str = f" [{format_attributes(attributes)}]" if attributes else ""
+        lines.append(f"  {quote(node_id)}{attr_str};")
+
+    edge_overrides = state.edges if state is not None else {}
+    for edge_id, edge in enumerate(graph.edges):
+        override = edge_overrides.get(edge_id)
+        attributes = {**edge.attributes, **override} if override else edge.attributes
+        if layout is not None:
+            attributes = {**attributes, **layout.edge_attributes(edge_id)}
+        attr_str = f" [{format_attributes(attributes)}]" if attributes else ""
+        lines.append(f"  {quote(edge.source)} {edge_op} {quote(edge.target)}{attr_str};")
+
+    lines.append("}")
+    return "\n".join(lines) + "\n"
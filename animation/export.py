@@ -0,0 +1,108 @@
+"""
+Animation exporters.
+Exporters consume a FrameLog lazily: each frame's DOT source is generated, written or rendered,
+and released soon after. Rendered exporters keep at most max_in_flight frames in the
+rasterisation pool at once.
+"""
+
+import io
+import os
+from typing import Any, Iterator, List, Mapping, Optional
+
+from .cache import RenderCache
+from .compositor import compositor_available, iter_composited_frames, render_frame
+from .dot import frame_to_dot
+from .frames import FrameLog
+from .gif import GifStreamWriter, DEFAULT_FRAME_DURATION
+from .layout import Layout, PINNED_ENGINE, PINNED_NEATO_NO_OP
+from .rasterize import rasterize_frames, render_dot
+
+
+def iter_dot_frames(frame_log: FrameLog, graph_attributes: Optional[Mapping[str, Any]] = None,
+                    layout: Optional[Layout] = None) -> Iterator[str]:
+    """Generate the DOT source of every frame in order."""
+    for state in frame_log.iter_states():
+        yield frame_to_dot(frame_log.graph, state, graph_attributes, layout)
+
+
+def _rasterize(frame_log: FrameLog, engine: str, image_format: str, dpi: Optional[int],
+               layout: Optional[Layout], composite: bool, cache: Optional[RenderCache],
+               workers: Optional[int], timeout: Optional[float], max_in_flight: Optional[int]) -> Iterator[bytes]:
+    """
+    Render every frame, over the fixed layout if one is given. With composite, style-only
+    frames are patched into the SVG of the base frame instead of going through Graphviz.
+    """
+    graph_attributes = {'dpi': dpi} if dpi else None
+    options = dict(workers=workers, timeout=timeout, max_in_flight=max_in_flight, cache=cache, dpi=dpi)
+    if layout is not None and composite and compositor_available(image_format):
+        base_dot = frame_to_dot(frame_log.graph, layout=layout)
+        if cache is None:
+            base_svg = render_dot(base_dot, PINNED_ENGINE, 'svg', timeout, PINNED_NEATO_NO_OP)
+        else:
+            base_svg = cache.render(render_dot, base_dot, PINNED_ENGINE, 'svg', timeout, PINNED_NEATO_NO_OP)
+        sources = iter_composited_frames(frame_log, base_svg, layout, image_format, dpi, graph_attributes)
+        return rasterize_frames(sources, PINNED_ENGINE, image_format, neato_no_op=PINNED_NEATO_NO_OP,
+                                render=render_frame, **options)
+    dot_sources = iter_dot_frames(frame_log, graph_attributes, layout)
+    if layout is not None:
+        return rasterize_frames(dot_sources, PINNED_ENGINE, image_format, neato_no_op=PINNED_NEATO_NO_OP,
+                                render=render_dot, **options)
+    return rasterize_frames(dot_sources, engine, image_format, render=render_dot, **options)
+
+
+def export_dot_sequence(frame_log: FrameLog, directory: str, prefix: Optional[str] = None) -> List[str]:
+    """Write one DOT file per frame into directory and return their paths."""
+    os.makedirs(directory, exist_ok=True)
+    prefix = prefix or frame_log.graph.name
+    paths = []
+    for index, dot_source in enumerate(iter_dot_frames(frame_log)):
+        path = os.path.join(directory, f"{prefix}_{index:04d}.dot")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(dot_source)
+        paths.append(path)
+    return paths
+
+
+def export_image_sequence(frame_log: FrameLog, output_path: str, engine: str = 'dot',
+                          dpi: Optional[int] = None, layout: Optional[Layout] = None, composite: bool = True,
+                          cache: Optional[RenderCache] = None, workers: Optional[int] = None,
+                          timeout: Optional[float] = None, max_in_flight: Optional[int] = None) -> List[str]:
+    """
+    Render every frame to its own image; output_path "out/anim.png" gives
+    out/anim_0000.png, out/anim_0001.png, ... in the format named by the extension.
+    With a layout, frames are drawn over it instead of being laid out one by one, and composite
+    lets style-only frames skip Graphviz; cache, workers, timeout and max_in_flight are passed to
+    rasterize_frames.
+    """
+    stem, extension = os.path.splitext(output_path)
+    images = _rasterize(frame_log, engine, extension[1:].lower(), dpi, layout, composite, cache,
+                        workers, timeout, max_in_flight)
+    paths = []
+    for index, image_data in enumerate(images):
+        path = f"{stem}_{index:04d}{extension}"
+        with open(path, 'wb') as f:
+            f.write(image_data)
+        paths.append(path)
+    return paths
+
+
+def export_gif(frame_log: FrameLog, output_path: str, engine: str = 'dot', dpi: Optional[int] = None,
+               duration: int = DEFAULT_FRAME_DURATION, layout: Optional[Layout] = None,
+               composite: bool = True, cache: Optional[RenderCache] = None, workers: Optional[int] = None,
+               timeout: Optional[float] = None, max_in_flight: Optional[int] = None) -> int:
+    """
+    Render every frame with Graphviz and stream them into an animated GIF; returns the frame count.
+    Frames are encoded in order as soon as each one is rendered. With a layout, frames are
+    drawn over it instead of being laid out one by one, and composite lets style-only frames
+    skip Graphviz; cache, workers, timeout and max_in_flight are passed to rasterize_frames.
+    """
+    from PIL import Image
+
+    images = _rasterize(frame_log, engine, 'png', dpi, layout, composite, cache, workers, timeout, max_in_flight)
+    with open(output_path, 'wb') as f:
+        writer = GifStreamWriter(f, duration)
+        for image_data in images:
+            with Image.open(io.BytesIO(image_data)) as image:
+                writer.add_frame(image)
+        writer.close()
+    return writer.frame_count
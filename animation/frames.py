@@ -0,0 +1,122 @@
+"""
+Delta-encoded animation frame logs.
+Frame 0 of an animation is the styling of the concrete graph itself; every later frame records
+only the node and edge attributes that changed. Accumulated states are indexed every few frames
+so any frame can be reconstructed without replaying the whole animation.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Mapping, Optional
+
+from .algorithms import TraversalLog
+
+DEFAULT_KEYFRAME_INTERVAL = 16
+
+
+@dataclass(frozen=True)
+class FrameDelta:
+    """Attribute changes of one frame, keyed by node ID and by edge id (position in edges)."""
+    nodes: Mapping[str, Mapping[str, Any]] = field(default_factory=dict)
+    edges: Mapping[int, Mapping[str, Any]] = field(default_factory=dict)
+
+
+@dataclass
+class FrameState:
+    """Attribute overrides of a frame relative to frame 0."""
+    nodes: Dict[str, Mapping[str, Any]] = field(default_factory=dict)
+    edges: Dict[int, Mapping[str, Any]] = field(default_factory=dict)
+
+    def apply(self, delta: FrameDelta):
+        """Fold a frame's changes into the state."""
+        for node_id, attributes in delta.nodes.items():
+            current = self.nodes.get(node_id)
+            self.nodes[node_id] = {**current, **attributes} if current else attributes
+        for edge_id, attributes in delta.edges.items():
+            current = self.edges.get(edge_id)
+            self.edges[edge_id] = {**current, **attributes} if current else attributes
+
+    def copy(self) -> 'FrameState':
+        # Override dicts are replaced rather than mutated by apply, so they can be shared
+        return FrameState(dict(self.nodes), dict(self.edges))
+
+
+class FrameLog:
+    """
+    Animation over a concrete graph as a sequence of frame deltas.
+    Frame 0 is the graph's own styling and has an empty delta. The accumulated state of
+    every keyframe_interval-th frame is kept as a seek index.
+    """
+
+    def __init__(self, graph, keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL):
+        if keyframe_interval < 1:
+            raise ValueError("keyframe_interval must be at least 1")
+        self.graph = graph
+        self.keyframe_interval = keyframe_interval
+        self._deltas: List[FrameDelta] = [FrameDelta()]
+        self._keyframes: List[FrameState] = [FrameState()]
+        self._last_state = FrameState()
+
+    def __len__(self) -> int:
+        return len(self._deltas)
+
+    def append(self, delta: FrameDelta):
+        """Add a frame given by its changes from the previous frame."""
+        self._deltas.append(delta)
+        self._last_state.apply(delta)
+        if (len(self._deltas) - 1) % self.keyframe_interval == 0:
+            self._keyframes.append(self._last_state.copy())
+
+    def delta(self, index: int) -> FrameDelta:
+        """Get the changes recorded for a frame."""
+        return self._deltas[index]
+
+    def state(self, index: int) -> FrameState:
+        """Reconstruct a frame from the nearest preceding keyframe."""
+        if not 0 <= index < len(self._deltas):
+            raise IndexError(f"Frame {index} out of range for {len(self._deltas)} frames")
+        keyframe = index // self.keyframe_interval
+        state = self._keyframes[keyframe].copy()
+        for delta in self._deltas[keyframe * self.keyframe_interval + 1:index + 1]:
+            state.apply(delta)
+        return state
+
+    def iter_states(self, start: int = 0) -> Iterator[FrameState]:
+        """
+        Iterate over frame states from start, applying one delta per frame.
+        The same FrameState object is updated in place and yielded for every frame.
+        """
+        state = self.state(start)
+        yield state
+        for delta in self._deltas[start + 1:]:
+            state.apply(delta)
+            yield state
+
+
+@dataclass(frozen=True)
+class TraversalStyle:
+    """Attributes applied to nodes and edges as a traversal reaches them."""
+    frontier: Mapping[str, Any] = field(default_factory=lambda: {'style': 'filled', 'fillcolor': 'gold'})
+    visited: Mapping[str, Any] = field(default_factory=lambda: {'style': 'filled', 'fillcolor': 'lightblue'})
+    tree_edge: Mapping[str, Any] = field(default_factory=lambda: {'color': 'red', 'penwidth': 2})
+
+
+def frames_from_traversal(graph, log: TraversalLog, style: Optional[TraversalStyle] = None,
+                          keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL) -> FrameLog:
+    """
+    Build the frame log of a traversal over graph (the graph log was frozen from).
+    Each step highlights its frontier and tree edges and marks the previous frontier as
+    visited; a closing frame marks the last frontier as visited.
+    """
+    style = style or TraversalStyle()
+    frames = FrameLog(graph, keyframe_interval)
+    node_ids = log.graph.node_ids
+
+    previous = []
+    for step in log.steps():
+        nodes = {node_ids[i]: style.visited for i in previous}
+        previous = step.frontier.tolist()
+        nodes.update((node_ids[i], style.frontier) for i in previous)
+        frames.append(FrameDelta(nodes, {edge_id: style.tree_edge for edge_id in step.tree_edges.tolist()}))
+    if previous:
+        frames.append(FrameDelta({node_ids[i]: style.visited for i in previous}))
+    return frames
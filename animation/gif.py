@@ -0,0 +1,101 @@
+"""
+Streaming animated GIF writer.
+Pillow's multi-frame GIF encoder keeps every frame until it writes the file; this writer
+encodes each frame on its own and appends it to the output, so only one frame is held at a time.
+"""
+
+import io
+from typing import BinaryIO
+
+DEFAULT_FRAME_DURATION = 500  # milliseconds
+
+
+def _header_length(gif: bytes) -> int:
+    """Length of the GIF signature, logical screen descriptor and global colour table."""
+    packed = gif[10]
+    color_table = 3 << ((packed & 0x07) + 1) if packed & 0x80 else 0
+    return 13 + color_table
+
+
+def _sub_blocks_end(gif: bytes, pos: int) -> int:
+    """Position just past the data sub-blocks starting at pos."""
+    while gif[pos]:
+        pos += gif[pos] + 1
+    return pos + 1
+
+
+def _frame_blocks(gif: bytes) -> bytes:
+    """
+    Extension and image blocks of a single-frame GIF, with the global colour table
+    moved into the image descriptor as a local one so the frame can follow any header.
+    """
+    header_length = _header_length(gif)
+    color_table = gif[13:header_length]
+    blocks = bytearray()
+    pos = header_length
+    while gif[pos] != 0x3B:
+        if gif[pos] == 0x21:
+            # Extension: introducer, label, sub-blocks
+            end = _sub_blocks_end(gif, pos + 2)
+            blocks += gif[pos:end]
+        else:
+            # Image descriptor, optional local colour table, LZW code size, sub-blocks
+            descriptor = bytearray(gif[pos:pos + 10])
+            flags = descriptor[9]
+            end = pos + 10
+            if flags & 0x80:
+                end += 3 << ((flags & 0x07) + 1)
+            elif color_table:
+                descriptor[9] = flags | 0x80 | (gif[10] & 0x07)
+                descriptor += color_table
+            blocks += descriptor + gif[pos + 10:end]
+            pos = end
+            end = _sub_blocks_end(gif, pos + 1)
+            blocks += gif[pos:end]
+        pos = end
+    return bytes(blocks)
+
+
+def _loop_extension(loop: int) -> bytes:
+    return b"!\xff\x0bNETSCAPE2.0\x03\x01" + loop.to_bytes(2, 'little') + b"\x00"
+
+
+class GifStreamWriter:
+    """
+    Writes an animated GIF one frame at a time.
+    Every frame carries its own colour table; frames that differ in size from the first
+    are placed on a white canvas of the first frame's size.
+    """
+
+    def __init__(self, fp: BinaryIO, duration: int = DEFAULT_FRAME_DURATION, loop: int = 0):
+        self.fp = fp
+        self.duration = duration
+        self.loop = loop
+        self.frame_count = 0
+        self._size = None
+
+    def add_frame(self, image: 'Image.Image'):
+        from PIL import Image
+
+        image = image.convert('RGB')
+        if self._size is None:
+            self._size = image.size
+        elif image.size != self._size:
+            canvas = Image.new('RGB', self._size, 'white')
+            canvas.paste(image, (0, 0))
+            image = canvas
+
+        buffer = io.BytesIO()
+        image.save(buffer, format='GIF', duration=self.duration)
+        gif = buffer.getvalue()
+
+        if self.frame_count == 0:
+            self.fp.write(gif[:_header_length(gif)])
+            self.fp.write(_loop_extension(self.loop))
+        self.fp.write(_frame_blocks(gif))
+        self.frame_count += 1
+
+    def close(self):
+        """Write the GIF trailer."""
+        if self.frame_count:
+            self.fp.write(b";")
@@ -0,0 +1,102 @@
+"""
+Frame rasterisation with Graphviz.
+Frames can be rendered sequentially or fanned out to a pool of worker processes; either way
+images come back in frame order, each one as soon as it and all frames before it are done.
+"""
+
+import os
+import subprocess
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Iterable, Iterator, Optional
+
+from errors.exceptions import RuntimeError as GraphgifRuntimeError
+
+
+def render_dot(dot_source: str, engine: str = 'dot', image_format: str = 'png',
+               timeout: Optional[float] = None, neato_no_op: Optional[int] = None) -> bytes:
+    """
+    Render DOT source with a Graphviz layout engine and return the image data.
+    A render exceeding timeout seconds is killed; neato_no_op is neato's -n level,
+    which keeps the positions given in the source.
+    """
+    command = [engine, f"-T{image_format}"]
+    if neato_no_op:
+        command.append(f"-n{neato_no_op}")
+    try:
+        result = subprocess.run(command, input=dot_source.encode('utf-8'), capture_output=True, timeout=timeout)
+    except FileNotFoundError:
+        raise GraphgifRuntimeError(f"Graphviz executable '{engine}' not found") from None
+    except subprocess.TimeoutExpired:
+        raise GraphgifRuntimeError(f"Graphviz '{engine}' timed out after {timeout} s") from None
+    if result.returncode:
+        message = result.stderr.decode('utf-8', errors='replace').strip()
+        raise GraphgifRuntimeError(f"Graphviz '{engine}' failed: {message}")
+    return result.stdout
+
+
+# Frames an animation needs before `run` commands render it in a process pool by default;
+# for shorter ones starting the worker processes costs more than it saves
+POOL_MIN_FRAMES = 64
+
+
+def default_workers(frame_count: int) -> int:
+    """Worker count used by `run` commands that do not set one: one per CPU for long animations, else 1."""
+    if frame_count < POOL_MIN_FRAMES:
+        return 1
+    return os.cpu_count() or 1
+
+
+def rasterize_frames(dot_sources: Iterable[str], engine: str = 'dot', image_format: str = 'png',
+                     workers: Optional[int] = None, timeout: Optional[float] = None,
+                     max_in_flight: Optional[int] = None, neato_no_op: Optional[int] = None,
+                     render: Callable[..., bytes] = render_dot, cache=None,
+                     dpi: Optional[int] = None) -> Iterator[bytes]:
+    """
+    Render DOT frames and yield their images in frame order.
+    Without workers, or with a single one, frames are rendered in this process.
+    With more than one worker, frames are submitted to a process pool while at most
+    max_in_flight (default twice the workers) are rendering or waiting to be yielded;
+    dot_sources is consumed lazily at the same pace. timeout applies to each frame.
+    A RenderCache is consulted before rendering and filled after; dpi only keys its entries.
+    """
+    if not workers or workers <= 1:
+        for dot_source in dot_sources:
+            if cache is None:
+                yield render(dot_source, engine, image_format, timeout, neato_no_op)
+            else:
+                yield cache.render(render, dot_source, engine, image_format, timeout, neato_no_op, dpi)
+        return
+
+    max_in_flight = max(1, max_in_flight or 2 * workers)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # (cache key to fill, future) per frame; cache hits are already resolved futures
+        pending = deque()
+        try:
+            for dot_source in dot_sources:
+                key = data = None
+                if cache is not None:
+                    key = cache.key(dot_source, engine, image_format, dpi, neato_no_op)
+                    data = cache.get(key)
+                if data is None:
+                    future = pool.submit(render, dot_source, engine, image_format, timeout, neato_no_op)
+                else:
+                    future, key = Future(), None
+                    future.set_result(data)
+                pending.append((key, future))
+                if len(pending) >= max_in_flight:
+                    yield _collect(pending.popleft(), cache)
+            while pending:
+                yield _collect(pending.popleft(), cache)
+        finally:
+            # On error or early close, drop frames that have not started rendering
+            for _, future in pending:
+                future.cancel()
+
+
+def _collect(frame, cache) -> bytes:
+    key, future = frame
+    data = future.result()
+    if key is not None:
+        cache.put(key, data)
+    return data
@@ -0,0 +1,122 @@
+"""
+Execution of `run` commands: traversal, frame log and export.
+"""
+
+import os
+from dataclasses import replace
+from typing import Dict, List, Optional
+
+from errors.exceptions import RuntimeError as GraphgifRuntimeError
+from models import Command, Program
+from models.graph_model import GraphModel
+from .cache import RenderCache
+from .commands import command_arguments, traverse_command
+from .export import export_dot_sequence, export_gif, export_image_sequence
+from .frames import TraversalStyle, frames_from_traversal, FrameLog, DEFAULT_KEYFRAME_INTERVAL
+from .gif import DEFAULT_FRAME_DURATION
+from .layout import compute_layout
+from .rasterize import default_workers
+
+# Command arguments overriding the colours of TraversalStyle
+STYLE_ARGUMENTS = {
+    'frontier_color': ('frontier', 'fillcolor'),
+    'visited_color': ('visited', 'fillcolor'),
+    'edge_color': ('tree_edge', 'color'),
+}
+
+
+def traversal_style(arguments: dict) -> TraversalStyle:
+    """Build the traversal style from command arguments."""
+    style = TraversalStyle()
+    overrides = {}
+    for argument, (field_name, attribute) in STYLE_ARGUMENTS.items():
+        if argument in arguments:
+            current = overrides.get(field_name, getattr(style, field_name))
+            overrides[field_name] = {**current, attribute: arguments[argument]}
+    return replace(style, **overrides)
+
+
+def _int_argument(arguments: dict, name: str, default: Optional[int]) -> Optional[int]:
+    value = arguments.get(name, default)
+    try:
+        return None if value is None else int(value)
+    except ValueError:
+        raise GraphgifRuntimeError(f"Argument '{name}' must be a number, got '{value}'") from None
+
+
+def _float_argument(arguments: dict, name: str, default: Optional[float]) -> Optional[float]:
+    value = arguments.get(name, default)
+    try:
+        return None if value is None else float(value)
+    except ValueError:
+        raise GraphgifRuntimeError(f"Argument '{name}' must be a number, got '{value}'") from None
+
+
+def _bool_argument(arguments: dict, name: str, default: bool) -> bool:
+    value = arguments.get(name, default)
+    if isinstance(value, bool):
+        return value
+    if str(value).lower() in ('true', 'yes', '1'):
+        return True
+    if str(value).lower() in ('false', 'no', '0'):
+        return False
+    raise GraphgifRuntimeError(f"Argument '{name}' must be true or false, got '{value}'")
+
+
+def build_frame_log(graph_model: GraphModel, command: Command, snapshots: Optional[dict] = None) -> FrameLog:
+    """Run a command's traversal and turn it into a frame log."""
+    arguments = command_arguments(command)
+    log = traverse_command(graph_model, command, snapshots)
+    keyframe_interval = _int_argument(arguments, 'keyframe_interval', DEFAULT_KEYFRAME_INTERVAL)
+    return frames_from_traversal(graph_model.get_graph(command.graph_name), log,
+                                 traversal_style(arguments), keyframe_interval)
+
+
+def run_command(graph_model: GraphModel, command: Command, snapshots: Optional[dict] = None,
+                cache: Optional[RenderCache] = None) -> List[str]:
+    """
+    Execute a run command and return the paths it wrote: the GIF, the image of every frame, or
+    the directory of DOT files.
+    output ending in .gif renders an animated GIF; another image extension (.png, .svg, ...)
+    renders one image per frame; output without an extension is a directory that receives
+    one DOT file per frame. engine, dpi and duration arguments apply to rendered output, as do
+    workers (rendering processes; by default frames render in this process, or in one process
+    per CPU for animations of rasterize.POOL_MIN_FRAMES frames or more), frame_timeout (seconds per frame)
+    and max_in_flight (frames rendering or waiting to be written at once). Rendered frames share
+    one layout computed by the engine, unless fixed_layout=false lays out each frame separately;
+    over a fixed layout, composite=false sends every frame through Graphviz. Renders go through
+    cache when one is given.
+    """
+    arguments = command_arguments(command)
+    output = str(arguments.get('output', f"{command.graph_name}.gif"))
+    frame_log = build_frame_log(graph_model, command, snapshots)
+    engine = str(arguments.get('engine', 'dot'))
+    dpi = _int_argument(arguments, 'dpi', None)
+    pool = {
+        'workers': _int_argument(arguments, 'workers', default_workers(len(frame_log))),
+        'timeout': _float_argument(arguments, 'frame_timeout', None),
+        'max_in_flight': _int_argument(arguments, 'max_in_flight', None),
+    }
+    composite = _bool_argument(arguments, 'composite', True)
+
+    extension = os.path.splitext(output)[1].lower()
+    layout = None
+    if extension and _bool_argument(arguments, 'fixed_layout', True):
+        layout = compute_layout(frame_log.graph, engine, pool['timeout'], cache=cache)
+    if extension == '.gif':
+        export_gif(frame_log, output, engine, dpi,
+                   duration=_int_argument(arguments, 'duration', DEFAULT_FRAME_DURATION), layout=layout,
+                   composite=composite, cache=cache, **pool)
+    elif extension:
+        # Frames are written next to output as <stem>_0000<extension>, ...; output itself is not
+        return export_image_sequence(frame_log, output, engine, dpi, layout=layout, composite=composite,
+                                     cache=cache, **pool)
+    else:
+        export_dot_sequence(frame_log, output)
+    return [output]
+
+
+def run_program(program: Program, graph_model: GraphModel, cache: Optional[RenderCache] = None) -> List[str]:
+    """Execute every command of a program, sharing graph snapshots between them."""
+    snapshots: Dict[str, object] = {}
+    return [path for command in program.commands for path in run_command(graph_model, command, snapshots, cache)]
@@ -0,0 +1,147 @@
+"""
+Batch compilation of GraphGif files.
+    python batch.py DIR [-j N] [--backend fast] [--validate]
+parses every .gg file of a directory across a pool of worker processes. Each worker warms the
+parser once and keeps it for all the files it is given. Results come back in path order, whatever
+the number of workers, with the diagnostics of each file collected instead of printed as they occur.
+"""
+
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+from errors import GraphgifError, GraphGifErrorListener
+from models import Program
+from parsing import parse_graphgif
+from parsing.ast_cache import ASTCache
+from validation import validate_ast
+
+# Files handed to a worker at a time; small enough to balance uneven file sizes
+CHUNK_SIZE = 4
+
+
+@dataclass
+class CompileResult:
+    """Outcome of compiling one file: AST, graph model, diagnostics and timings in seconds."""
+    path: str
+    program: Optional[Program] = None
+    graph_model: object = None
+    errors: list = field(default_factory=list)
+    timings: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def print_errors(self):
+        """Print the file's diagnostics the way the parser's error listener does."""
+        listener = GraphGifErrorListener(self.path)
+        listener.errors = list(self.errors)
+        listener.print_errors()
+
+
+def find_sources(directory: str, extension: str = '.gg') -> List[str]:
+    """Source files below directory, sorted so batches are reproducible."""
+    paths = []
+    for root, _, names in os.walk(directory):
+        paths.extend(os.path.join(root, name) for name in names if name.endswith(extension))
+    return sorted(paths)
+
+
+def compile_file(path: str, backend: str = 'antlr', storage: str = 'dict',
+                 validate: bool = False, ast_cache_dir: Optional[str] = None) -> CompileResult:
+    """
+    Parse (and optionally validate) one file without printing anything.
+    With ast_cache_dir, unchanged files are loaded from the AST cache in that directory.
+    """
+    result = CompileResult(path)
+    listener = GraphGifErrorListener(path)
+    start = time.perf_counter()
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            source = f.read()
+    except OSError as e:
+        listener.add_error('io', str(e), None, None)
+        result.errors = listener.get_errors()
+        return result
+    result.timings['read'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parse = parse_graphgif if ast_cache_dir is None else ASTCache(ast_cache_dir).parse
+    try:
+        parsed = parse(source, backend=backend, storage=storage, source_name=path, print_errors=False)
+    except GraphgifError as e:
+        # Semantic errors raised while building the graph model
+        listener.add_error('semantic', e.message, e.line, e.column, e.context)
+    except ValueError as e:
+        # Undefined and mistyped variables found while building the graph model
+        listener.add_error('semantic', str(e), None, None)
+    except Exception as e:
+        # The AST builder can fail on malformed input the parser recovered from;
+        # that fails this file only, not the batch
+        listener.add_error('internal', f"{type(e).__name__}: {e}", None, None)
+    else:
+        result.program, result.graph_model = parsed
+        listener.errors.extend(parsed.errors)
+    result.timings['parse'] = time.perf_counter() - start
+
+    if validate and result.program is not None and not listener.has_errors():
+        start = time.perf_counter()
+        for error in validate_ast(result.program).errors:
+            listener.add_error('semantic', error.message, None, None)
+        result.timings['validate'] = time.perf_counter() - start
+
+    result.errors = listener.get_errors()
+    return result
+
+
+def _init_worker(backend: str):
+    from watch import warm_up
+    warm_up(backend)
+
+
+def _compile_worker(args) -> CompileResult:
+    return compile_file(*args)
+
+
+def compile_files(paths: Iterable[str], workers: Optional[int] = None, backend: str = 'antlr',
+                  storage: str = 'dict', validate: bool = False,
+                  ast_cache_dir: Optional[str] = None) -> List[CompileResult]:
+    """
+    Compile files across workers processes (in this process when workers is None or 1).
+    Results are returned in the order of paths.
+    """
+    tasks = [(path, backend, storage, validate, ast_cache_dir) for path in paths]
+    if not workers or workers <= 1 or len(tasks) <= 1:
+        return [_compile_worker(task) for task in tasks]
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(min(workers, len(tasks)), initializer=_init_worker,
+                             initargs=(backend,)) as executor:
+        return list(executor.map(_compile_worker, tasks, chunksize=CHUNK_SIZE))
+
+
+def compile_directory(directory: str, workers: Optional[int] = None, backend: str = 'antlr',
+                      storage: str = 'dict', validate: bool = False,
+                      ast_cache_dir: Optional[str] = None) -> List[CompileResult]:
+    return compile_files(find_sources(directory), workers, backend, storage, validate, ast_cache_dir)
+
+
+def report(results: List[CompileResult], verbose: bool = False):
+    """Print each file's diagnostics in order, then a summary line."""
+    for result in results:
+        if result.errors:
+            result.print_errors()
+        elif verbose:
+            graphs = len(result.program.graph_declarations)
+            print(f"{result.path}: {graphs} graphs in {result.timings['parse'] * 1000:.1f} ms")
+    failed = sum(1 for result in results if result.errors)
+    parse_time = sum(result.timings.get('parse', 0.0) for result in results)
+    print(f"{len(results)} files, {failed} with errors, {parse_time * 1000:.1f} ms parsing")
+
+
+if __name__ == "__main__":
+    from cli import main
+    sys.exit(main(['build', *sys.argv[1:]]))
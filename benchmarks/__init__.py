@@ -0,0 +1,5 @@
+"""
+Benchmarks for GraphGif.
+Each module is a standalone script, run from the repository root, e.g.:
+    python -m benchmarks.bench_backends
+"""
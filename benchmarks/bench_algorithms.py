@@ -0,0 +1,41 @@
+"""
+Time to produce traversal frame logs on a large graph.
+Freezes a random graph of node_count nodes (four edges per node) and times the BFS and
+DFS traversal logs; the BFS log for 100k nodes is expected in well under a second.
+Run from the repository root: python -m benchmarks.bench_algorithms [node_count]
+"""
+
+import sys
+
+from models.graph_model import ConcreteGraph
+from animation.algorithms import ALGORITHMS
+from benchmarks.bench_csr import best_time
+from benchmarks.bench_storage import DEGREE, generate_edges
+
+# Budget for the BFS frame log of the default graph, in seconds
+BFS_BUDGET = 1.0
+
+
+def main():
+    node_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    node_ids, edges = generate_edges(node_count * DEGREE)
+
+    graph = ConcreteGraph("Network", False)
+    for source, target, attributes in edges:
+        graph.add_edge(source, target, attributes)
+    freeze_seconds, snapshot = best_time(graph.freeze, repeat=1)
+
+    print(f"Input: {snapshot.node_count} nodes, {snapshot.edge_count} edges (freeze {freeze_seconds:.2f} s)")
+    results = {}
+    for name, algorithm in ALGORITHMS.items():
+        seconds, log = best_time(lambda: algorithm(snapshot, node_ids[0]))
+        results[name] = seconds
+        print(f"{name:>4}: {seconds:8.3f} s  {log.step_count:>7} steps  {len(log.order):>7} nodes visited")
+
+    if results['bfs'] > BFS_BUDGET:
+        print(f"FAIL: BFS frame log took longer than {BFS_BUDGET} s")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Fused single-pass analysis versus the separate visitors.
+Parses a synthetic program with the fast backend, then times SemanticValidator, GraphAnalyzer
+and GraphStatisticsVisitor run one after the other against analyze_program, which produces
+the same results from one traversal. The fused pass is expected to be faster.
+Run from the repository root: python -m benchmarks.bench_analysis [statement_count]
+"""
+
+import contextlib
+import gc
+import io
+import sys
+
+from analysis import analyze_program
+from parsing import parse_graphgif
+from validation import analyze_graphs, validate_ast
+from visitors import GraphStatisticsVisitor
+from benchmarks.bench_csr import best_time
+from benchmarks.synthetic import generate_program
+
+
+def separate(program):
+    statistics = GraphStatisticsVisitor()
+    statistics.visit_program(program)
+    return validate_ast(program), analyze_graphs(program), statistics
+
+
+def timed(function) -> tuple:
+    """best_time with the garbage collector off; collections over the program would dominate."""
+    gc.collect()
+    gc.disable()
+    try:
+        return best_time(function, repeat=5)
+    finally:
+        gc.enable()
+
+
+def main():
+    statement_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    with contextlib.redirect_stdout(io.StringIO()):
+        program = parse_graphgif(generate_program(statement_count), backend='fast').program
+
+    separate_seconds, (validator, analyzer, statistics) = timed(lambda: separate(program))
+    fused_seconds, fused = timed(lambda: analyze_program(program))
+    print(f"Input: {statement_count} statements")
+    print(f"separate visitors: {separate_seconds * 1000:8.1f} ms")
+    print(f"fused pass:        {fused_seconds * 1000:8.1f} ms  ({separate_seconds / fused_seconds:.2f}x)")
+
+    failed = False
+    if ([error.message for error in fused['validation'].warnings] != [error.message for error in validator.warnings]
+            or fused['graphs'].graphs != analyzer.graphs
+            or fused['statistics'].get_statistics() != statistics.get_statistics()):
+        print("FAIL: fused pass results differ from the separate visitors")
+        failed = True
+    if fused_seconds >= separate_seconds:
+        print("FAIL: fused pass is not faster than the separate visitors")
+        failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Memory retained by the AST of a large program.
+Parses a synthetic 500k-edge program, without building its concrete graph, and measures the
+program with tracemalloc. For comparison the program is copied into UnsharedAST, mirror classes
+with a per-instance __dict__ in which every node id, value and attribute is a separate object,
+as the parsers used to produce them, and into the flat arena of models.arena. Reports retained
+memory of each, and the number of distinct string objects of the object trees.
+Run from the repository root: python -m benchmarks.bench_ast_memory [edge_count]
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+from dataclasses import fields, is_dataclass, make_dataclass
+
+from incremental import parse_declarations
+from models import ASTNode
+from models.arena import to_arena
+from models.serialization import AST_CLASSES
+from benchmarks.bench_storage import generate_edges
+
+# The unshared copy must take at least this many times the memory of the parsed program
+MIN_REDUCTION = 2.0
+# ... and the parsed program this many times the memory of its arena form; both hold the same
+# node id strings, which the arena cannot shrink
+MIN_ARENA_REDUCTION = 1.8
+
+# Non-slotted mirror of every AST class, by class
+UnsharedAST = {cls: make_dataclass(cls.__name__, [f.name for f in fields(cls)]) for cls in AST_CLASSES}
+
+
+def generate_source(edge_count: int) -> str:
+    _, edges = generate_edges(edge_count)
+    lines = ["directed graph Network {", "    node [shape='box'];"]
+    for source, target, attributes in edges:
+        if attributes:
+            attribute_text = ", ".join(f"{key}={value!r}" for key, value in attributes.items())
+            lines.append(f"    {source} -> {target} [{attribute_text}];")
+        else:
+            lines.append(f"    {source} -> {target};")
+    lines.append("};")
+    return "\n".join(lines) + "\n"
+
+
+def unshare(value):
+    """Copy of an AST with mirror classes and a fresh object for every node and string."""
+    if isinstance(value, ASTNode):
+        return UnsharedAST[type(value)](*(unshare(getattr(value, f.name)) for f in fields(value)))
+    if isinstance(value, list):
+        return [unshare(item) for item in value]
+    if isinstance(value, str):
+        return (value + '.')[:-1]
+    return value
+
+
+def string_objects(value, seen: set) -> set:
+    """Ids of the distinct string objects reachable from an AST."""
+    stack = [value]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, str):
+            seen.add(id(value))
+        elif isinstance(value, list):
+            stack.extend(value)
+        elif is_dataclass(value) and not isinstance(value, type):
+            stack.extend(getattr(value, f.name) for f in fields(value))
+    return seen
+
+
+def measure(build) -> tuple:
+    """Return (seconds, retained_bytes, result) for calling build."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, retained, result
+
+
+def parse_program(source: str):
+    program, _, errors = parse_declarations(source)
+    assert errors == []
+    return program
+
+
+def main():
+    edge_count = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    source = generate_source(edge_count)
+
+    print(f"Input: {edge_count} edges, {len(source) / 2 ** 20:.1f} MiB of source")
+    print(f"{'AST':>9} {'seconds':>8} {'MiB':>8} {'strings':>10}")
+    parse_seconds, parsed_size, program = measure(lambda: parse_program(source))
+    copy_seconds, unshared_size, unshared = measure(lambda: unshare(program))
+    assert len(unshared.graph_declarations[0].statements) == edge_count
+    for name, seconds, size, tree in (("unshared", copy_seconds, unshared_size, unshared),
+                                      ("parsed", parse_seconds, parsed_size, program)):
+        strings = len(string_objects(tree, set()))
+        print(f"{name:>9} {seconds:>8.2f} {size / 2 ** 20:>8.1f} {strings:>10,}")
+
+    # The object program is garbage once converted, so only the arena is retained
+    arena_seconds, arena_size, arena_program = measure(lambda: to_arena(parse_program(source)))
+    assert len(arena_program.graph_declarations[0].statements) == edge_count
+    print(f"{'arena':>9} {arena_seconds:>8.2f} {arena_size / 2 ** 20:>8.1f} {'':>10}")
+
+    reduction = unshared_size / parsed_size
+    arena_reduction = parsed_size / arena_size
+    print(f"memory reduction: {reduction:.1f}x, arena: {arena_reduction:.1f}x more")
+    if reduction < MIN_REDUCTION:
+        print(f"FAIL: memory reduction {reduction:.1f}x is below {MIN_REDUCTION:.1f}x")
+        sys.exit(1)
+    if arena_reduction < MIN_ARENA_REDUCTION:
+        print(f"FAIL: arena memory reduction {arena_reduction:.1f}x is below {MIN_ARENA_REDUCTION:.1f}x")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Memory and allocations of layered attribute inheritance in ConcreteGraph.
+Builds a default-heavy graph (several global node and edge attributes, few per-element
+values) with ConcreteGraph and with EagerConcreteGraph, which copies and merges the global
+defaults into every element as ConcreteGraph used to. Reports the retained memory and live
+allocated blocks measured with tracemalloc, plus build time.
+Run from the repository root: python -m benchmarks.bench_attributes [edge_count]
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+
+from models.graph_model import ConcreteGraph, GraphNode, GraphEdge
+from benchmarks.bench_storage import generate_edges
+
+GLOBAL_NODE_ATTRIBUTES = {'shape': 'box', 'fontname': 'Arial', 'fontsize': 10, 'style': 'filled', 'color': 'gray'}
+GLOBAL_EDGE_ATTRIBUTES = {'color': 'gray', 'fontsize': 8, 'arrowhead': 'vee', 'penwidth': 1}
+
+
+class EagerConcreteGraph(ConcreteGraph):
+    """ConcreteGraph with the copy-and-update attribute merging, for comparison."""
+
+    def _add_node(self, node_id, attributes=None):
+        merged_attrs = self.global_node_attributes.copy()
+        if attributes:
+            merged_attrs.update(attributes)
+        if node_id not in self.nodes:
+            self.nodes[node_id] = GraphNode(node_id, merged_attrs)
+        else:
+            self.nodes[node_id].attributes.update(merged_attrs)
+        return self.nodes[node_id]
+
+    def _resolve_edge(self, source, target, attributes=None):
+        merged_attrs = self.global_edge_attributes.copy()
+        if attributes:
+            merged_attrs.update(attributes)
+        return GraphEdge(source, target, self.directed, merged_attrs)
+
+
+def build(graph_class, node_ids: list, edges: list) -> ConcreteGraph:
+    graph = graph_class("Network", True)
+    graph.global_node_attributes.update(GLOBAL_NODE_ATTRIBUTES)
+    graph.global_edge_attributes.update(GLOBAL_EDGE_ATTRIBUTES)
+    # The model builders' entry points, which keep the attribute dicts they are given
+    for i, node_id in enumerate(node_ids[::10]):
+        graph._add_node(node_id, {'label': f"Host {i}"})
+    for source, target, attributes in edges:
+        graph._add_edge(source, target, attributes)
+    return graph
+
+
+def measure(graph_class, node_ids: list, edges: list) -> tuple:
+    """Return (seconds, retained_bytes, live_blocks) for building the graph."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    graph = build(graph_class, node_ids, edges)
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    statistics = snapshot.statistics('filename')
+    retained = sum(stat.size for stat in statistics)
+    blocks = sum(stat.count for stat in statistics)
+    assert len(graph.edges) == len(edges)
+    return elapsed, retained, blocks
+
+
+def main():
+    edge_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    node_ids, edges = generate_edges(edge_count)
+
+    print(f"Input: {len(node_ids)} nodes, {edge_count} edges")
+    print(f"{'engine':>8} {'build s':>8} {'MiB':>8} {'blocks':>10}")
+    results = {}
+    for name, graph_class in (("eager", EagerConcreteGraph), ("layered", ConcreteGraph)):
+        results[name] = measure(graph_class, node_ids, edges)
+        elapsed, retained, blocks = results[name]
+        print(f"{name:>8} {elapsed:>8.2f} {retained / 2 ** 20:>8.1f} {blocks:>10,}")
+    print(f"memory reduction: {results['eager'][1] / results['layered'][1]:.1f}x, "
+          f"block reduction: {results['eager'][2] / results['layered'][2]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
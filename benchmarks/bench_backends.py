@@ -0,0 +1,42 @@
+"""
+Throughput of the ANTLR and fast parsing backends in tokens per second.
+Run from the repository root: python -m benchmarks.bench_backends [statement_count]
+"""
+
+import contextlib
+import io
+import sys
+import time
+
+from parsing import parse_graphgif
+from parsing.fast_parser import tokenize
+from benchmarks.synthetic import generate_program
+
+
+def time_backend(source: str, backend: str, repeat: int = 3) -> float:
+    """Return the best wall-clock time of parse_graphgif over repeat runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            parse_graphgif(source, backend=backend)
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    statement_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    source = generate_program(statement_count)
+    token_count = len(tokenize(source)) - 1  # without EOF
+
+    print(f"Input: {statement_count} statements, {token_count} tokens, {len(source)} chars")
+    results = {}
+    for backend in ("antlr", "fast"):
+        elapsed = time_backend(source, backend)
+        results[backend] = elapsed
+        print(f"{backend:>6}: {elapsed:8.3f} s  {token_count / elapsed:12,.0f} tokens/s")
+    print(f"speedup: {results['antlr'] / results['fast']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Scaling of parse-to-model time for a single large graph.
+Parses one graph of increasing size with the ANTLR backend and times the parse and the
+ASTBuilder walk separately; per-statement cost should stay flat as the graph grows.
+Like timeit, garbage collection is disabled while timing so collector passes over the
+growing heap do not mask the builder's own complexity.
+Run from the repository root: python -m benchmarks.bench_builder [max_statements]
+"""
+
+import gc
+import sys
+import time
+
+from antlr4 import ParseTreeWalker
+
+from errors import GraphGifErrorListener
+from parsing.ast_builder import ASTBuilder, build_parse_tree
+from benchmarks.synthetic import generate_program
+
+# Allowed growth of the per-statement builder cost between the smallest and largest input
+LINEAR_TOLERANCE = 2.0
+
+
+def measure(statement_count: int) -> tuple:
+    """Return (parse_seconds, build_seconds) for a graph of statement_count statements."""
+    source = generate_program(statement_count)
+    gc.collect()
+    gc.disable()
+    try:
+        return _timed_parse_and_build(source, statement_count)
+    finally:
+        gc.enable()
+
+
+def _timed_parse_and_build(source: str, statement_count: int) -> tuple:
+    start = time.perf_counter()
+    tree, _ = build_parse_tree(source, GraphGifErrorListener(), two_stage=True)
+    parse_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    builder = ASTBuilder()
+    ParseTreeWalker().walk(builder, tree)
+    build_seconds = time.perf_counter() - start
+
+    assert len(builder.program.graph_declarations[0].statements) == statement_count
+    return parse_seconds, build_seconds
+
+
+def main():
+    max_statements = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    sizes = [max_statements // 8, max_statements // 4, max_statements // 2, max_statements]
+
+    print(f"{'statements':>10} {'parse s':>9} {'build s':>9} {'build us/stmt':>14}")
+    per_statement = []
+    for size in sizes:
+        parse_seconds, build_seconds = measure(size)
+        per_statement.append(build_seconds / size)
+        print(f"{size:>10} {parse_seconds:>9.2f} {build_seconds:>9.2f} {per_statement[-1] * 1e6:>14.2f}")
+
+    growth = per_statement[-1] / per_statement[0]
+    print(f"per-statement build cost growth {sizes[0]} -> {sizes[-1]}: {growth:.2f}x")
+    if growth > LINEAR_TOLERANCE:
+        print("FAIL: AST/model construction is not linear in the number of statements")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Scaling of GraphAnalyzer's connectivity labelling.
+Analyzes a random directed graph of increasing edge count (DEGREE edges per node) and times the
+weak (union-find) and strong (Tarjan) component labellings; per-edge cost should stay flat as
+the graph grows. The largest graph also gets a single cycle through all its nodes, the worst
+case for the depth of Tarjan's search.
+Run from the repository root: python -m benchmarks.bench_connectivity [max_edges]
+"""
+
+import gc
+import sys
+import time
+
+from models import EdgeDecl, EdgeOperator, GraphDecl, GraphDirection, Program
+from validation import analyze_graphs
+from benchmarks.bench_storage import generate_edges
+
+# Allowed growth of the per-edge labelling cost between the smallest and largest input; higher
+# than for sequential work, as random access to node arrays leaves the CPU caches as they grow
+LINEAR_TOLERANCE = 3.0
+
+
+def _analyzer(pairs):
+    statements = [EdgeDecl(source, EdgeOperator.DIRECTED_RIGHT, target) for source, target in pairs]
+    return analyze_graphs(Program([], [GraphDecl(GraphDirection.DIRECTED, 'G', [], statements)], []))
+
+
+def measure(pairs) -> tuple:
+    """Return (weak_seconds, strong_seconds, weak_count, strong_count) for a graph of pairs."""
+    analyzer = _analyzer(pairs)
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        weak = analyzer.weak_components('G')
+        weak_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        strong = analyzer.strong_components('G')
+        strong_seconds = time.perf_counter() - start
+    finally:
+        gc.enable()
+    return weak_seconds, strong_seconds, weak.count, strong.count
+
+
+def main():
+    max_edges = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    sizes = [max_edges // 8, max_edges // 4, max_edges // 2, max_edges]
+
+    print(f"{'edges':>9} {'weak s':>8} {'strong s':>9} {'us/edge':>8} {'weak':>7} {'strong':>7}")
+    per_edge = []
+    for size in sizes:
+        _, edges = generate_edges(size)
+        weak_seconds, strong_seconds, weak, strong = measure([(source, target) for source, target, _ in edges])
+        per_edge.append((weak_seconds + strong_seconds) / size)
+        print(f"{size:>9} {weak_seconds:>8.2f} {strong_seconds:>9.2f} {per_edge[-1] * 1e6:>8.2f} {weak:>7} {strong:>7}")
+
+    node_count = max_edges // 4
+    ring = [(f"host{i}", f"host{(i + 1) % node_count}") for i in range(node_count)]
+    weak_seconds, strong_seconds, _, strong = measure(ring)
+    print(f"cycle of {node_count} nodes: strong {strong_seconds:.2f} s, {strong} component")
+
+    growth = per_edge[-1] / per_edge[0]
+    print(f"per-edge labelling cost growth {sizes[0]} -> {sizes[-1]}: {growth:.2f}x")
+    failed = False
+    if strong != 1:
+        print("FAIL: a cycle through every node is not one strong component")
+        failed = True
+    if growth > LINEAR_TOLERANCE:
+        print("FAIL: component labelling is not linear in the number of edges")
+        failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Breadth-first search over ConcreteGraph's adjacency dicts versus a frozen CSR snapshot.
+Builds a random graph, then times a queue-based BFS using ConcreteGraph.neighbors against
+CSRGraph.bfs_levels, which expands each frontier with vectorised NumPy operations.
+Both must visit the nodes in the same order.
+Run from the repository root: python -m benchmarks.bench_csr [edge_count]
+"""
+
+import sys
+import time
+from collections import deque
+
+from models.graph_model import ConcreteGraph
+from benchmarks.bench_storage import generate_edges
+
+
+def dict_bfs(graph: ConcreteGraph, start: str) -> list:
+    """Queue-based BFS over the graph's adjacency index."""
+    visited = {start}
+    order = [start]
+    queue = deque(order)
+    while queue:
+        for neighbour in graph.neighbors(queue.popleft()):
+            if neighbour not in visited:
+                visited.add(neighbour)
+                order.append(neighbour)
+                queue.append(neighbour)
+    return order
+
+
+def best_time(function, repeat: int = 3) -> tuple:
+    """Return (best_seconds, result) over repeat calls."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    edge_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    node_ids, edges = generate_edges(edge_count)
+
+    graph = ConcreteGraph("Network", True)
+    for node_id in node_ids:
+        graph.add_node(node_id)
+    for source, target, attributes in edges:
+        graph.add_edge(source, target, attributes)
+    start_node = node_ids[0]
+
+    freeze_seconds, frozen = best_time(graph.freeze, repeat=1)
+    dict_seconds, dict_order = best_time(lambda: dict_bfs(graph, start_node))
+    csr_seconds, csr_order = best_time(lambda: frozen.bfs_order(start_node))
+    assert csr_order == dict_order
+
+    print(f"Input: {len(node_ids)} nodes, {edge_count} edges, {len(dict_order)} reachable")
+    print(f"freeze: {freeze_seconds:8.3f} s")
+    print(f"  dict: {dict_seconds:8.3f} s")
+    print(f"   csr: {csr_seconds:8.3f} s")
+    print(f"speedup: {dict_seconds / csr_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Import time of the light entry points, measured with python -X importtime.
+models, validation and the CLI must import without the ANTLR runtime, graphviz, NumPy or
+Pillow, and the CLI within IMPORT_BUDGET_MS; these modules are loaded on first use instead.
+Run from the repository root: python -m benchmarks.bench_import
+"""
+
+import os
+import subprocess
+import sys
+from typing import Dict, Tuple
+
+# Modules that must not be imported at startup
+HEAVY_MODULES = ('antlr4', 'graphviz', 'numpy', 'PIL')
+# Entry points checked, and the budget for importing the CLI, in milliseconds
+LIGHT_MODULES = ('models', 'validation', 'cli')
+IMPORT_BUDGET_MS = 150
+REPOSITORY_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure(module: str) -> Tuple[float, Dict[str, float]]:
+    """
+    Import module in a fresh interpreter; return its cumulative import time and the
+    cumulative time of every module imported along the way, in milliseconds.
+    """
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                             cwd=REPOSITORY_ROOT, capture_output=True, text=True, check=True)
+    imported = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        imported[name.strip()] = int(cumulative) / 1000
+    return imported[module], imported
+
+
+def heavy_imports(imported: Dict[str, float]) -> list:
+    return sorted(name for name in imported if name.split('.')[0] in HEAVY_MODULES)
+
+
+def main():
+    failed = False
+    times = {}
+    for module in LIGHT_MODULES:
+        # Best of three, as the first run also pays for writing bytecode caches
+        times[module], imported = min(measure(module) for _ in range(3))
+        heavy = heavy_imports(imported)
+        print(f"{module:>10}: {times[module]:7.1f} ms  {len(imported):>4} modules"
+              + (f"  heavy: {', '.join(heavy)}" if heavy else ""))
+        failed |= bool(heavy)
+
+    if times['cli'] > IMPORT_BUDGET_MS:
+        print(f"FAIL: importing cli took longer than {IMPORT_BUDGET_MS} ms")
+        failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
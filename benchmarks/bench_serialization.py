@@ -0,0 +1,59 @@
+"""
+Loading a parsed program from the binary AST cache format versus parsing it again and
+versus pickle. Reports the size of both encodings and the best time of several runs for
+parsing with the fast backend, loads and pickle.loads, per graph storage engine.
+Run from the repository root: python -m benchmarks.bench_serialization [statement_count]
+"""
+
+import contextlib
+import io
+import pickle
+import sys
+import time
+
+from models.serialization import dumps, loads
+from parsing import parse_graphgif
+from benchmarks.synthetic import generate_program
+
+REPEATS = 5
+
+
+def best_time(function, repeats: int = REPEATS) -> float:
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    statement_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    source = generate_program(statement_count)
+    failed = False
+
+    print(f"{'storage':>8} {'binary KiB':>11} {'pickle KiB':>11} {'parse ms':>9} {'loads ms':>9} "
+          f"{'pickle ms':>10}")
+    for storage in ('dict', 'compact'):
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = parse_graphgif(source, backend='fast', storage=storage)
+            parse_seconds = best_time(lambda: parse_graphgif(source, backend='fast', storage=storage), 3)
+        data = dumps(result.program, result.graph_model)
+        pickled = pickle.dumps((result.program, result.graph_model), protocol=pickle.HIGHEST_PROTOCOL)
+        load_seconds = best_time(lambda: loads(data))
+        pickle_seconds = best_time(lambda: pickle.loads(pickled))
+        print(f"{storage:>8} {len(data) / 1024:>11.0f} {len(pickled) / 1024:>11.0f} {parse_seconds * 1e3:>9.1f} "
+              f"{load_seconds * 1e3:>9.1f} {pickle_seconds * 1e3:>10.1f}")
+
+        if loads(data)[0] != result.program:
+            print(f"FAIL: {storage} program does not round-trip")
+            failed = True
+        if load_seconds >= min(parse_seconds, pickle_seconds):
+            print(f"FAIL: loading {storage} models is not faster than parsing and pickle")
+            failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
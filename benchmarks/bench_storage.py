@@ -0,0 +1,63 @@
+"""
+Retained memory of the ConcreteGraph and CompactGraph storage engines.
+Builds a network-like graph (global edge defaults, one edge in ten with its own attributes)
+with each engine and reports the memory it holds, measured with tracemalloc. Node ID strings
+are created before measuring, so only the graph's own structures are counted.
+Run from the repository root: python -m benchmarks.bench_storage [edge_count ...]
+"""
+
+import gc
+import random
+import sys
+import tracemalloc
+
+from parsing.model_builder import STORAGE_ENGINES
+
+DEFAULT_SIZES = (10000, 100000, 1000000)
+
+# Average number of edges per node
+DEGREE = 4
+
+
+def generate_edges(edge_count: int, seed: int = 0) -> tuple:
+    """Return (node_ids, edges) where edges are (source, target, attributes) triples."""
+    rng = random.Random(seed)
+    node_ids = [f"host{i}" for i in range(max(1, edge_count // DEGREE))]
+    edges = []
+    for i in range(edge_count):
+        attributes = {'weight': i % 7, 'color': 'red'} if i % 10 == 0 else None
+        edges.append((rng.choice(node_ids), rng.choice(node_ids), attributes))
+    return node_ids, edges
+
+
+def measure(storage: str, edges: list) -> int:
+    """Return the bytes retained by a graph of the given storage engine holding edges."""
+    gc.collect()
+    tracemalloc.start()
+    graph = STORAGE_ENGINES[storage]("Network", True)
+    graph.global_node_attributes.update({'shape': 'box', 'fontname': 'Arial'})
+    graph.global_edge_attributes.update({'color': 'gray', 'fontsize': 10})
+    for source, target, attributes in edges:
+        graph.add_edge(source, target, attributes)
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(graph.edges) == len(edges)
+    return retained
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+
+    print(f"{'edges':>9} {'engine':>8} {'MiB':>9} {'bytes/edge':>11}")
+    for size in sizes:
+        _, edges = generate_edges(size)
+        results = {}
+        for storage in STORAGE_ENGINES:
+            results[storage] = measure(storage, edges)
+            print(f"{size:>9} {storage:>8} {results[storage] / 2 ** 20:>9.1f} {results[storage] / size:>11.1f}")
+        print(f"{'':>9} {'ratio':>8} {results['dict'] / results['compact']:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Peak memory of whole-file parsing versus streaming ingestion.
+Writes a synthetic program to a temporary file and loads it with parse_graphgif_file and
+with load_graph_model, reporting the tracemalloc peak of each. A final streaming pass with
+retain_edges disabled shows the bound when edges are consumed as events only.
+Run from the repository root: python -m benchmarks.bench_streaming [statement_count]
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from parsing import parse_graphgif_file, iter_graph_events, load_graph_model
+from benchmarks.synthetic import generate_program
+
+
+def measure(load) -> tuple:
+    """Return (seconds, peak_bytes) for a call to load."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        load()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    statement_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    with tempfile.NamedTemporaryFile('w', suffix='.gg', delete=False) as f:
+        f.write(generate_program(statement_count))
+        path = f.name
+
+    try:
+        print(f"Input: {statement_count} statements, {os.path.getsize(path):,} bytes")
+        loaders = {
+            "antlr": lambda: parse_graphgif_file(path),
+            "fast": lambda: parse_graphgif_file(path, backend="fast"),
+            "streaming": lambda: load_graph_model(path),
+            "events": lambda: sum(1 for _ in iter_graph_events(path, retain_edges=False)),
+        }
+        for name, load in loaders.items():
+            elapsed, peak = measure(load)
+            print(f"{name:>10}: {elapsed:8.2f} s  peak {peak / 2 ** 20:8.1f} MiB")
+    finally:
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
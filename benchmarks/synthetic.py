@@ -0,0 +1,27 @@
+"""
+Synthetic GraphGif programs for benchmarks.
+"""
+
+
+def generate_program(statement_count: int, graph_name: str = "Synthetic", fan_out: int = 4) -> str:
+    """
+    Generate a single directed graph with statement_count statements.
+    Every fifth statement declares a node with attributes, the rest are edges.
+    """
+    lines = [
+        "var attributes hub_attrs = [shape='box', color='red'];",
+        "",
+        f"directed graph {graph_name} {{",
+        "    graph [rankdir='LR'];",
+        "    node [fontname='Arial'];",
+        "    edge [fontsize=10];",
+    ]
+    for i in range(statement_count):
+        if i % 5 == 0:
+            lines.append(f"    n{i} [label='Node {i}', weight={i}];")
+        else:
+            lines.append(f"    n{i // fan_out} -> n{i};")
+    lines.append("};")
+    lines.append("")
+    lines.append(f"run {graph_name} with (output='{graph_name}.png', start=n0);")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,168 @@
+"""
+Command line interface for GraphGif.
+    python cli.py run FILE [--backend fast] [--cache-dir DIR | --no-cache] [--incremental] [--dfa-cache]
+                           [--ast-cache]
+parses a .gg file, executes its run commands and prints a summary of the outputs;
+    python cli.py watch DIR
+rebuilds the .gg files of a directory as they change;
+    python cli.py build DIR [-j N] [--ast-cache]
+parses every .gg file of a directory in parallel and reports their errors.
+"""
+
+import argparse
+import os
+import sys
+from typing import List, Optional
+
+from animation.cache import DEFAULT_CACHE_SIZE, RenderCache
+from batch import compile_directory, report
+from errors import GraphgifError
+from incremental import IncrementalBuilder, default_state_path
+from parsing import parse_graphgif_file
+from parsing.ast_cache import ASTCache, default_ast_cache_dir
+from parsing.dfa_cache import default_dfa_cache_path, dfa_state_count, load_dfa_cache, save_dfa_cache
+from watch import DEFAULT_DEBOUNCE, DEFAULT_INTERVAL, Watcher, warm_up
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='graphgif', description="GraphGif graph animation interpreter")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run = subparsers.add_parser('run', help="execute the run commands of a .gg file")
+    run.add_argument('file', help="GraphGif source file")
+    run.add_argument('--backend', choices=('antlr', 'fast'), default='antlr', help="parser backend")
+    run.add_argument('--incremental', action='store_true',
+                     help="only rebuild graphs whose declarations, variables or commands changed")
+    run.add_argument('--state', help=f"incremental build state file (default {default_state_path()})")
+    _add_cache_arguments(run)
+    run.add_argument('--ast-cache', action='store_true',
+                     help="load unchanged files from their cached parse instead of parsing them")
+
+    watch = subparsers.add_parser('watch', help="rebuild the .gg files of a directory as they change")
+    watch.add_argument('directory', help="directory to watch")
+    watch.add_argument('--backend', choices=('antlr', 'fast'), default='antlr', help="parser backend")
+    watch.add_argument('--state', help=f"incremental build state file (default {default_state_path()})")
+    watch.add_argument('--interval', type=float, default=DEFAULT_INTERVAL, help="seconds between scans")
+    watch.add_argument('--debounce', type=float, default=DEFAULT_DEBOUNCE,
+                       help="seconds without changes before rebuilding")
+    _add_cache_arguments(watch)
+
+    build = subparsers.add_parser('build', help="parse every .gg file of a directory in parallel")
+    build.add_argument('directory', help="directory to compile")
+    build.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1, help="worker processes")
+    build.add_argument('--backend', choices=('antlr', 'fast'), default='antlr', help="parser backend")
+    build.add_argument('--validate', action='store_true', help="also run semantic validation")
+    build.add_argument('-v', '--verbose', action='store_true', help="list every file with its parse time")
+    build.add_argument('--ast-cache', action='store_true',
+                       help="load unchanged files from their cached parse instead of parsing them")
+    build.add_argument('--cache-dir', help="cache directory (default ~/.cache/graphgif)")
+    return parser
+
+
+def _add_cache_arguments(parser: argparse.ArgumentParser):
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--cache-dir', help="render cache directory (default ~/.cache/graphgif)")
+    group.add_argument('--no-cache', action='store_true', help="render every frame with Graphviz")
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_SIZE // (1024 * 1024),
+                        help="render cache size bound in MiB")
+    parser.add_argument('--dfa-cache', action='store_true',
+                        help="keep the ANTLR parser's prediction state in the cache directory between runs")
+
+
+def make_cache(args: argparse.Namespace) -> Optional[RenderCache]:
+    if args.no_cache:
+        return None
+    return RenderCache(args.cache_dir, args.cache_size * 1024 * 1024)
+
+
+def print_summary(outputs: List[str], cache: Optional[RenderCache], unchanged: Optional[List[str]] = None):
+    for output in outputs:
+        print(f"Wrote {output}")
+    summary = f"{len(outputs)} outputs"
+    if unchanged is not None:
+        summary += f", {len(unchanged)} unchanged graphs"
+    if cache is not None:
+        summary += f", {cache.summary()}"
+    print(summary)
+
+
+def dfa_cache_path(args: argparse.Namespace) -> Optional[str]:
+    if not getattr(args, 'dfa_cache', False) or args.backend != 'antlr':
+        return None
+    return default_dfa_cache_path(args.cache_dir)
+
+
+def ast_cache_dir(args: argparse.Namespace) -> Optional[str]:
+    if not args.ast_cache:
+        return None
+    return os.path.join(args.cache_dir, 'ast') if args.cache_dir else default_ast_cache_dir()
+
+
+def run_file(args: argparse.Namespace) -> int:
+    cache = make_cache(args)
+    if args.incremental:
+        builder = IncrementalBuilder(args.state or default_state_path(), args.backend, cache=cache)
+        result = builder.build_file(args.file)
+        if result.errors:
+            return 1
+        print_summary(result.outputs, cache, result.unchanged)
+        return 0
+
+    from animation.runner import run_program
+
+    cache_dir = ast_cache_dir(args)
+    if cache_dir is None:
+        result = parse_graphgif_file(args.file, backend=args.backend)
+    else:
+        result = ASTCache(cache_dir).parse_file(args.file, backend=args.backend)
+    if result.errors:
+        return 1
+    program, graph_model = result
+    print_summary(run_program(program, graph_model, cache), cache)
+    return 0
+
+
+def watch_directory(args: argparse.Namespace) -> int:
+    warm_up(args.backend)
+    builder = IncrementalBuilder(args.state or default_state_path(), args.backend, cache=make_cache(args),
+                                 validate=True)
+    try:
+        Watcher(args.directory, builder, args.interval, args.debounce).run()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def build_directory(args: argparse.Namespace) -> int:
+    results = compile_directory(args.directory, args.jobs, args.backend, validate=args.validate,
+                                ast_cache_dir=ast_cache_dir(args))
+    report(results, args.verbose)
+    return 0 if all(result.ok for result in results) else 1
+
+
+COMMANDS = {
+    'run': run_file,
+    'watch': watch_directory,
+    'build': build_directory,
+}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    dfa_path = dfa_cache_path(args)
+    if dfa_path is not None:
+        load_dfa_cache(dfa_path)
+        loaded_states = dfa_state_count()
+    try:
+        return COMMANDS[args.command](args)
+    except GraphgifError as e:
+        print(e, file=sys.stderr)
+        return 1
+    finally:
+        # Only rewrite the file when this run taught the parser something new
+        if dfa_path is not None and dfa_state_count() > loaded_states:
+            save_dfa_cache(dfa_path)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
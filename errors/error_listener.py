@@ -1,40 +1,55 @@
-from antlr4 import Lexer
-from antlr4.error.ErrorListener import ErrorListener
 from .exceptions import LexerError, ParserError
 
 
-class GraphGifErrorListener(ErrorListener):
-    """Enhanced error listener with error collection and pretty printing."""
+def _is_lexer(recognizer) -> bool:
+    # Only ANTLR recognizers report through syntaxError, so the runtime is already loaded here
+    from antlr4 import Lexer
+    return isinstance(recognizer, Lexer)
+
+
+class GraphGifErrorListener:
+    """
+    Enhanced error listener with error collection and pretty printing.
+    Implements ANTLR's ErrorListener interface without importing the runtime, so the
+    fast backend can report errors with no ANTLR dependency.
+    """
 
     def __init__(self, source_name: str = "input"):
-        super().__init__()
         self.source_name = source_name
         self._input_cache = None
         self.errors = []  # Stores all encountered errors
 
     def syntaxError(self, recognizer, offending_symbol, line, column, msg, e):
         context_line, marker = self._get_error_context(recognizer, line, column, offending_symbol)
+        self.add_error(
+            'lexer' if _is_lexer(recognizer) else 'parser',
+            msg, line, column, context_line, marker,
+            offending_symbol.text if offending_symbol else None
+        )
+
+        # Still raise exceptions for immediate failure
+        # if isinstance(recognizer, Lexer):
+        #     raise LexerError(msg, line, column, full_context)
+        # else:
+        #     expected = self._get_expected_tokens(recognizer)
+        #     enhanced_msg = f"{msg} (expected: {expected})" if expected else msg
+        #     raise ParserError(enhanced_msg, line, column, full_context)
+
+    def add_error(self, error_type, msg, line, column, context_line=None, marker=None, offending_text=None):
+        """Records an error reported by either the ANTLR recognizers or the fast backend."""
         full_context = f"{context_line}\n{marker}" if context_line else None
 
         # Create error dictionary
         error = {
-            'type': 'lexer' if isinstance(recognizer, Lexer) else 'parser',
+            'type': error_type,
             'message': msg,
             'line': line,
             'column': column,
             'context': full_context,
-            'offending_symbol': offending_symbol.text if offending_symbol else None
+            'offending_symbol': offending_text
         }
         self.errors.append(error)
 
-        # Still raise exceptions for immediate failure
-        # if isinstance(recognizer, Lexer):
-        #     raise LexerError(msg, line, column, full_context)
-        # else:
-        #     expected = self._get_expected_tokens(recognizer)
-        #     enhanced_msg = f"{msg} (expected: {expected})" if expected else msg
-        #     raise ParserError(enhanced_msg, line, column, full_context)
-
     def print_errors(self):
         """Prints all collected errors in a user-friendly format."""
         if not self.errors:
@@ -44,7 +59,10 @@ class GraphGifErrorListener(ErrorListener):
         print(f"\nFound {len(self.errors)} errors in {self.source_name}:")
         for i, error in enumerate(self.errors, 1):
             print(f"\nError {i}: {error['type'].upper()} error")
-            print(f"Line {error['line']}:{error['column']} - {error['message']}")
+            if error['line'] is not None:
+                print(f"Line {error['line']}:{error['column']} - {error['message']}")
+            else:
+                print(error['message'])
             if error['context']:
                 print(error['context'])
 
@@ -71,7 +89,10 @@ class GraphGifErrorListener(ErrorListener):
 
     def _get_error_context(self, recognizer, line, column, offending_symbol):
         """Extract the error line and generate marker"""
-        input_stream = recognizer.getInputStream()
+        if _is_lexer(recognizer):
+            input_stream = recognizer.inputStream
+        else:
+            input_stream = recognizer.getInputStream()
         lines = self._get_input_lines(input_stream)
 
         context_line = lines[line - 1] if 0 < line <= len(lines) else ""
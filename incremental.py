@@ -0,0 +1,195 @@
+"""
+Incremental rebuilds of GraphGif files.
+Each graph declaration is fingerprinted together with the variables it uses (transitively) and
+the run commands targeting it. Fingerprints are persisted between runs, and only graphs whose
+fingerprint changed, or whose outputs are missing, get their concrete graph built and their
+commands executed again.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass, field, fields, is_dataclass
+from typing import Dict, Iterator, List, Optional
+
+from animation.cache import RenderCache, default_cache_dir
+from errors import GraphGifErrorListener
+from models import GraphDecl, Program, VarDecl, VarRef
+from parsing.fast_parser import FastParser
+from parsing.model_builder import GraphModelBuilder
+from validation import validate_ast
+
+STATE_VERSION = 1
+
+
+def default_state_path() -> str:
+    return os.path.join(default_cache_dir(), 'fingerprints.json')
+
+
+def _var_refs(node) -> Iterator[str]:
+    """Names of the variables referenced anywhere below an AST node."""
+    if isinstance(node, VarRef):
+        yield node.name
+    elif isinstance(node, list):
+        for item in node:
+            yield from _var_refs(item)
+    elif is_dataclass(node):
+        for f in fields(node):
+            yield from _var_refs(getattr(node, f.name))
+
+
+def referenced_variables(program: Program, graph_decl: GraphDecl) -> List[VarDecl]:
+    """Variable declarations a graph depends on, following references between variables."""
+    declarations = {var_decl.name: var_decl for var_decl in program.variable_declarations}
+    seen = {}
+    pending = list(_var_refs(graph_decl))
+    while pending:
+        name = pending.pop()
+        if name in seen or name not in declarations:
+            continue
+        seen[name] = declarations[name]
+        pending.extend(_var_refs(declarations[name].value))
+    return [seen[name] for name in sorted(seen)]
+
+
+def graph_fingerprint(program: Program, graph_decl: GraphDecl) -> str:
+    """Hash of a graph declaration, the variables it uses and the commands that run it."""
+    digest = hashlib.sha256()
+    parts = [graph_decl, *referenced_variables(program, graph_decl),
+             *(command for command in program.commands if command.graph_name == graph_decl.name)]
+    for part in parts:
+        digest.update(repr(part).encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+class _DeclarationsOnly:
+    """Builder mixin registering variables but leaving concrete graphs to the incremental driver."""
+
+    def _build_concrete_graph(self, graph_decl: GraphDecl):
+        return None
+
+
+class _DeclarationsFastParser(_DeclarationsOnly, FastParser):
+    pass
+
+
+def parse_declarations(source: str, backend: str = 'fast'):
+    """Parse source into (program, graph_model, errors) without building concrete graphs."""
+    error_listener = GraphGifErrorListener()
+    if backend == 'fast':
+        program, graph_model = _DeclarationsFastParser(source, error_listener).parse()
+    elif backend == 'antlr':
+        from antlr4 import ParseTreeWalker
+        from parsing.ast_builder import ASTBuilder, build_parse_tree
+
+        class DeclarationsASTBuilder(_DeclarationsOnly, ASTBuilder):
+            pass
+
+        tree, _ = build_parse_tree(source, error_listener)
+        builder = DeclarationsASTBuilder()
+        ParseTreeWalker().walk(builder, tree)
+        program, graph_model = builder.program, builder.get_graph_model()
+    else:
+        raise ValueError(f"Unknown parser backend: {backend}")
+    if error_listener.has_errors():
+        error_listener.print_errors()
+    return program, graph_model, error_listener.get_errors()
+
+
+@dataclass
+class BuildResult:
+    """Outcome of an incremental build of one file."""
+    path: str
+    rebuilt: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    outputs: List[str] = field(default_factory=list)
+    errors: list = field(default_factory=list)
+
+
+class IncrementalBuilder:
+    """
+    Rebuilds the graphs of .gg files whose inputs changed since the previous build.
+    State maps each file's absolute path to {graph name: {'fingerprint', 'outputs'}} and is
+    saved to state_path (no persistence when None) after every build. With validate, programs
+    failing semantic validation are not built.
+    """
+
+    def __init__(self, state_path: Optional[str] = None, backend: str = 'fast', storage: str = 'dict',
+                 cache: Optional[RenderCache] = None, validate: bool = False):
+        self.state_path = state_path
+        self.backend = backend
+        self.storage = storage
+        self.cache = cache
+        self.validate = validate
+        self.state: Dict[str, Dict[str, dict]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, dict]]:
+        if self.state_path is None:
+            return {}
+        try:
+            with open(self.state_path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data.get('files', {}) if data.get('version') == STATE_VERSION else {}
+
+    def save(self):
+        if self.state_path is None:
+            return
+        directory = os.path.dirname(os.path.abspath(self.state_path))
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'version': STATE_VERSION, 'files': self.state}, f, indent=1)
+        os.replace(temp_path, self.state_path)
+
+    def build_file(self, path: str) -> BuildResult:
+        with open(path, 'r', encoding='utf-8') as f:
+            return self.build_source(f.read(), os.path.abspath(path))
+
+    def build_source(self, source: str, path: str) -> BuildResult:
+        """Build the graphs of one file's source whose fingerprint changed."""
+        from animation.runner import run_command
+
+        result = BuildResult(path)
+        program, graph_model, result.errors = parse_declarations(source, self.backend)
+        if result.errors:
+            return result
+        if self.validate:
+            validator = validate_ast(program)
+            if not validator.is_valid():
+                print(validator.get_error_summary())
+                result.errors = validator.errors
+                return result
+
+        previous = self.state.get(path, {})
+        current = {}
+        builder = GraphModelBuilder(self.storage)
+        builder.graph_model = graph_model
+        snapshots = {}
+        for graph_decl in program.graph_declarations:
+            fingerprint = graph_fingerprint(program, graph_decl)
+            entry = previous.get(graph_decl.name)
+            if (entry is not None and entry['fingerprint'] == fingerprint
+                    and all(os.path.exists(output) for output in entry['outputs'])):
+                current[graph_decl.name] = entry
+                result.unchanged.append(graph_decl.name)
+                continue
+
+            builder._build_concrete_graph(graph_decl)
+            outputs = [path for command in program.commands if command.graph_name == graph_decl.name
+                       for path in run_command(graph_model, command, snapshots, self.cache)]
+            current[graph_decl.name] = {'fingerprint': fingerprint, 'outputs': outputs}
+            result.rebuilt.append(graph_decl.name)
+            result.outputs.extend(outputs)
+
+        self.state[path] = current
+        self.save()
+        return result
+
+    def forget(self, path: str):
+        """Drop the state of a file, e.g. one that was deleted."""
+        if self.state.pop(path, None) is not None:
+            self.save()
@@ -17,7 +17,7 @@ from .ast_nodes import (
     VarDecl, GlobalAttrDecl, GraphDecl, Program
 )
 
-from .factories import ASTFactory
+from .factories import ASTFactory, InterningASTFactory
 
 # Export all public classes
 __all__ = [
@@ -32,5 +32,5 @@ __all__ = [
     
     'VarDecl', 'GlobalAttrDecl', 'GraphDecl', 'Program',
     
-    'ASTFactory'
+    'ASTFactory', 'InterningASTFactory'
 ]
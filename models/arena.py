@@ -0,0 +1,322 @@
+"""
+Flat arena representation of GraphGif statements.
+This module provides ASTArena, an array-backed alternative to lists of NodeDecl and EdgeDecl
+objects for very large programs.
+"""
+
+from array import array
+from collections.abc import Sequence
+from dataclasses import fields
+from typing import Dict, List, Optional, Union
+
+from .values import Value, Attribute, AttrVarRef, NodeVarRef, EdgeOperator, AttributeOperator
+from .expressions import NodeList, AttrList, EdgeDecl
+from .statements import NodeDecl, Statement
+from .ast_nodes import GraphDecl, Program
+
+# Statement kinds
+EDGE_DECL, NODE_LIST_DECL, NODE_VAR_DECL = range(3)
+
+# Attribute codes of statements without attributes; codes below it refer to attribute variables
+NO_ATTRIBUTES = -1
+
+# Value payload kinds: string table index, integer, integer too large for the column (as a string)
+STR_PAYLOAD, INT_PAYLOAD, BIG_INT_PAYLOAD = range(3)
+
+VALUE_TYPES = ('ID', 'NUMBER', 'STRING')
+EDGE_OPERATORS = tuple(EdgeOperator)
+ATTRIBUTE_OPERATORS = tuple(AttributeOperator)
+_INT_MIN, _INT_MAX = -2 ** 63, 2 ** 63 - 1
+
+
+class _View:
+    """
+    AST node stored in an ASTArena; its fields are read from the arena on access.
+    Views compare equal to the plain nodes they stand for and pickle as plain nodes.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, arena: 'ASTArena', index: int):
+        self._arena = arena
+        self._index = index
+
+    def _field_values(self) -> tuple:
+        return tuple(getattr(self, f.name) for f in fields(self))
+
+    def __eq__(self, other):
+        if isinstance(other, self._node_class):
+            return self._field_values() == tuple(getattr(other, f.name) for f in fields(other))
+        return NotImplemented
+
+    def __reduce__(self):
+        return self._node_class, self._field_values()
+
+
+class EdgeDeclView(_View, EdgeDecl):
+    """EdgeDecl at a position of an ASTArena."""
+
+    __slots__ = ('_arena', '_index')
+    _node_class = EdgeDecl
+
+    @property
+    def source(self) -> str:
+        return self._arena.strings[self._arena._sources[self._index]]
+
+    @property
+    def operator(self) -> EdgeOperator:
+        return EDGE_OPERATORS[self._arena._operators[self._index]]
+
+    @property
+    def target(self) -> str:
+        return self._arena.strings[self._arena._targets[self._index]]
+
+    @property
+    def attributes(self) -> Optional[Union[AttrList, AttrVarRef]]:
+        return self._arena._attribute_ref(self._arena._attributes[self._index])
+
+
+class NodeDeclView(_View, NodeDecl):
+    """NodeDecl at a position of an ASTArena."""
+
+    __slots__ = ('_arena', '_index')
+    _node_class = NodeDecl
+
+    @property
+    def nodes(self) -> Union[NodeList, NodeVarRef]:
+        arena, index = self._arena, self._index
+        if arena._kinds[index] == NODE_VAR_DECL:
+            return NodeVarRef(arena.strings[arena._sources[index]])
+        node_ids = arena._node_ids[arena._sources[index]:arena._targets[index]]
+        return NodeList(list(map(arena.strings.__getitem__, node_ids)))
+
+    @property
+    def attributes(self) -> Optional[Union[AttrList, AttrVarRef]]:
+        return self._arena._attribute_ref(self._arena._attributes[self._index])
+
+
+class AttrListView(_View, AttrList):
+    """AttrList stored once in an ASTArena for every statement carrying the same attributes."""
+
+    __slots__ = ('_arena', '_index')
+    _node_class = AttrList
+
+    @property
+    def attributes(self) -> List[Attribute]:
+        arena = self._arena
+        positions = range(arena._attr_list_starts[self._index], arena._attr_list_starts[self._index + 1])
+        return [Attribute(arena.strings[arena._attr_keys[i]], ATTRIBUTE_OPERATORS[arena._attr_operators[i]],
+                          Value(arena._value(i), VALUE_TYPES[arena._value_types[i]]))
+                for i in positions]
+
+
+class ArenaStatements(Sequence):
+    """Read-only sequence of a run of statements of an ASTArena, as NodeDecl and EdgeDecl views."""
+
+    def __init__(self, arena: 'ASTArena', start: int, stop: int):
+        self._arena = arena
+        self._start = start
+        self._stop = stop
+
+    def __getitem__(self, index):
+        positions = range(self._start, self._stop)[index]
+        if isinstance(index, slice):
+            return list(map(self._arena.statement, positions))
+        return self._arena.statement(positions)
+
+    def __iter__(self):
+        return map(self._arena.statement, range(self._start, self._stop))
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def __eq__(self, other):
+        if isinstance(other, (list, ArenaStatements)):
+            return len(self) == len(other) and list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"ArenaStatements({list(self)!r})"
+
+    def to_list(self) -> List[Statement]:
+        """The statements as plain NodeDecl and EdgeDecl objects."""
+        return self._arena.materialize(self._start, self._stop)
+
+
+class ASTArena:
+    """
+    Graph statements stored as parallel arrays, offering NodeDecl, EdgeDecl and AttrList views.
+    Each statement is a row of kind, source, target, operator and attribute code columns:
+    edges hold string table indices of their endpoints, node lists the range of their node ids
+    in a shared column, node variable references the index of the variable name. Attribute
+    lists are stored once per distinct contents, as key, operator and value columns, and
+    attribute variable references as negative codes. Every string is kept once in strings.
+    Views are built on access, so visitors and validation run unchanged over an arena program.
+    """
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self._string_index: Dict[str, int] = {}
+
+        # Statement columns
+        self._kinds = array('B')
+        self._sources = array('I')
+        self._targets = array('I')
+        self._operators = array('B')
+        self._attributes = array('i')
+        self._node_ids = array('I')
+
+        # Attribute list columns; list i spans _attr_list_starts[i] to _attr_list_starts[i + 1]
+        self._attr_list_starts = array('I', [0])
+        self._attr_list_index: Dict[tuple, int] = {}
+        self._attr_keys = array('I')
+        self._attr_operators = array('B')
+        self._value_types = array('B')
+        self._value_payloads = array('B')
+        self._values = array('q')
+
+        self._edge_operator_codes = {operator: i for i, operator in enumerate(EDGE_OPERATORS)}
+        self._attribute_operator_codes = {operator: i for i, operator in enumerate(ATTRIBUTE_OPERATORS)}
+        self._value_type_codes = {value_type: i for i, value_type in enumerate(VALUE_TYPES)}
+
+    def __len__(self) -> int:
+        return len(self._kinds)
+
+    def _string(self, text: str) -> int:
+        index = self._string_index.get(text)
+        if index is None:
+            index = self._string_index[text] = len(self.strings)
+            self.strings.append(text)
+        return index
+
+    # Storing
+
+    def add_statements(self, statements: List[Statement]) -> ArenaStatements:
+        """Store statements after those already in the arena and return the views of them."""
+        start = len(self._kinds)
+        for statement in statements:
+            self.append(statement)
+        return ArenaStatements(self, start, len(self._kinds))
+
+    def append(self, statement: Statement):
+        if isinstance(statement, EdgeDecl):
+            kind = EDGE_DECL
+            source, target = self._string(statement.source), self._string(statement.target)
+            operator = self._edge_operator_codes[statement.operator]
+        elif isinstance(statement, NodeDecl):
+            nodes = statement.nodes
+            if isinstance(nodes, NodeList):
+                kind = NODE_LIST_DECL
+                source = len(self._node_ids)
+                self._node_ids.extend(map(self._string, nodes.nodes))
+                target = len(self._node_ids)
+            elif isinstance(nodes, NodeVarRef):
+                kind, source, target = NODE_VAR_DECL, self._string(nodes.name), 0
+            else:
+                raise TypeError(f"Cannot store nodes of type {type(nodes).__name__} in an AST arena")
+            operator = 0
+        else:
+            raise TypeError(f"Cannot store {type(statement).__name__} in an AST arena")
+        attributes = self._attribute_code(statement.attributes)
+        self._kinds.append(kind)
+        self._sources.append(source)
+        self._targets.append(target)
+        self._operators.append(operator)
+        self._attributes.append(attributes)
+
+    def _attribute_code(self, attributes: Optional[Union[AttrList, AttrVarRef]]) -> int:
+        if attributes is None:
+            return NO_ATTRIBUTES
+        if isinstance(attributes, AttrVarRef):
+            return NO_ATTRIBUTES - 1 - self._string(attributes.name)
+        if not isinstance(attributes, AttrList):
+            raise TypeError(f"Cannot store attributes of type {type(attributes).__name__} in an AST arena")
+
+        key = tuple((attr.key, attr.operator, attr.value.value_type, attr.value.value)
+                    for attr in attributes.attributes)
+        index = self._attr_list_index.get(key)
+        if index is not None:
+            return index
+        for attr_key, operator, value_type, value in key:
+            self._attr_keys.append(self._string(attr_key))
+            self._attr_operators.append(self._attribute_operator_codes[operator])
+            self._value_types.append(self._value_type_codes[value_type])
+            if isinstance(value, str):
+                self._value_payloads.append(STR_PAYLOAD)
+                self._values.append(self._string(value))
+            elif _INT_MIN <= value <= _INT_MAX:
+                self._value_payloads.append(INT_PAYLOAD)
+                self._values.append(value)
+            else:
+                self._value_payloads.append(BIG_INT_PAYLOAD)
+                self._values.append(self._string(str(value)))
+        index = self._attr_list_index[key] = len(self._attr_list_starts) - 1
+        self._attr_list_starts.append(len(self._attr_keys))
+        return index
+
+    # Reading
+
+    def statement(self, index: int) -> Statement:
+        """View of the statement at index."""
+        if self._kinds[index] == EDGE_DECL:
+            return EdgeDeclView(self, index)
+        return NodeDeclView(self, index)
+
+    def _attribute_ref(self, code: int) -> Optional[Union[AttrList, AttrVarRef]]:
+        if code == NO_ATTRIBUTES:
+            return None
+        if code < NO_ATTRIBUTES:
+            return AttrVarRef(self.strings[NO_ATTRIBUTES - 1 - code])
+        return AttrListView(self, code)
+
+    def materialize(self, start: int, stop: int) -> List[Statement]:
+        """Plain nodes of the statements start..stop; statements with equal attributes share them."""
+        attribute_refs = {}
+
+        def attributes(code: int):
+            ref = attribute_refs.get(code)
+            if ref is None and code != NO_ATTRIBUTES:
+                ref = self._attribute_ref(code)
+                if isinstance(ref, AttrListView):
+                    ref = AttrList(ref.attributes)
+                attribute_refs[code] = ref
+            return ref
+
+        statements = []
+        for index in range(start, stop):
+            view = self.statement(index)
+            if self._kinds[index] == EDGE_DECL:
+                statements.append(EdgeDecl(view.source, view.operator, view.target,
+                                           attributes(self._attributes[index])))
+            else:
+                statements.append(NodeDecl(view.nodes, attributes(self._attributes[index])))
+        return statements
+
+    def _value(self, index: int) -> Union[str, int]:
+        payload = self._value_payloads[index]
+        if payload == INT_PAYLOAD:
+            return self._values[index]
+        if payload == BIG_INT_PAYLOAD:
+            return int(self.strings[self._values[index]])
+        return self.strings[self._values[index]]
+
+    def nbytes(self) -> int:
+        """Bytes held by the arena's columns, not counting the string table."""
+        columns = (self._kinds, self._sources, self._targets, self._operators, self._attributes,
+                   self._node_ids, self._attr_list_starts, self._attr_keys, self._attr_operators,
+                   self._value_types, self._value_payloads, self._values)
+        return sum(column.itemsize * len(column) for column in columns)
+
+
+def to_arena(program: Program, arena: Optional[ASTArena] = None) -> Program:
+    """
+    Program equal to program whose graph statements are stored in arena (a new one by default).
+    Variable declarations, commands and global attributes are kept as they are.
+    """
+    arena = arena if arena is not None else ASTArena()
+    graph_declarations = [
+        GraphDecl(graph_decl.direction, graph_decl.name, graph_decl.global_attributes,
+                  arena.add_statements(graph_decl.statements))
+        for graph_decl in program.graph_declarations
+    ]
+    return Program(program.variable_declarations, graph_declarations, program.commands)
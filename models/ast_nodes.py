@@ -10,7 +10,7 @@ from .expressions import VarValue, AttributeExpression
 from .statements import Statement, Command
 
 
-@dataclass
+@dataclass(slots=True)
 class VarDecl(ASTNode):
     """Variable declaration: var type name = value."""
     var_type: VarType
@@ -18,14 +18,14 @@ class VarDecl(ASTNode):
     value: VarValue
 
 
-@dataclass
+@dataclass(slots=True)
 class GlobalAttrDecl(ASTNode):
     """Global attribute declaration for graph, node, or edge."""
     attr_type: GlobalAttrType
     attributes: AttributeExpression
 
 
-@dataclass
+@dataclass(slots=True)
 class GraphDecl(ASTNode):
     """Graph declaration with direction, name, global attributes, and statements."""
     direction: GraphDirection
@@ -34,7 +34,7 @@ class GraphDecl(ASTNode):
     statements: List[Statement]
 
 
-@dataclass
+@dataclass(slots=True)
 class Program(ASTNode):
     """Root program containing variable declarations, graph declarations, and commands."""
     variable_declarations: List[VarDecl]
@@ -0,0 +1,288 @@
+"""
+Compact storage engine for concrete graphs.
+This module provides CompactGraph, an array-backed alternative to ConcreteGraph for very large graphs.
+"""
+
+from array import array
+from bisect import bisect_right
+from collections.abc import Mapping, Sequence
+from typing import Dict, List, Any, Optional
+
+from models.graph_model import GraphNode, GraphEdge, ConcreteGraph, LayeredAttributes
+
+
+class NodeView(Mapping):
+    """Read-only mapping of node ID to GraphNode over a CompactGraph."""
+
+    def __init__(self, graph: 'CompactGraph'):
+        self._graph = graph
+
+    def __getitem__(self, node_id: str) -> GraphNode:
+        return self._graph._node(self._graph._node_index[node_id])
+
+    def __contains__(self, node_id) -> bool:
+        return node_id in self._graph._node_index
+
+    def __iter__(self):
+        return iter(self._graph._node_ids)
+
+    def __len__(self) -> int:
+        return len(self._graph._node_ids)
+
+
+class EdgeView(Sequence):
+    """Read-only sequence of GraphEdge objects over a CompactGraph, in insertion order."""
+
+    def __init__(self, graph: 'CompactGraph'):
+        self._graph = graph
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._graph._edge(i) for i in range(len(self))[index]]
+        return self._graph._edge(range(len(self))[index])
+
+    def __len__(self) -> int:
+        return len(self._graph._sources)
+
+
+class CompactGraph:
+    """
+    Concrete graph with array-backed storage, offering the ConcreteGraph API.
+    Node IDs are interned to integers and edge endpoints are kept in array('i') columns.
+    Edge attributes are stored as runs of shared global defaults plus sparse per-edge
+    overrides; nodes share the global default dict until they are given their own values.
+    nodes and edges are read-only views that build GraphNode/GraphEdge objects on access;
+    their attributes are copy-on-write layers over the stored dicts. Adjacency queries use
+    edge indices grouped by source and by target, built from the edge columns on the first
+    query after nodes or edges were added.
+    """
+
+    def __init__(self, name: str, directed: bool):
+        self.name = name
+        self.directed = directed
+        self.global_node_attributes: Dict[str, Any] = {}
+        self.global_edge_attributes: Dict[str, Any] = {}
+        self.global_graph_attributes: Dict[str, Any] = {}
+
+        # Interned nodes; attribute dicts are never mutated once stored, so they can be shared
+        self._node_ids: List[str] = []
+        self._node_index: Dict[str, int] = {}
+        self._node_attributes: List[Dict[str, Any]] = []
+        self._node_default: Dict[str, Any] = {}
+
+        # Edge columns
+        self._sources = array('i')
+        self._targets = array('i')
+        self._default_starts = array('i')  # first edge index of each run of edge defaults
+        self._default_runs: List[Dict[str, Any]] = []
+        self._edge_overrides: Dict[int, Dict[str, Any]] = {}
+
+        self.nodes = NodeView(self)
+        self.edges = EdgeView(self)
+
+        # Adjacency index over the edge columns, rebuilt on first use after nodes or edges were added
+        self._index_size = None
+        self._out_starts = self._out_edges = self._in_starts = self._in_edges = None
+
+    def _current_node_default(self) -> Dict[str, Any]:
+        """Shared snapshot of the global node attributes."""
+        if self._node_default != self.global_node_attributes:
+            self._node_default = dict(self.global_node_attributes)
+        return self._node_default
+
+    def _intern_node(self, node_id: str, attributes: Optional[Dict[str, Any]] = None) -> int:
+        """Add or update a node and return its integer index."""
+        default = self._current_node_default()
+        merged_attrs = {**default, **attributes} if attributes else default
+
+        index = self._node_index.get(node_id)
+        if index is None:
+            index = len(self._node_ids)
+            self._node_index[node_id] = index
+            self._node_ids.append(node_id)
+            self._node_attributes.append(merged_attrs)
+        else:
+            # Copy on write, and only if the update changes anything
+            current = self._node_attributes[index]
+            if any(key not in current or current[key] != value for key, value in merged_attrs.items()):
+                self._node_attributes[index] = {**current, **merged_attrs}
+        return index
+
+    def _node(self, index: int) -> GraphNode:
+        return GraphNode(self._node_ids[index], LayeredAttributes((self._node_attributes[index],)))
+
+    def _edge(self, index: int) -> GraphEdge:
+        run = bisect_right(self._default_starts, index) - 1
+        layers = (self._default_runs[run],)
+        override = self._edge_overrides.get(index)
+        if override:
+            layers += (override,)
+        return GraphEdge(self._node_ids[self._sources[index]], self._node_ids[self._targets[index]],
+                         self.directed, LayeredAttributes(layers))
+
+    def add_node(self, node_id: str, attributes: Optional[Dict[str, Any]] = None) -> GraphNode:
+        """Add a node to the graph and return it."""
+        return self._node(self._intern_node(node_id, attributes))
+
+    def resolve_edge(self, source: str, target: str, attributes: Optional[Dict[str, Any]] = None) -> GraphEdge:
+        """Create an edge with the graph's global edge attributes applied, without adding it."""
+        merged_attrs = self.global_edge_attributes.copy()
+        if attributes:
+            merged_attrs.update(attributes)
+        return GraphEdge(source, target, self.directed, merged_attrs)
+
+    def add_edge(self, source: str, target: str, attributes: Optional[Dict[str, Any]] = None) -> GraphEdge:
+        """Add an edge to the graph and return it."""
+        index = len(self._sources)
+        self._sources.append(self._intern_node(source))
+        self._targets.append(self._intern_node(target))
+
+        # Start a new defaults run only when the global edge attributes have changed
+        if not self._default_runs or self._default_runs[-1] != self.global_edge_attributes:
+            self._default_starts.append(index)
+            self._default_runs.append(dict(self.global_edge_attributes))
+        if attributes:
+            self._edge_overrides[index] = dict(attributes)
+        return self._edge(index)
+
+    # Attributes are always copied into the graph's own storage, so the builders' no-copy
+    # entry points of ConcreteGraph are the public methods here
+    _add_node = add_node
+    _resolve_edge = resolve_edge
+    _add_edge = add_edge
+
+    # Adjacency
+
+    @staticmethod
+    def _group_edges(endpoints: array, node_count: int) -> tuple:
+        """
+        Counting sort of edge indices by endpoint, in insertion order within each node.
+        Returns (starts, edges); the edges of node i are edges[starts[i]:starts[i + 1]].
+        """
+        starts = array('i', bytes(4 * (node_count + 1)))
+        for node in endpoints:
+            starts[node + 1] += 1
+        for i in range(node_count):
+            starts[i + 1] += starts[i]
+        positions = starts[:-1]
+        edges = array('i', bytes(4 * len(endpoints)))
+        for edge_index, node in enumerate(endpoints):
+            edges[positions[node]] = edge_index
+            positions[node] += 1
+        return starts, edges
+
+    def _index(self):
+        size = (len(self._node_ids), len(self._sources))
+        if self._index_size != size:
+            self._out_starts, self._out_edges = self._group_edges(self._sources, size[0])
+            self._in_starts, self._in_edges = self._group_edges(self._targets, size[0])
+            self._index_size = size
+
+    def _node_position(self, node_id: str) -> int:
+        index = self._node_index.get(node_id)
+        if index is None:
+            raise ValueError(f"Node '{node_id}' not found")
+        self._index()
+        return index
+
+    def _outgoing(self, index: int):
+        return self._out_edges[self._out_starts[index]:self._out_starts[index + 1]]
+
+    def _incoming(self, index: int):
+        return self._in_edges[self._in_starts[index]:self._in_starts[index + 1]]
+
+    def successors(self, node_id: str) -> List[str]:
+        """Get the targets of the node's outgoing edges, in insertion order."""
+        node_ids, targets = self._node_ids, self._targets
+        return list(dict.fromkeys(node_ids[targets[edge]] for edge in self._outgoing(self._node_position(node_id))))
+
+    def predecessors(self, node_id: str) -> List[str]:
+        """Get the sources of the node's incoming edges, in insertion order."""
+        node_ids, sources = self._node_ids, self._sources
+        return list(dict.fromkeys(node_ids[sources[edge]] for edge in self._incoming(self._node_position(node_id))))
+
+    def neighbors(self, node_id: str) -> List[str]:
+        """
+        Get the nodes adjacent to node_id: its successors in a directed graph,
+        every node sharing an edge with it in an undirected one.
+        """
+        successors = self.successors(node_id)
+        if self.directed:
+            return successors
+        return list(dict.fromkeys(successors + self.predecessors(node_id)))
+
+    def out_degree(self, node_id: str) -> int:
+        """Get the number of edges leaving the node (all incident edges if undirected)."""
+        index = self._node_position(node_id)
+        degree = self._out_starts[index + 1] - self._out_starts[index]
+        if self.directed:
+            return degree
+        return degree + self._in_starts[index + 1] - self._in_starts[index]
+
+    def in_degree(self, node_id: str) -> int:
+        """Get the number of edges entering the node (all incident edges if undirected)."""
+        index = self._node_position(node_id)
+        degree = self._in_starts[index + 1] - self._in_starts[index]
+        if self.directed:
+            return degree
+        return degree + self._out_starts[index + 1] - self._out_starts[index]
+
+    def _joining(self, source: int, target: int) -> List[int]:
+        """Indices of the edges from source to target, scanning the shorter of their edge lists."""
+        if (self._out_starts[source + 1] - self._out_starts[source]
+                <= self._in_starts[target + 1] - self._in_starts[target]):
+            targets = self._targets
+            return [edge for edge in self._outgoing(source) if targets[edge] == target]
+        sources = self._sources
+        return [edge for edge in self._incoming(target) if sources[edge] == source]
+
+    def has_edge(self, source: str, target: str) -> bool:
+        """Check whether an edge joins source to target (in either direction if undirected)."""
+        return bool(self.edge_ids(source, target))
+
+    def edge_ids(self, source: str, target: str) -> List[int]:
+        """Get the positions in edges of the edges joining source to target."""
+        source_index, target_index = self._node_index.get(source), self._node_index.get(target)
+        if source_index is None or target_index is None:
+            return []
+        self._index()
+        edge_ids = self._joining(source_index, target_index)
+        if not self.directed and source != target:
+            edge_ids = sorted(edge_ids + self._joining(target_index, source_index))
+        return edge_ids
+
+    def freeze(self) -> 'CSRGraph':
+        """Take an immutable CSR snapshot of the graph for read-only algorithm runs."""
+        import numpy as np
+        from models.csr_graph import CSRGraph
+
+        return CSRGraph.from_columns(
+            self.name, self.directed, self._node_ids,
+            np.frombuffer(self._sources, dtype=np.int32),
+            np.frombuffer(self._targets, dtype=np.int32),
+            self._node_attributes,
+            (edge.attributes for edge in self.edges),
+        )
+
+    def get_node_list(self) -> List[str]:
+        """Get list of all node IDs."""
+        return list(self._node_ids)
+
+    def get_edge_list(self) -> List[tuple]:
+        """Get list of all edges as (source, target) tuples."""
+        node_ids = self._node_ids
+        return [(node_ids[source], node_ids[target]) for source, target in zip(self._sources, self._targets)]
+
+    def __eq__(self, other):
+        if not isinstance(other, (ConcreteGraph, CompactGraph)):
+            return NotImplemented
+        return (self.name == other.name
+                and self.directed == other.directed
+                and self.global_node_attributes == other.global_node_attributes
+                and self.global_edge_attributes == other.global_edge_attributes
+                and self.global_graph_attributes == other.global_graph_attributes
+                and dict(self.nodes) == dict(other.nodes)
+                and list(self.edges) == list(other.edges))
+
+    def __str__(self):
+        return ConcreteGraph.__str__(self)
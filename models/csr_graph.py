@@ -0,0 +1,164 @@
+"""
+Frozen CSR (compressed sparse row) snapshots of concrete graphs.
+This module contains CSRGraph, an immutable NumPy representation for read-only algorithm runs.
+"""
+
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, List, Any, Iterable, Iterator, Mapping, Sequence, Tuple
+
+import numpy as np
+
+
+def _readonly(values: np.ndarray) -> np.ndarray:
+    values.flags.writeable = False
+    return values
+
+
+def _attribute_columns(rows: Iterable[Mapping[str, Any]], count: int) -> Mapping[str, np.ndarray]:
+    """
+    Turn per-element attribute mappings into one array per attribute key.
+    Integer attributes present on every element get an int64 column; any other
+    attribute gets an object column holding None where the element lacks it.
+    """
+    columns: Dict[str, list] = {}
+    for position, row in enumerate(rows):
+        for key, value in row.items():
+            column = columns.get(key)
+            if column is None:
+                column = columns[key] = [None] * count
+            column[position] = value
+
+    result = {}
+    for key, values in columns.items():
+        if all(type(value) is int for value in values):
+            result[key] = _readonly(np.array(values, dtype=np.int64))
+        else:
+            column = np.empty(count, dtype=object)
+            column[:] = values
+            result[key] = _readonly(column)
+    return MappingProxyType(result)
+
+
+@dataclass(frozen=True, eq=False)
+class CSRGraph:
+    """
+    Immutable CSR snapshot of a concrete graph.
+    Node i's neighbours are indices[indptr[i]:indptr[i + 1]] and edge_ids holds, for each
+    of those entries, the position of the originating edge in the source graph's edges.
+    Undirected graphs store every edge in both directions. Edge and node attributes are
+    kept as columns indexed by edge position and node index respectively.
+    """
+    name: str
+    directed: bool
+    node_ids: Tuple[str, ...]
+    node_index: Mapping[str, int]
+    indptr: np.ndarray
+    indices: np.ndarray
+    edge_ids: np.ndarray
+    sources: np.ndarray
+    targets: np.ndarray
+    node_attributes: Mapping[str, np.ndarray]
+    edge_attributes: Mapping[str, np.ndarray]
+
+    @classmethod
+    def from_columns(cls, name: str, directed: bool, node_ids: Sequence[str],
+                     sources: np.ndarray, targets: np.ndarray,
+                     node_attributes: Iterable[Mapping[str, Any]],
+                     edge_attributes: Iterable[Mapping[str, Any]]) -> 'CSRGraph':
+        """Build a snapshot from node IDs and edge endpoint index columns in edge order."""
+        node_count = len(node_ids)
+        edge_count = len(sources)
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        edge_positions = np.arange(edge_count, dtype=np.int64)
+
+        rows, columns, entry_edges = sources, targets, edge_positions
+        if not directed:
+            rows = np.concatenate((sources, targets))
+            columns = np.concatenate((targets, sources))
+            entry_edges = np.concatenate((edge_positions, edge_positions))
+
+        # Stable sort keeps each node's neighbours in edge insertion order
+        order = np.argsort(rows, kind='stable')
+        indptr = np.zeros(node_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=node_count), out=indptr[1:])
+
+        return cls(
+            name=name,
+            directed=directed,
+            node_ids=tuple(node_ids),
+            node_index=MappingProxyType({node_id: i for i, node_id in enumerate(node_ids)}),
+            indptr=_readonly(indptr),
+            indices=_readonly(columns[order]),
+            edge_ids=_readonly(entry_edges[order]),
+            sources=_readonly(sources.copy()),
+            targets=_readonly(targets.copy()),
+            node_attributes=_attribute_columns(node_attributes, node_count),
+            edge_attributes=_attribute_columns(edge_attributes, edge_count),
+        )
+
+    @property
+    def node_count(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.sources)
+
+    def index_of(self, node_id: str) -> int:
+        """Get the index of a node ID."""
+        if node_id not in self.node_index:
+            raise ValueError(f"Node '{node_id}' not found")
+        return self.node_index[node_id]
+
+    def neighbors(self, node_id: str) -> List[str]:
+        """Get the nodes adjacent to node_id, as ConcreteGraph.neighbors does."""
+        index = self.index_of(node_id)
+        neighbours = self.indices[self.indptr[index]:self.indptr[index + 1]]
+        return [self.node_ids[i] for i in dict.fromkeys(neighbours.tolist())]
+
+    def out_degree(self, node_id: str) -> int:
+        """Get the number of edges leaving the node (all incident edges if undirected)."""
+        index = self.index_of(node_id)
+        return int(self.indptr[index + 1] - self.indptr[index])
+
+    def bfs_levels(self, start: str) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Level-synchronous breadth-first search from start.
+        Yields (nodes, edges) per level: the node indices first reached at that level, in
+        the order a queue-based BFS would visit them, and the ids of the edges they were
+        reached through (-1 for the start node). The whole frontier is expanded at once.
+        """
+        visited = np.zeros(self.node_count, dtype=bool)
+        frontier = np.array([self.index_of(start)], dtype=np.int64)
+        visited[frontier] = True
+        yield frontier, np.full(1, -1, dtype=np.int64)
+
+        while frontier.size:
+            starts = self.indptr[frontier]
+            counts = self.indptr[frontier + 1] - starts
+            total = int(counts.sum())
+            if total == 0:
+                return
+
+            # Positions of every frontier node's adjacency entries, in frontier order
+            offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+            entries = offsets + np.arange(total, dtype=np.int64)
+            candidates = self.indices[entries]
+
+            unseen = ~visited[candidates]
+            candidates = candidates[unseen]
+            if not candidates.size:
+                return
+
+            # Keep the first occurrence of each newly reached node
+            _, first = np.unique(candidates, return_index=True)
+            first.sort()
+            frontier = candidates[first]
+            visited[frontier] = True
+            yield frontier, self.edge_ids[entries[unseen][first]]
+
+    def bfs_order(self, start: str) -> List[str]:
+        """Get node IDs in breadth-first visiting order from start."""
+        return [self.node_ids[i] for nodes, _ in self.bfs_levels(start) for i in nodes.tolist()]
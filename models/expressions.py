@@ -8,19 +8,19 @@ from typing import List, Optional, Union
 from .values import ASTNode, Attribute, AttributeOperator, EdgeOperator, AttrVarRef
 
 
-@dataclass
+@dataclass(slots=True)
 class NodeList(ASTNode):
     """List of node IDs."""
     nodes: List[str]
 
 
-@dataclass
+@dataclass(slots=True)
 class AttrList(ASTNode):
     """List of attributes [attr1=val1, attr2=val2, ...]."""
     attributes: List[Attribute]
 
 
-@dataclass
+@dataclass(slots=True)
 class EdgeDecl(ASTNode):
     """Edge declaration: nodeA -> nodeB [attributes]."""
     source: str
@@ -29,7 +29,7 @@ class EdgeDecl(ASTNode):
     attributes: Optional[Union[AttrList, AttrVarRef]] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class EdgeList(ASTNode):
     """List of edge declarations."""
     edges: List[EdgeDecl]
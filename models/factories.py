@@ -13,6 +13,11 @@ from .ast_nodes import VarDecl, VarType, GraphDecl, GraphDirection, GlobalAttrDe
 class ASTFactory:
     """Factory class for creating AST nodes."""
     
+    @staticmethod
+    def name(text: str) -> str:
+        """The identifier to store for text; shared between occurrences by InterningASTFactory."""
+        return text
+    
     @staticmethod
     def create_value(value: Union[str, int], value_type: str) -> Value:
         """Create a Value node."""
@@ -52,3 +57,43 @@ class ASTFactory:
             "attributes": VarType.ATTRIBUTES
         }[var_type]
         return VarDecl(vtype, name, value)
+
+
+class InterningASTFactory(ASTFactory):
+    """
+    ASTFactory that creates each identifier string, Value and Attribute once per factory.
+    A program mentioning the same node id or attribute many times then holds a single copy;
+    AST nodes are never modified after parsing, so sharing them is safe. One factory is used
+    per parse, which bounds what it keeps alive to the program being built.
+    """
+
+    def __init__(self):
+        self._names = {}
+        self._values = {}
+        self._attributes = {}
+
+    def name(self, text: str) -> str:
+        """The factory's copy of an identifier."""
+        return self._names.setdefault(text, text)
+
+    def create_value(self, value: Union[str, int], value_type: str) -> Value:
+        key = (value, value_type)
+        node = self._values.get(key)
+        if node is None:
+            if isinstance(value, str):
+                value = self.name(value)
+            node = self._values[key] = Value(value, value_type)
+        return node
+
+    def create_attribute(self, key: str, operator: str, value: Value) -> Attribute:
+        # Values come from create_value, so their identity stands for their contents;
+        # the cached attribute keeps its value alive, so the id cannot be reused
+        cache_key = (key, operator, id(value))
+        node = self._attributes.get(cache_key)
+        if node is None:
+            node = self._attributes[cache_key] = super().create_attribute(self.name(key), operator, value)
+        return node
+
+    def create_edge_decl(self, source: str, operator: str, target: str,
+                         attributes: Optional[Union[AttrList, AttrVarRef]] = None) -> EdgeDecl:
+        return super().create_edge_decl(self.name(source), operator, self.name(target), attributes)
@@ -3,16 +3,113 @@ Concrete graph model for GraphGif.
 This module contains classes for representing actual graph structures with resolved nodes and edges.
 """
 
+from collections.abc import MutableMapping
 from dataclasses import dataclass, field
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Mapping
 from models.values import ASTNode
 
+_MISSING = object()
+
+
+class LayeredAttributes(MutableMapping):
+    """
+    Copy-on-write attribute mapping made of shared layers.
+    Lookups go through the layers top-down (graph default -> declaration -> later
+    re-declarations); the layer dicts are shared between elements and never modified.
+    Writes go to a private override dict, which is the only part ever copied.
+    """
+
+    __slots__ = ('_layers', '_own')
+
+    # Re-declarations beyond this many layers are folded into the override dict
+    MAX_LAYERS = 4
+
+    def __init__(self, layers: tuple = (), own: Optional[Dict[str, Any]] = None):
+        self._layers = layers
+        self._own = own
+
+    def __getitem__(self, key):
+        if self._own is not None and key in self._own:
+            return self._own[key]
+        for layer in reversed(self._layers):
+            if key in layer:
+                return layer[key]
+        raise KeyError(key)
+
+    def __contains__(self, key) -> bool:
+        if self._own is not None and key in self._own:
+            return True
+        return any(key in layer for layer in self._layers)
+
+    def __iter__(self):
+        if not self._layers:
+            return iter(self._own or ())
+        if len(self._layers) == 1 and not self._own:
+            return iter(self._layers[0])
+        return iter(self._merged())
+
+    def __len__(self) -> int:
+        if not self._layers:
+            return len(self._own or ())
+        return len(self._merged())
+
+    def __setitem__(self, key, value):
+        if self._own is None:
+            self._own = {}
+        self._own[key] = value
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self._own = self._merged()
+        self._layers = ()
+        del self._own[key]
+
+    def items(self):
+        if len(self._layers) == 1 and not self._own:
+            return self._layers[0].items()
+        return self._merged().items()
+
+    def _merged(self) -> Dict[str, Any]:
+        merged = {}
+        for layer in self._layers:
+            merged.update(layer)
+        if self._own:
+            merged.update(self._own)
+        return merged
+
+    def merge_layer(self, layer: Mapping[str, Any]):
+        """Apply a shared layer on top, as dict.update would; a no-op if nothing changes."""
+        layers = self._layers
+        if layers and layers[-1] is layer and not self._own:
+            return
+        for i in range(len(layers) - 2, -1, -1):
+            if layers[i] is layer:
+                # Already a layer: nothing changes unless a layer above it shadows one of its keys
+                if all(layer.keys().isdisjoint(upper) for upper in layers[i + 1:]) and \
+                        (not self._own or layer.keys().isdisjoint(self._own)):
+                    return
+                break
+        if all(self.get(key, _MISSING) == value for key, value in layer.items()):
+            return
+        if self._own is None and len(self._layers) < self.MAX_LAYERS:
+            self._layers = self._layers + (layer,)
+        else:
+            self.update(layer)
+
+    def copy(self) -> Dict[str, Any]:
+        """Materialise the attributes into a plain dict."""
+        return self._merged()
+
+    def __repr__(self):
+        return repr(self._merged())
+
 
 @dataclass
 class GraphNode:
     """Represents a concrete node in the graph."""
     id: str
-    attributes: Dict[str, Any] = field(default_factory=dict)
+    attributes: MutableMapping = field(default_factory=dict)
     
     def __str__(self):
         if self.attributes:
@@ -27,7 +124,7 @@ class GraphEdge:
     source: str
     target: str
     directed: bool = True
-    attributes: Dict[str, Any] = field(default_factory=dict)
+    attributes: MutableMapping = field(default_factory=dict)
     
     def __str__(self):
         op = "->" if self.directed else "--"
@@ -47,33 +144,170 @@ class ConcreteGraph:
     global_node_attributes: Dict[str, Any] = field(default_factory=dict)
     global_edge_attributes: Dict[str, Any] = field(default_factory=dict)
     global_graph_attributes: Dict[str, Any] = field(default_factory=dict)
+    # Shared snapshots of the global attributes, used as the bottom attribute layer
+    _node_layers: tuple = field(default=(), init=False, repr=False, compare=False)
+    _edge_layers: tuple = field(default=(), init=False, repr=False, compare=False)
+    # Adjacency index: node -> neighbour -> ids (positions in edges) of the edges between them.
+    # The id lists are shared between _successors[source][target] and _predecessors[target][source].
+    _successors: Dict[str, Dict[str, List[int]]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _predecessors: Dict[str, Dict[str, List[int]]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _out_degrees: Dict[str, int] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _in_degrees: Dict[str, int] = field(default_factory=dict, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Index nodes and edges passed to the constructor
+        for node_id in self.nodes:
+            self._index_node(node_id)
+        for edge_id, edge in enumerate(self.edges):
+            self._index_edge(edge_id, edge.source, edge.target)
+    
+    def _index_node(self, node_id: str):
+        if node_id not in self._successors:
+            self._successors[node_id] = {}
+            self._predecessors[node_id] = {}
+            self._out_degrees[node_id] = 0
+            self._in_degrees[node_id] = 0
     
-    def add_node(self, node_id: str, attributes: Optional[Dict[str, Any]] = None):
-        """Add a node to the graph."""
-        # Merge global node attributes with specific attributes
-        merged_attrs = self.global_node_attributes.copy()
-        if attributes:
-            merged_attrs.update(attributes)
+    def _index_edge(self, edge_id: int, source: str, target: str):
+        self._index_node(source)
+        self._index_node(target)
+        edge_ids = self._successors[source].get(target)
+        if edge_ids is None:
+            edge_ids = self._successors[source][target] = []
+            self._predecessors[target][source] = edge_ids
+        edge_ids.append(edge_id)
+        self._out_degrees[source] += 1
+        self._in_degrees[target] += 1
+    
+    @staticmethod
+    def _snapshot_layers(layers: tuple, global_attributes: Dict[str, Any]) -> tuple:
+        """Return layers, or a new one-layer snapshot if global_attributes changed since it was taken."""
+        if (layers[0] if layers else {}) != global_attributes:
+            return (global_attributes.copy(),) if global_attributes else ()
+        return layers
+    
+    def add_node(self, node_id: str, attributes: Optional[Dict[str, Any]] = None) -> GraphNode:
+        """Add a node to the graph and return it; attributes are copied."""
+        return self._add_node(node_id, dict(attributes) if attributes else None)
+    
+    def _add_node(self, node_id: str, attributes: Optional[Dict[str, Any]] = None) -> GraphNode:
+        """
+        add_node sharing attributes with the node as one of its layers, without copying them.
+        For the model builders, whose attribute dicts are never modified once passed in.
+        """
+        default_layers = self._node_layers = self._snapshot_layers(self._node_layers, self.global_node_attributes)
         
-        if node_id not in self.nodes:
-            self.nodes[node_id] = GraphNode(node_id, merged_attrs)
+        node = self.nodes.get(node_id)
+        if node is None:
+            layers = default_layers + (attributes,) if attributes else default_layers
+            node = GraphNode(node_id, LayeredAttributes(layers))
+            self.nodes[node_id] = node
+            self._index_node(node_id)
         else:
-            # Update existing node attributes
-            self.nodes[node_id].attributes.update(merged_attrs)
+            # Re-declaration: global defaults, then the new attributes, on top of the existing ones
+            attrs = node.attributes
+            merge = attrs.merge_layer if isinstance(attrs, LayeredAttributes) else attrs.update
+            if default_layers:
+                merge(default_layers[0])
+            if attributes:
+                merge(attributes)
+        return node
     
-    def add_edge(self, source: str, target: str, attributes: Optional[Dict[str, Any]] = None):
-        """Add an edge to the graph."""
-        # Ensure source and target nodes exist
-        self.add_node(source)
-        self.add_node(target)
+    def resolve_edge(self, source: str, target: str, attributes: Optional[Dict[str, Any]] = None) -> GraphEdge:
+        """Create an edge with the graph's global edge attributes applied, without adding it; attributes are copied."""
+        return self._resolve_edge(source, target, dict(attributes) if attributes else None)
+    
+    def _resolve_edge(self, source: str, target: str, attributes: Optional[Dict[str, Any]] = None) -> GraphEdge:
+        """resolve_edge sharing attributes with the edge as one of its layers, like _add_node."""
+        default_layers = self._edge_layers = self._snapshot_layers(self._edge_layers, self.global_edge_attributes)
         
-        # Merge global edge attributes with specific attributes
-        merged_attrs = self.global_edge_attributes.copy()
-        if attributes:
-            merged_attrs.update(attributes)
+        layers = default_layers + (attributes,) if attributes else default_layers
+        return GraphEdge(source, target, self.directed, LayeredAttributes(layers))
+    
+    def add_edge(self, source: str, target: str, attributes: Optional[Dict[str, Any]] = None) -> GraphEdge:
+        """Add an edge to the graph and return it; attributes are copied."""
+        return self._add_edge(source, target, dict(attributes) if attributes else None)
+    
+    def _add_edge(self, source: str, target: str, attributes: Optional[Dict[str, Any]] = None) -> GraphEdge:
+        """add_edge sharing attributes with the edge as one of its layers, like _add_node."""
+        # Ensure source and target nodes exist
+        self._add_node(source)
+        self._add_node(target)
         
-        edge = GraphEdge(source, target, self.directed, merged_attrs)
+        edge = self._resolve_edge(source, target, attributes)
         self.edges.append(edge)
+        self._index_edge(len(self.edges) - 1, source, target)
+        return edge
+    
+    def _adjacent(self, index: Dict[str, Dict[str, List[int]]], node_id: str) -> Dict[str, List[int]]:
+        if node_id not in index:
+            raise ValueError(f"Node '{node_id}' not found")
+        return index[node_id]
+    
+    def successors(self, node_id: str) -> List[str]:
+        """Get the targets of the node's outgoing edges, in insertion order."""
+        return list(self._adjacent(self._successors, node_id))
+    
+    def predecessors(self, node_id: str) -> List[str]:
+        """Get the sources of the node's incoming edges, in insertion order."""
+        return list(self._adjacent(self._predecessors, node_id))
+    
+    def neighbors(self, node_id: str) -> List[str]:
+        """
+        Get the nodes adjacent to node_id: its successors in a directed graph,
+        every node sharing an edge with it in an undirected one.
+        """
+        successors = self._adjacent(self._successors, node_id)
+        if self.directed:
+            return list(successors)
+        return list({**successors, **self._predecessors[node_id]})
+    
+    def out_degree(self, node_id: str) -> int:
+        """Get the number of edges leaving the node (all incident edges if undirected)."""
+        self._adjacent(self._successors, node_id)
+        if self.directed:
+            return self._out_degrees[node_id]
+        return self._out_degrees[node_id] + self._in_degrees[node_id]
+    
+    def in_degree(self, node_id: str) -> int:
+        """Get the number of edges entering the node (all incident edges if undirected)."""
+        self._adjacent(self._predecessors, node_id)
+        if self.directed:
+            return self._in_degrees[node_id]
+        return self._out_degrees[node_id] + self._in_degrees[node_id]
+    
+    def has_edge(self, source: str, target: str) -> bool:
+        """Check whether an edge joins source to target (in either direction if undirected)."""
+        if target in self._successors.get(source, ()):
+            return True
+        return not self.directed and source in self._successors.get(target, ())
+    
+    def edge_ids(self, source: str, target: str) -> List[int]:
+        """Get the positions in edges of the edges joining source to target."""
+        edge_ids = list(self._successors.get(source, {}).get(target, ()))
+        if not self.directed and source != target:
+            edge_ids = sorted(edge_ids + self._successors.get(target, {}).get(source, []))
+        return edge_ids
+    
+    def freeze(self) -> 'CSRGraph':
+        """Take an immutable CSR snapshot of the graph for read-only algorithm runs."""
+        from models.csr_graph import CSRGraph
+        
+        node_index = {node_id: i for i, node_id in enumerate(self.nodes)}
+        # Edges passed to the constructor may reference undeclared nodes
+        for node_id in self._successors:
+            if node_id not in node_index:
+                node_index[node_id] = len(node_index)
+        node_attributes = [self.nodes[node_id].attributes if node_id in self.nodes else {}
+                           for node_id in node_index]
+        
+        return CSRGraph.from_columns(
+            self.name, self.directed, list(node_index),
+            [node_index[edge.source] for edge in self.edges],
+            [node_index[edge.target] for edge in self.edges],
+            node_attributes,
+            (edge.attributes for edge in self.edges),
+        )
     
     def get_node_list(self) -> List[str]:
         """Get list of all node IDs."""
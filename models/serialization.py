@@ -0,0 +1,544 @@
+"""
+Binary serialization of parsed GraphGif programs.
+dumps/loads convert a (Program, GraphModel) pair to and from a compact versioned format without
+pickle: nothing but the registered AST classes and enums, graph storage engines and plain
+scalars can come out of a file.
+
+Everything is written as one stream of integers, packed at the narrowest array width that holds
+them, after a string table for identifiers and a table of floats. Attribute dicts shared between
+nodes and edges are stored once. Long lists of AST nodes are stored column by column (all the
+sources of a run of edge declarations, then all the operators, ...), so loading builds them with
+map and zip instead of one Python call per field. Nodes shared by the parser, like the interned
+values and attributes, are written once and referred to by position afterwards.
+"""
+
+import gc
+import hashlib
+import struct
+import sys
+from array import array
+from collections import deque
+from dataclasses import fields
+from itertools import accumulate, islice, repeat
+from typing import Any, Dict, List, Tuple
+
+from .values import (Value, VarRef, NodeVarRef, EdgeVarRef, AttrVarRef, Attribute,
+                     GraphDirection, VarType, EdgeOperator, GlobalAttrType, AttributeOperator)
+from .expressions import NodeList, AttrList, EdgeDecl, EdgeList
+from .statements import NodeDecl, Path, Argument, Command
+from .ast_nodes import VarDecl, GlobalAttrDecl, GraphDecl, Program
+from .graph_model import GraphModel, ConcreteGraph, GraphNode, GraphEdge, LayeredAttributes
+from .compact_graph import CompactGraph
+from .arena import ArenaStatements
+
+MAGIC = b'GGAST'
+FORMAT_VERSION = 2
+
+# Classes and enums a stream may reference, by position; append only within a format version
+AST_CLASSES = (Value, VarRef, NodeVarRef, EdgeVarRef, AttrVarRef, Attribute, NodeList, AttrList,
+               EdgeDecl, EdgeList, NodeDecl, Path, Argument, Command, VarDecl, GlobalAttrDecl,
+               GraphDecl, Program)
+ENUMS = (GraphDirection, VarType, EdgeOperator, GlobalAttrType, AttributeOperator)
+
+# Value tags; AST nodes are tagged NODE_TAG + their position in AST_CLASSES
+(NONE_TAG, FALSE_TAG, TRUE_TAG, INT_TAG, BIG_INT_TAG, FLOAT_TAG, STR_TAG, LIST_TAG, COLUMNS_TAG,
+ ENUM_TAG, REF_TAG) = range(11)
+NODE_TAG = 16
+
+# Column kinds of lists stored column by column
+(NONE_COLUMN, STR_COLUMN, INT_COLUMN, ENUM_COLUMN, LIST_COLUMN, NODE_COLUMN, MIXED_COLUMN, VALUE_COLUMN,
+ SHARED_COLUMN) = range(9)
+# Lists shorter than this are stored value by value
+COLUMN_THRESHOLD = 4
+
+# Graph storage engines
+CONCRETE_GRAPH, COMPACT_GRAPH = 0, 1
+# Graph model classes whose fields the encoded graphs are read into
+GRAPH_CLASSES = (GraphModel, ConcreteGraph, GraphNode, GraphEdge)
+
+# Integer stream widths, narrowest first
+_WIDTHS = ('B', 'H', 'I', 'Q', 'b', 'h', 'i', 'q')
+_INT_MIN, _INT_MAX = -2 ** 63, 2 ** 63 - 1
+# Types allowed as attribute keys and values
+_SCALARS = {type(None), bool, int, float, str}
+_HEADER = struct.Struct('<5sBIIII')
+
+
+def _field_names(cls) -> Tuple[str, ...]:
+    return tuple(f.name for f in fields(cls))
+
+
+def schema_version() -> str:
+    """Hash of the format version and the field layout of every registered class and graph engine."""
+    digest = hashlib.sha256(str(FORMAT_VERSION).encode())
+    for cls in AST_CLASSES + GRAPH_CLASSES:
+        digest.update(f"{cls.__name__}{_field_names(cls)}".encode())
+    # CompactGraph is not a dataclass; its layout is the attributes of an instance
+    digest.update(f"CompactGraph{tuple(vars(CompactGraph('', True)))}".encode())
+    for enum in ENUMS:
+        digest.update(f"{enum.__name__}{[member.value for member in enum]}".encode())
+    return digest.hexdigest()
+
+
+class _Encoder:
+    def __init__(self):
+        self.strings: Dict[str, int] = {}
+        self.floats: List[float] = []
+        self._class_tags = {cls: i for i, cls in enumerate(AST_CLASSES)}
+        self._class_fields = [_field_names(cls) for cls in AST_CLASSES]
+        self._enum_tags = {enum: i for i, enum in enumerate(ENUMS)}
+        self._members = {member: j for enum in ENUMS for j, member in enumerate(enum)}
+        # AST nodes get memo indices in the order the decoder creates them
+        self._memo: Dict[int, int] = {}
+        self._dicts: Dict[int, int] = {}
+        self.dict_table: List[dict] = []
+        # Keeps memoised objects alive so their ids stay unique while encoding
+        self._keep_alive: List[Any] = []
+
+    def string(self, value: str) -> int:
+        index = self.strings.get(value)
+        if index is None:
+            index = self.strings[value] = len(self.strings)
+        return index
+
+    def _remember(self, nodes: list):
+        for node in nodes:
+            self._memo[id(node)] = len(self._memo)
+        self._keep_alive.extend(nodes)
+
+    def value(self, value: Any, out: List[int]):
+        kind = type(value)
+        if value is None:
+            out.append(NONE_TAG)
+        elif kind is bool:
+            out.append(TRUE_TAG if value else FALSE_TAG)
+        elif kind is str:
+            out += (STR_TAG, self.string(value))
+        elif kind is int:
+            if _INT_MIN <= value <= _INT_MAX:
+                out += (INT_TAG, value)
+            else:
+                out += (BIG_INT_TAG, self.string(str(value)))
+        elif kind is float:
+            out += (FLOAT_TAG, len(self.floats))
+            self.floats.append(value)
+        elif kind is ArenaStatements:
+            # Written as the plain statement list it stands for; loads returns plain lists
+            self.value(value.to_list(), out)
+        elif kind is list:
+            if len(value) >= COLUMN_THRESHOLD:
+                out += (COLUMNS_TAG, len(value))
+                self.column(value, out)
+            else:
+                out += (LIST_TAG, len(value))
+                for item in value:
+                    self.value(item, out)
+        elif kind in self._class_tags:
+            memo_index = self._memo.get(id(value))
+            if memo_index is not None:
+                out += (REF_TAG, memo_index)
+                return
+            self._remember([value])
+            tag = self._class_tags[kind]
+            out.append(NODE_TAG + tag)
+            for name in self._class_fields[tag]:
+                self.value(getattr(value, name), out)
+        elif kind in self._enum_tags:
+            out += (ENUM_TAG, self._enum_tags[kind], self._members[value])
+        else:
+            raise TypeError(f"Cannot serialize {kind.__name__} value {value!r}")
+
+    def column(self, values: list, out: List[int]):
+        """Write a list of values as one column, choosing the densest kind that fits."""
+        kinds = list(dict.fromkeys(map(type, values)))
+        if len(kinds) > 1:
+            # One column per type, plus the type of every position to interleave them again
+            groups = {kind: i for i, kind in enumerate(kinds)}
+            out += (MIXED_COLUMN, len(kinds))
+            out += map(groups.__getitem__, map(type, values))
+            for kind in kinds:
+                self.column([value for value in values if type(value) is kind], out)
+            return
+
+        kind = kinds[0] if kinds else type(None)
+        if kind is type(None):
+            out.append(NONE_COLUMN)
+        elif kind is str:
+            out.append(STR_COLUMN)
+            out += map(self.string, values)
+        elif kind is int and _INT_MIN <= min(values) and max(values) <= _INT_MAX:
+            out.append(INT_COLUMN)
+            out += values
+        elif kind in self._enum_tags:
+            out += (ENUM_COLUMN, self._enum_tags[kind])
+            out += map(self._members.__getitem__, values)
+        elif kind is list:
+            out.append(LIST_COLUMN)
+            out += map(len, values)
+            self.column([item for value in values for item in value], out)
+        elif kind in self._class_tags and self._fresh(values):
+            tag = self._class_tags[kind]
+            out += (NODE_COLUMN, tag)
+            self._remember(values)
+            for name in self._class_fields[tag]:
+                self.column([getattr(node, name) for node in values], out)
+        elif kind in self._class_tags:
+            # Whether each position holds a node first seen here, the memo indices of the
+            # others, then the fields of the new nodes column by column
+            tag = self._class_tags[kind]
+            memo = self._memo
+            new_nodes, flags, refs = [], [], []
+            for node in values:
+                memo_index = memo.get(id(node))
+                if memo_index is None:
+                    self._remember([node])
+                    new_nodes.append(node)
+                    flags.append(1)
+                else:
+                    refs.append(memo_index)
+                    flags.append(0)
+            out += (SHARED_COLUMN, tag)
+            out += flags
+            out += refs
+            for name in self._class_fields[tag]:
+                self.column([getattr(node, name) for node in new_nodes], out)
+        else:
+            out.append(VALUE_COLUMN)
+            for value in values:
+                self.value(value, out)
+
+    def _fresh(self, nodes: list) -> bool:
+        """True if no node is shared, with another part of the tree or within nodes."""
+        memo = self._memo
+        return len(set(map(id, nodes))) == len(nodes) and not any(id(node) in memo for node in nodes)
+
+    def scalar_column(self, values: list, out: List[int]):
+        """Column of attribute keys or values, which never hold AST nodes."""
+        kinds = set(map(type, values))
+        if not kinds <= _SCALARS:
+            raise TypeError(f"Cannot serialize attribute values of type {', '.join(kind.__name__ for kind in kinds - _SCALARS)}")
+        self.column(values, out)
+
+    def dict_column(self, dicts: list, out: List[int]):
+        out += map(len, dicts)
+        self.scalar_column([key for mapping in dicts for key in mapping], out)
+        self.scalar_column([item for mapping in dicts for item in mapping.values()], out)
+
+    def shared_dict(self, mapping: dict) -> int:
+        """Index of a dict in the interned dict table, adding it on first use."""
+        index = self._dicts.get(id(mapping))
+        if index is None:
+            index = self._dicts[id(mapping)] = len(self.dict_table)
+            self.dict_table.append(mapping)
+        return index
+
+    def attributes_column(self, attributes: list, out: List[int]):
+        """Node or edge attributes: shared layers by dict table index, then own values."""
+        layered = [isinstance(attrs, LayeredAttributes) for attrs in attributes]
+        out += map(int, layered)
+        out += (len(attrs._layers) if is_layered else 0 for attrs, is_layered in zip(attributes, layered))
+        for attrs, is_layered in zip(attributes, layered):
+            if is_layered:
+                out += map(self.shared_dict, attrs._layers)
+        owns = [attrs._own if is_layered else dict(attrs) for attrs, is_layered in zip(attributes, layered)]
+        out += (own is not None for own in owns)
+        self.dict_column([own for own in owns if own is not None], out)
+
+    def concrete_graph(self, graph: ConcreteGraph, out: List[int]):
+        nodes = list(graph.nodes.values())
+        out.append(len(nodes))
+        out += map(self.string, graph.nodes)
+        out += (self.string(node.id) for node in nodes)
+        self.attributes_column([node.attributes for node in nodes], out)
+        out.append(len(graph.edges))
+        out += (self.string(edge.source) for edge in graph.edges)
+        out += (self.string(edge.target) for edge in graph.edges)
+        out += (int(edge.directed) for edge in graph.edges)
+        self.attributes_column([edge.attributes for edge in graph.edges], out)
+        for layers in (graph._node_layers, graph._edge_layers):
+            out.append(len(layers))
+            out += map(self.shared_dict, layers)
+
+    def compact_graph(self, graph: CompactGraph, out: List[int]):
+        out.append(len(graph._node_ids))
+        out += map(self.string, graph._node_ids)
+        out += map(self.shared_dict, graph._node_attributes)
+        out.append(self.shared_dict(graph._node_default))
+        out.append(len(graph._sources))
+        out += graph._sources
+        out += graph._targets
+        out.append(len(graph._default_starts))
+        out += graph._default_starts
+        out += map(self.shared_dict, graph._default_runs)
+        out.append(len(graph._edge_overrides))
+        out += graph._edge_overrides
+        out += map(self.shared_dict, graph._edge_overrides.values())
+
+    def graph_model(self, graph_model: GraphModel, out: List[int]):
+        out.append(len(graph_model.variables))
+        for name, variable in graph_model.variables.items():
+            out += (self.string(name), self.string(variable['type']))
+            self.value(variable['value'], out)
+        out.append(len(graph_model.graphs))
+        for key, graph in graph_model.graphs.items():
+            if type(graph) is CompactGraph:
+                storage = COMPACT_GRAPH
+            elif type(graph) is ConcreteGraph:
+                storage = CONCRETE_GRAPH
+            else:
+                raise TypeError(f"Cannot serialize graph storage {type(graph).__name__}")
+            out += (storage, self.string(key), self.string(graph.name), int(graph.directed))
+            self.dict_column([graph.global_node_attributes, graph.global_edge_attributes,
+                              graph.global_graph_attributes], out)
+            if storage == COMPACT_GRAPH:
+                self.compact_graph(graph, out)
+            else:
+                self.concrete_graph(graph, out)
+
+
+def _pack(ints: List[int]) -> Tuple[bytes, bytes]:
+    """Typecode and little-endian bytes of ints in the narrowest array type holding them."""
+    low, high = (min(ints), max(ints)) if ints else (0, 0)
+    for typecode in _WIDTHS:
+        packed = array(typecode)
+        bits = packed.itemsize * 8
+        if typecode.islower():
+            fits = -2 ** (bits - 1) <= low and high < 2 ** (bits - 1)
+        else:
+            fits = low >= 0 and high < 2 ** bits
+        if fits:
+            packed.extend(ints)
+            if sys.byteorder != 'little':
+                packed.byteswap()
+            return typecode.encode(), packed.tobytes()
+    raise OverflowError("integer stream out of range")
+
+
+def dumps(program: Program, graph_model: GraphModel) -> bytes:
+    """Serialize a parsed program and its graph model."""
+    encoder = _Encoder()
+    body: List[int] = []
+    encoder.value(program, body)
+    encoder.graph_model(graph_model, body)
+    # Graphs only refer to the dict table, so it is written after them but read first
+    dict_ints: List[int] = [len(encoder.dict_table)]
+    encoder.dict_column(encoder.dict_table, dict_ints)
+
+    text = ''.join(encoder.strings)
+    typecode, ints = _pack([*map(len, encoder.strings), *dict_ints, *body])
+    strings = text.encode('utf-8', 'surrogatepass')
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, len(encoder.strings), len(strings), len(encoder.floats), len(ints))
+    return b''.join((header, typecode, strings, struct.pack(f'<{len(encoder.floats)}d', *encoder.floats), ints))
+
+
+def loads(data: bytes) -> Tuple[Program, GraphModel]:
+    """
+    Rebuild the (program, graph_model) pair written by dumps.
+    Raises ValueError for data that is not a valid stream of this format version.
+    """
+    # Decoding only allocates, so collection passes in the middle of it would find no garbage
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return _decode(data)
+    except (IndexError, KeyError, StopIteration, TypeError, OverflowError, struct.error,
+            UnicodeDecodeError) as e:
+        raise ValueError(f"Corrupt GraphGif binary data: {e!r}") from None
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def _decode(data: bytes) -> Tuple[Program, GraphModel]:
+    if len(data) < _HEADER.size + 1:
+        raise ValueError("Truncated GraphGif binary data")
+    magic, version, string_count, strings_size, float_count, ints_size = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not GraphGif binary data")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported GraphGif binary format version {version}")
+    offset = _HEADER.size
+    typecode = data[offset:offset + 1].decode('ascii')
+    if typecode not in _WIDTHS:
+        raise ValueError(f"Invalid integer width {typecode!r}")
+    offset += 1
+    text = data[offset:offset + strings_size].decode('utf-8', 'surrogatepass')
+    offset += strings_size
+    floats = struct.unpack_from(f'<{float_count}d', data, offset)
+    offset += 8 * float_count
+    ints = array(typecode)
+    if offset + ints_size != len(data) or ints_size % ints.itemsize:
+        raise ValueError("Integer stream size mismatch")
+    ints.frombytes(data[offset:])
+    if sys.byteorder != 'little':
+        ints.byteswap()
+
+    stream = iter(ints)
+    read = stream.__next__
+
+    def read_many(count: int) -> list:
+        values = list(islice(stream, count))
+        if len(values) != count:
+            raise ValueError("Truncated integer stream")
+        return values
+
+    def slices(lengths: List[int]) -> List[slice]:
+        """Consecutive slices of the given lengths."""
+        ends = list(accumulate(lengths))
+        return list(map(slice, [0, *ends[:-1]], ends))
+
+    string_slices = slices(read_many(string_count))
+    if (string_slices[-1].stop if string_slices else 0) != len(text):
+        raise ValueError("String table size mismatch")
+    strings = list(map(text.__getitem__, string_slices))
+
+    classes = [(cls, _field_names(cls)) for cls in AST_CLASSES]
+    enums = [list(enum) for enum in ENUMS]
+    memo = []
+    new = object.__new__
+
+    def value():
+        return readers[read()]()
+
+    def node_reader(cls, names):
+        def read_node():
+            node = new(cls)
+            memo.append(node)
+            for name in names:
+                setattr(node, name, readers[read()]())
+            return node
+        return read_node
+
+    def invalid_tag():
+        raise ValueError("Invalid value tag")
+
+    def column(count: int) -> list:
+        kind = read()
+        if kind == STR_COLUMN:
+            return list(map(strings.__getitem__, read_many(count)))
+        if kind == NODE_COLUMN:
+            cls, names = classes[read()]
+            nodes = list(map(new, repeat(cls, count)))
+            memo.extend(nodes)
+            for name in names:
+                deque(map(setattr, nodes, repeat(name), column(count)), maxlen=0)
+            return nodes
+        if kind == SHARED_COLUMN:
+            cls, names = classes[read()]
+            flags = read_many(count)
+            new_count = sum(flags)
+            refs = read_many(count - new_count)
+            nodes = list(map(new, repeat(cls, new_count)))
+            memo.extend(nodes)
+            sources = (iter(list(map(memo.__getitem__, refs))), iter(nodes))
+            for name in names:
+                deque(map(setattr, nodes, repeat(name), column(new_count)), maxlen=0)
+            return list(map(next, map(sources.__getitem__, flags)))
+        if kind == ENUM_COLUMN:
+            return list(map(enums[read()].__getitem__, read_many(count)))
+        if kind == NONE_COLUMN:
+            return [None] * count
+        if kind == MIXED_COLUMN:
+            group_count = read()
+            groups = read_many(count)
+            columns = [iter(column(groups.count(group))) for group in range(group_count)]
+            return list(map(next, map(columns.__getitem__, groups)))
+        if kind == LIST_COLUMN:
+            items_slices = slices(read_many(count))
+            items = column(items_slices[-1].stop if items_slices else 0)
+            return list(map(items.__getitem__, items_slices))
+        if kind == INT_COLUMN:
+            return read_many(count)
+        if kind == VALUE_COLUMN:
+            return [readers[read()]() for _ in range(count)]
+        raise ValueError(f"Invalid column kind {kind}")
+
+    # Value decoders indexed by tag
+    readers = [invalid_tag] * (NODE_TAG + len(AST_CLASSES))
+    readers[NONE_TAG] = lambda: None
+    readers[FALSE_TAG] = lambda: False
+    readers[TRUE_TAG] = lambda: True
+    readers[INT_TAG] = read
+    readers[BIG_INT_TAG] = lambda: int(strings[read()])
+    readers[FLOAT_TAG] = lambda: floats[read()]
+    readers[STR_TAG] = lambda: strings[read()]
+    readers[LIST_TAG] = lambda: [readers[read()]() for _ in range(read())]
+    readers[COLUMNS_TAG] = lambda: column(read())
+    readers[ENUM_TAG] = lambda: enums[read()][read()]
+    readers[REF_TAG] = lambda: memo[read()]
+    for i, (cls, names) in enumerate(classes):
+        readers[NODE_TAG + i] = node_reader(cls, names)
+
+    def dict_column(count: int) -> List[dict]:
+        dict_slices = slices(read_many(count))
+        total = dict_slices[-1].stop if dict_slices else 0
+        keys, items = column(total), column(total)
+        return list(map(dict, map(zip, map(keys.__getitem__, dict_slices), map(items.__getitem__, dict_slices))))
+
+    def attributes_column(count: int) -> list:
+        layered = read_many(count)
+        layer_slices = slices(read_many(count))
+        layer_dicts = list(map(dicts.__getitem__, read_many(layer_slices[-1].stop if layer_slices else 0)))
+        layers = list(map(tuple, map(layer_dicts.__getitem__, layer_slices)))
+        present = read_many(count)
+        owns = [repeat(None), iter(dict_column(sum(present)))]
+        owns = list(map(next, map(owns.__getitem__, present)))
+        if all(layered):
+            return list(map(LayeredAttributes, layers, owns))
+        return [LayeredAttributes(layer, own) if is_layered else own
+                for is_layered, layer, own in zip(layered, layers, owns)]
+
+    dicts = dict_column(read())
+
+    program = value()
+    if type(program) is not Program:
+        raise ValueError("Stream does not start with a Program")
+
+    graph_model = GraphModel()
+    for _ in range(read()):
+        name, var_type = strings[read()], strings[read()]
+        graph_model.variables[name] = {'type': var_type, 'value': value()}
+
+    for _ in range(read()):
+        storage, key, name, directed = read_many(4)
+        key, name, directed = strings[key], strings[name], bool(directed)
+        node_attributes, edge_attributes, graph_attributes = dict_column(3)
+        if storage == COMPACT_GRAPH:
+            graph = CompactGraph(name, directed)
+            node_count = read()
+            graph._node_ids = list(map(strings.__getitem__, read_many(node_count)))
+            graph._node_index = dict(zip(graph._node_ids, range(node_count)))
+            graph._node_attributes = list(map(dicts.__getitem__, read_many(node_count)))
+            graph._node_default = dicts[read()]
+            edge_count = read()
+            graph._sources = array('i', read_many(edge_count))
+            graph._targets = array('i', read_many(edge_count))
+            run_count = read()
+            graph._default_starts = array('i', read_many(run_count))
+            graph._default_runs = list(map(dicts.__getitem__, read_many(run_count)))
+            override_count = read()
+            graph._edge_overrides = dict(zip(read_many(override_count),
+                                             map(dicts.__getitem__, read_many(override_count))))
+        elif storage == CONCRETE_GRAPH:
+            node_count = read()
+            node_keys = list(map(strings.__getitem__, read_many(node_count)))
+            node_ids = list(map(strings.__getitem__, read_many(node_count)))
+            nodes = dict(zip(node_keys, map(GraphNode, node_ids, attributes_column(node_count))))
+            edge_count = read()
+            sources = list(map(strings.__getitem__, read_many(edge_count)))
+            targets = list(map(strings.__getitem__, read_many(edge_count)))
+            edge_directed = list(map(bool, read_many(edge_count)))
+            edges = list(map(GraphEdge, sources, targets, edge_directed, attributes_column(edge_count)))
+            graph = ConcreteGraph(name, directed, nodes, edges)
+            graph._node_layers = tuple(map(dicts.__getitem__, read_many(read())))
+            graph._edge_layers = tuple(map(dicts.__getitem__, read_many(read())))
+        else:
+            raise ValueError(f"Invalid graph storage {storage}")
+        graph.global_node_attributes = node_attributes
+        graph.global_edge_attributes = edge_attributes
+        graph.global_graph_attributes = graph_attributes
+        graph_model.graphs[key] = graph
+
+    if next(stream, None) is not None:
+        raise ValueError("Trailing data after graph model")
+    return program, graph_model
@@ -9,20 +9,20 @@ from .values import ASTNode, AttributeOperator, Value
 from .expressions import NodeExpression, AttributeExpression
 
 
-@dataclass
+@dataclass(slots=True)
 class NodeDecl(ASTNode):
     """Node declaration with optional attributes."""
     nodes: NodeExpression
     attributes: Optional[AttributeExpression] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Path(ASTNode):
     """Path expression: id.field.subfield."""
     components: List[str]
 
 
-@dataclass
+@dataclass(slots=True)
 class Argument(ASTNode):
     """Command argument: name = path or name = value."""
     name: str
@@ -30,7 +30,7 @@ class Argument(ASTNode):
     argument_value: Union[Path, Value]  # Can be either a path or a value
 
 
-@dataclass
+@dataclass(slots=True)
 class Command(ASTNode):
     """Command execution: run graphName with (arg1=path1, arg2=path2)."""
     graph_name: str
@@ -42,45 +42,45 @@ class AttributeOperator(Enum):
     COLON = ":"
 
 
-# Base classes
-@dataclass
+# Base classes; AST nodes are slotted, so a program's many small nodes carry no __dict__
+@dataclass(slots=True)
 class ASTNode(ABC):
     """Base class for all AST nodes."""
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class Value(ASTNode):
     """Represents a value (ID, NUMBER, or STRING)."""
     value: Union[str, int]
     value_type: str  # 'ID', 'NUMBER', or 'STRING'
 
 
-@dataclass
+@dataclass(slots=True)
 class VarRef(ASTNode):
     """Base class for variable references."""
     name: str
 
 
-@dataclass
+@dataclass(slots=True)
 class NodeVarRef(VarRef):
     """Reference to a node variable ($ID)."""
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class EdgeVarRef(VarRef):
     """Reference to an edge variable ($ID)."""
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class AttrVarRef(VarRef):
     """Reference to an attributes variable ($ID)."""
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class Attribute(ASTNode):
     """Single attribute with key-value pair."""
     key: str
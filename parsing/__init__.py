@@ -1,12 +1,37 @@
 """
 Parsing utilities for GraphGif language.
 This package provides ANTLR-based parsing functionality for GraphGif source code.
+ANTLR-dependent names are imported on first use, so the package loads without the runtime.
 """
 
-from .ast_builder import ASTBuilder, parse_graphgif, parse_graphgif_file
+from importlib import import_module
+
+from .frontend import ParseResult, parse_graphgif, parse_graphgif_file
+from .streaming import GraphEvent, iter_graph_events, load_graph_model
+
+# Names imported from their module on first access
+_LAZY = {
+    'ASTBuilder': '.ast_builder',
+}
 
 __all__ = [
     'ASTBuilder',
+    'ParseResult',
     'parse_graphgif', 
-    'parse_graphgif_file'
+    'parse_graphgif_file',
+    'GraphEvent',
+    'iter_graph_events',
+    'load_graph_model'
 ]
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
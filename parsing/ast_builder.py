@@ -14,22 +14,38 @@ sys.path.insert(0, parent_dir)
 sys.path.insert(0, current_dir)
 
 from antlr4 import *
+from antlr4.atn.PredictionMode import PredictionMode
+from antlr4.error.ErrorStrategy import BailErrorStrategy, DefaultErrorStrategy
+from antlr4.error.Errors import ParseCancellationException
 from .grammar.GraphgifLexer import GraphgifLexer
 from .grammar.GraphgifParser import GraphgifParser
 from .grammar.GraphgifListener import GraphgifListener
 
+from typing import Optional
+
 from models import *
-from models.graph_model import GraphModel, ConcreteGraph
+from .model_builder import GraphModelBuilder
+# Entry points moved to frontend; re-exported for existing imports from this module
+from .frontend import ParseResult, parse_graphgif, parse_graphgif_file
 
 
-class ASTBuilder(GraphgifListener):
+class ASTBuilder(GraphgifListener, GraphModelBuilder):
     """ANTLR listener that builds our AST model from the parse tree."""
     
-    def __init__(self):
+    def __init__(self, storage: str = 'dict'):
+        GraphModelBuilder.__init__(self, storage)
         self.ast_stack = []
         self.program = None
-        self.graph_model = GraphModel()
-        self.current_graph = None 
+        # Token texts are fresh strings on every getText(); the factory shares repeated ones
+        self.factory = InterningASTFactory()
+    
+    def _pop_many(self, count: int) -> list:
+        """Pop the top count items off the AST stack, keeping them in source order."""
+        if count == 0:
+            return []
+        items = self.ast_stack[-count:]
+        del self.ast_stack[-count:]
+        return items
     
     def enterProgram(self, ctx: GraphgifParser.ProgramContext):
         """Enter program rule."""
@@ -52,10 +68,10 @@ class ASTBuilder(GraphgifListener):
         
         var_value = self.ast_stack.pop()
         
-        var_decl = ASTFactory.create_var_decl(var_type, name, var_value)
+        var_decl = self.factory.create_var_decl(var_type, name, var_value)
         self.variable_declarations.append(var_decl)
         
-        self.graph_model.add_variable(name, var_type, var_value)
+        self._register_variable(var_decl)
     
     def exitVarValue(self, ctx: GraphgifParser.VarValueContext):
         """Exit variable value and push appropriate value to stack."""
@@ -83,24 +99,14 @@ class ASTBuilder(GraphgifListener):
         direction = ctx.getChild(0).getText() 
         name = ctx.ID().getText()
         
-        self.current_graph = ConcreteGraph(name, direction == 'directed')
-        
-        statements = []
-        global_attributes = []
-        
-        # Process statements and global attributes
-        for _ in range(len(ctx.statement())):
-            statements.insert(0, self.ast_stack.pop())
-        
-        for _ in range(len(ctx.globalAttrDecl())):
-            global_attributes.insert(0, self.ast_stack.pop())
-        
-        self._process_global_attributes(global_attributes)
-        self._process_statements(statements)
-        self.graph_model.add_graph(self.current_graph)
+        # Statements were pushed after global attributes, so they are unwound first
+        statements = self._pop_many(len(ctx.statement()))
+        global_attributes = self._pop_many(len(ctx.globalAttrDecl()))
         
-        graph_decl = ASTFactory.create_graph_decl(direction, name, global_attributes, statements)
+        graph_decl = self.factory.create_graph_decl(direction, name, global_attributes, statements)
         self.graph_declarations.append(graph_decl)
+        
+        self._build_concrete_graph(graph_decl)
     
     def exitGlobalAttrDecl(self, ctx: GraphgifParser.GlobalAttrDeclContext):
         """Exit global attribute declaration."""
@@ -139,21 +145,20 @@ class ASTBuilder(GraphgifListener):
         if ctx.attrList() or ctx.attrVarRef():
             attributes = self.ast_stack.pop()
         
-        edge_decl = ASTFactory.create_edge_decl(source, operator, target, attributes)
+        edge_decl = self.factory.create_edge_decl(source, operator, target, attributes)
         self.ast_stack.append(edge_decl)
     
     def exitNodeList(self, ctx: GraphgifParser.NodeListContext):
         """Exit node list."""
-        nodes = [id_node.getText() for id_node in ctx.ID()]
+        name = self.factory.name
+        nodes = [name(id_node.getText()) for id_node in ctx.ID()]
         node_list = NodeList(nodes)
         self.ast_stack.append(node_list)
     
     def exitEdgeList(self, ctx: GraphgifParser.EdgeListContext):
         """Exit edge list."""
         # Collect edge declarations from stack
-        edges = []
-        for _ in range(len(ctx.edgeDecl())):
-            edges.insert(0, self.ast_stack.pop())
+        edges = self._pop_many(len(ctx.edgeDecl()))
         
         edge_list = EdgeList(edges)
         self.ast_stack.append(edge_list)
@@ -161,9 +166,7 @@ class ASTBuilder(GraphgifListener):
     def exitAttrList(self, ctx: GraphgifParser.AttrListContext):
         """Exit attribute list."""
         # Collect attributes from stack
-        attributes = []
-        for _ in range(len(ctx.attribute())):
-            attributes.insert(0, self.ast_stack.pop())
+        attributes = self._pop_many(len(ctx.attribute()))
         
         attr_list = AttrList(attributes)
         self.ast_stack.append(attr_list)
@@ -176,19 +179,19 @@ class ASTBuilder(GraphgifListener):
         # Get value from stack
         value = self.ast_stack.pop()
         
-        attribute = ASTFactory.create_attribute(key, operator, value)
+        attribute = self.factory.create_attribute(key, operator, value)
         self.ast_stack.append(attribute)
     
     def exitValue(self, ctx: GraphgifParser.ValueContext):
         """Exit value."""
         if ctx.ID():
-            value = ASTFactory.create_value(ctx.ID().getText(), "ID")
+            value = self.factory.create_value(ctx.ID().getText(), "ID")
         elif ctx.NUMBER():
-            value = ASTFactory.create_value(int(ctx.NUMBER().getText()), "NUMBER")
+            value = self.factory.create_value(int(ctx.NUMBER().getText()), "NUMBER")
         elif ctx.STRING():
             # Remove quotes from string
             string_text = ctx.STRING().getText()[1:-1]  # Remove surrounding quotes
-            value = ASTFactory.create_value(string_text, "STRING")
+            value = self.factory.create_value(string_text, "STRING")
         
         self.ast_stack.append(value)
     
@@ -199,8 +202,7 @@ class ASTBuilder(GraphgifListener):
         # Collect arguments from stack
         arguments = []
         if ctx.argList():
-            for _ in range(len(ctx.argList().argument())):
-                arguments.insert(0, self.ast_stack.pop())
+            arguments = self._pop_many(len(ctx.argList().argument()))
         
         command = Command(graph_name, arguments)
         self.commands.append(command)
@@ -241,85 +243,17 @@ class ASTBuilder(GraphgifListener):
         attr_var_ref = AttrVarRef(name)
         self.ast_stack.append(attr_var_ref)
 
-    def _process_global_attributes(self, global_attributes):
-        """Process global attributes and apply them to the current concrete graph."""
-        for global_attr in global_attributes:
-            attr_dict = self._resolve_attributes(global_attr.attributes)
-            
-            if global_attr.attr_type == GlobalAttrType.GRAPH:
-                self.current_graph.global_graph_attributes.update(attr_dict)
-            elif global_attr.attr_type == GlobalAttrType.NODE:
-                self.current_graph.global_node_attributes.update(attr_dict)
-            elif global_attr.attr_type == GlobalAttrType.EDGE:
-                self.current_graph.global_edge_attributes.update(attr_dict)
-    
-    def _process_statements(self, statements):
-        """Process statements and build concrete graph elements."""
-        for statement in statements:
-            if isinstance(statement, NodeDecl):
-                self._process_node_declaration(statement)
-            elif isinstance(statement, EdgeDecl):
-                self._process_edge_declaration(statement)
-    
-    def _process_node_declaration(self, node_decl):
-        """Process a node declaration and add nodes to concrete graph."""
-        node_ids = self._resolve_nodes(node_decl.nodes)
-        attributes = self._resolve_attributes(node_decl.attributes) if node_decl.attributes else {}
-        for node_id in node_ids:
-            self.current_graph.add_node(node_id, attributes)
-    
-    def _process_edge_declaration(self, edge_decl):
-        """Process an edge declaration and add edge to concrete graph."""
-        attributes = self._resolve_attributes(edge_decl.attributes) if edge_decl.attributes else {}
-        self.current_graph.add_edge(edge_decl.source, edge_decl.target, attributes)
-    
-    def _resolve_nodes(self, nodes_expr):
-        """Resolve nodes expression (NodeList or NodeVarRef) to list of node IDs."""
-        if isinstance(nodes_expr, NodeList):
-            return nodes_expr.nodes
-        elif isinstance(nodes_expr, NodeVarRef):
-            var_value = self.graph_model.get_variable(nodes_expr.name)
-            if isinstance(var_value, NodeList):
-                return var_value.nodes
-            else:
-                raise ValueError(f"Variable '{nodes_expr.name}' is not a node list")
-        else:
-            raise ValueError(f"Unknown nodes expression type: {type(nodes_expr)}")
-    
-    def _resolve_attributes(self, attr_expr):
-        """Resolve attributes expression (AttrList or AttrVarRef) to dictionary."""
-        if attr_expr is None:
-            return {}
-        elif isinstance(attr_expr, AttrList):
-            result = {}
-            for attr in attr_expr.attributes:
-                result[attr.key] = attr.value.value if hasattr(attr.value, 'value') else attr.value
-            return result
-        elif isinstance(attr_expr, AttrVarRef):
-            # Resolve variable reference
-            var_value = self.graph_model.get_variable(attr_expr.name)
-            if isinstance(var_value, AttrList):
-                result = {}
-                for attr in var_value.attributes:
-                    result[attr.key] = attr.value.value if hasattr(attr.value, 'value') else attr.value
-                return result
-            else:
-                raise ValueError(f"Variable '{attr_expr.name}' is not an attribute list")
-        else:
-            raise ValueError(f"Unknown attributes expression type: {type(attr_expr)}")
-
-    def get_graph_model(self):
-        """Get the concrete graph model."""
-        return self.graph_model
-
 
-def parse_graphgif(input_text: str) -> tuple:
-    """Parse Graphgif source code and return AST and graph model."""
-    
+def build_parse_tree(input_text: str, error_listener: GraphGifErrorListener, two_stage: bool = False):
+    """
+    Run the ANTLR lexer and parser over input_text.
+    With two_stage enabled the input is first parsed with SLL prediction and a bail-out
+    error strategy; only when that fails is it re-parsed with full LL prediction and the
+    default error recovery. Returns the parse tree and the prediction mode that produced it.
+    """
     input_stream = InputStream(input_text)
 
     lexer = GraphgifLexer(input_stream)
-    error_listener = GraphGifErrorListener() # added error listener
     lexer.removeErrorListeners()
     lexer.addErrorListener(error_listener)
 
@@ -327,26 +261,21 @@ def parse_graphgif(input_text: str) -> tuple:
 
     parser = GraphgifParser(token_stream)
     parser.removeErrorListeners()
-    parser.addErrorListener(error_listener)
-
-    tree = parser.program()
-
-    # Check for errors
-    if error_listener.has_errors():
-        error_listener.print_errors()
-
-    ast_builder = ASTBuilder()
-    walker = ParseTreeWalker()
-    walker.walk(ast_builder, tree)
-    
-    return ast_builder.program, ast_builder.get_graph_model()
 
+    if two_stage:
+        # Stage 1: SLL prediction, no recovery, no parser diagnostics
+        parser._interp.predictionMode = PredictionMode.SLL
+        parser._errHandler = BailErrorStrategy()
+        try:
+            return parser.program(), "SLL"
+        except ParseCancellationException:
+            # Stage 2: rewind the buffered tokens and parse again with full LL
+            parser.reset()
+            parser._interp.predictionMode = PredictionMode.LL
+            parser._errHandler = DefaultErrorStrategy()
 
-def parse_graphgif_file(file_path: str) -> tuple:
-    """Parse Graphgif file and return AST and graph model."""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    return parse_graphgif(content)
+    parser.addErrorListener(error_listener)
+    return parser.program(), "LL"
 
 
 def test_parser():
@@ -0,0 +1,108 @@
+"""
+On-disk cache of parsed programs.
+Error-free parses are stored with models.serialization under the hash of the source, the
+parser version and the backend and storage options, so an unchanged file is loaded from its
+binary image instead of being parsed again. The parser version covers the grammar, the files
+that turn sources into models, the graph storage engines and the serialization schema;
+changing any of them makes previous entries unreachable, and the size bound of the store
+evicts them over time.
+"""
+
+import hashlib
+import os
+from functools import lru_cache
+from typing import Optional
+
+from animation.cache import DEFAULT_CACHE_SIZE, RenderCache, default_cache_dir
+from models.serialization import dumps, loads, schema_version
+from .frontend import ParseResult, parse_graphgif
+
+# Files whose contents determine the program and graph model parsed from a source
+_PARSER_FILES = ('grammar/Graphgif.g4', 'fast_parser.py', 'ast_builder.py', 'model_builder.py',
+                 '../models/graph_model.py', '../models/compact_graph.py')
+
+
+@lru_cache(maxsize=None)
+def parser_version() -> str:
+    """Hash of the grammar, the parser, builder and graph model sources and the serialization schema."""
+    directory = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256(schema_version().encode())
+    for name in _PARSER_FILES:
+        with open(os.path.join(directory, name), 'rb') as f:
+            digest.update(f.read())
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def default_ast_cache_dir() -> str:
+    return os.path.join(default_cache_dir(), 'ast')
+
+
+class ASTCache:
+    """
+    Parsed programs keyed by source contents, stored in a size-bounded RenderCache.
+    hits and misses count lookups made through this instance.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_size: int = DEFAULT_CACHE_SIZE):
+        self.store = RenderCache(directory or default_ast_cache_dir(), max_size)
+
+    @property
+    def hits(self) -> int:
+        return self.store.hits
+
+    @property
+    def misses(self) -> int:
+        return self.store.misses
+
+    @staticmethod
+    def key(source: str, backend: str, storage: str) -> str:
+        digest = hashlib.sha256()
+        for part in (parser_version(), backend, storage, source):
+            digest.update(part.encode('utf-8', 'surrogatepass'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def get(self, source: str, backend: str = "antlr", storage: str = "dict") -> Optional[ParseResult]:
+        """Cached parse of source, or None. Unreadable entries count as misses."""
+        data = self.store.get(self.key(source, backend, storage))
+        if data is None:
+            return None
+        try:
+            program, graph_model = loads(data)
+        except ValueError:
+            self.store.hits -= 1
+            self.store.misses += 1
+            return None
+        # The prediction mode of the original parse is not recorded
+        return ParseResult(program, graph_model, None, [], backend)
+
+    def put(self, source: str, result: ParseResult, storage: str = "dict"):
+        """Store an error-free parse; parses with errors are not cached."""
+        if result.errors:
+            return
+        try:
+            data = dumps(result.program, result.graph_model)
+        except TypeError:
+            # Models holding values the format cannot represent are simply parsed every time
+            return
+        self.store.put(self.key(source, result.backend, storage), data)
+
+    def parse(self, input_text: str, backend: str = "antlr", storage: str = "dict",
+              source_name: str = "input", print_errors: bool = True) -> ParseResult:
+        """parse_graphgif going through the cache."""
+        result = self.get(input_text, backend, storage)
+        if result is None:
+            result = parse_graphgif(input_text, backend=backend, storage=storage,
+                                    source_name=source_name, print_errors=print_errors)
+            self.put(input_text, result, storage)
+        return result
+
+    def parse_file(self, file_path: str, backend: str = "antlr", storage: str = "dict",
+                   print_errors: bool = True) -> ParseResult:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        return self.parse(content, backend, storage, file_path, print_errors)
+
+    def summary(self) -> str:
+        return f"AST cache: {self.hits} hits, {self.misses} misses"
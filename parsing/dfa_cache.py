@@ -0,0 +1,297 @@
+"""
+Persistent cache of the ANTLR prediction DFAs.
+The generated lexer and parser share their DFAs between instances, but every process starts
+with them empty and rebuilds them from the ATN while parsing. save_dfa_cache writes the
+warmed DFA states to a JSON file and load_dfa_cache restores them at startup, so a short-lived
+process predicts from the DFA from the first token. Files are keyed by grammar version, so a
+regenerated grammar or a different runtime simply starts cold again.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from animation.cache import default_cache_dir
+
+CACHE_FORMAT = 1
+
+# Edge targets that are not DFA states
+_ERROR_EDGE = -1
+
+
+def _recognizers():
+    from .grammar.GraphgifLexer import GraphgifLexer
+    from .grammar.GraphgifParser import GraphgifParser
+    return GraphgifLexer, GraphgifParser
+
+
+def _runtime_version() -> str:
+    from importlib.metadata import PackageNotFoundError, version
+    try:
+        return version('antlr4-python3-runtime')
+    except PackageNotFoundError:
+        return 'unknown'
+
+
+@lru_cache(maxsize=None)
+def grammar_version() -> str:
+    """Hash of the serialized lexer and parser ATNs, the runtime version and the cache format."""
+    from .grammar import GraphgifLexer, GraphgifParser
+    digest = hashlib.sha256()
+    for part in (CACHE_FORMAT, _runtime_version(), GraphgifLexer.serializedATN(),
+                 GraphgifParser.serializedATN()):
+        digest.update(repr(part).encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def default_dfa_cache_path(directory: Optional[str] = None) -> str:
+    return os.path.join(directory or default_cache_dir(), f'antlr-dfa-{grammar_version()[:16]}.json')
+
+
+def dfa_state_count() -> int:
+    """Number of DFA states currently held by the lexer and parser."""
+    return sum(len(dfa._states) for recognizer in _recognizers() for dfa in recognizer.decisionsToDFA)
+
+
+class _Unsupported(Exception):
+    """DFA holding state the cache cannot represent (semantic predicates, custom lexer actions)."""
+
+
+class _DFAEncoder:
+    """Flattens the DFAs of one recognizer into JSON-compatible lists."""
+
+    def __init__(self, atn, error_state, lexer: bool):
+        self.atn = atn
+        self.error_state = error_state
+        self.lexer = lexer
+        self.contexts: List[list] = []
+        self._context_ids: Dict[int, int] = {}
+
+    def context(self, ctx) -> Optional[int]:
+        from antlr4.PredictionContext import ArrayPredictionContext, PredictionContext
+        if ctx is None:
+            return None
+        key = id(ctx)
+        if key in self._context_ids:
+            return self._context_ids[key]
+        if ctx is PredictionContext.EMPTY:
+            entry = ['E']
+        elif isinstance(ctx, ArrayPredictionContext):
+            entry = ['A', [self.context(parent) for parent in ctx.parents], list(ctx.returnStates)]
+        else:
+            entry = ['S', self.context(ctx.parentCtx), ctx.returnState]
+        self._context_ids[key] = len(self.contexts)
+        self.contexts.append(entry)
+        return self._context_ids[key]
+
+    def executor(self, executor) -> Optional[List[int]]:
+        if executor is None:
+            return None
+        try:
+            return [self.atn.lexerActions.index(action) for action in executor.lexerActions]
+        except ValueError:
+            raise _Unsupported() from None
+
+    def config(self, config) -> list:
+        from antlr4.atn.SemanticContext import SemanticContext
+        if config.semanticContext is not SemanticContext.NONE:
+            raise _Unsupported()
+        entry = [config.state.stateNumber, config.alt, self.context(config.context),
+                 config.reachesIntoOuterContext, config.precedenceFilterSuppressed]
+        if self.lexer:
+            entry += [self.executor(config.lexerActionExecutor), config.passedThroughNonGreedyDecision]
+        return entry
+
+    def dfa(self, dfa) -> dict:
+        states = list(dfa._states.values())
+        if dfa.s0 is not None and dfa.s0 not in dfa._states:
+            # Precedence DFAs keep their start state outside the state map
+            states.append(dfa.s0)
+        index = {id(state): i for i, state in enumerate(states)}
+        encoded = []
+        for state in states:
+            if state.predicates is not None:
+                raise _Unsupported()
+            configs = state.configs
+            edges = None
+            if state.edges is not None:
+                edges = [len(state.edges), [
+                    [symbol, _ERROR_EDGE if target is self.error_state else index[id(target)]]
+                    for symbol, target in enumerate(state.edges) if target is not None
+                ]]
+            encoded.append({
+                'number': state.stateNumber,
+                'configs': [self.config(config) for config in configs],
+                'set': [configs.fullCtx, configs.uniqueAlt,
+                        sorted(configs.conflictingAlts) if configs.conflictingAlts is not None else None,
+                        configs.hasSemanticContext, configs.dipsIntoOuterContext],
+                'edges': edges,
+                'accept': state.isAcceptState,
+                'prediction': state.prediction,
+                'executor': self.executor(state.lexerActionExecutor) if self.lexer else None,
+                'full_context': state.requiresFullContext,
+            })
+        return {
+            'decision': dfa.decision,
+            'states': encoded,
+            'registered': len(dfa._states),
+            's0': index[id(dfa.s0)] if dfa.s0 is not None else None,
+        }
+
+
+class _DFADecoder:
+    """Rebuilds DFA states encoded by _DFAEncoder against a recognizer's ATN."""
+
+    def __init__(self, atn, error_state, lexer: bool, contexts: List[list], context_cache=None):
+        from antlr4.PredictionContext import (ArrayPredictionContext, PredictionContext,
+                                              SingletonPredictionContext)
+        self.atn = atn
+        self.error_state = error_state
+        self.lexer = lexer
+        self.contexts = []
+        # Contexts are encoded parents first, so every reference points backwards
+        for entry in contexts:
+            if entry[0] == 'E':
+                ctx = PredictionContext.EMPTY
+            elif entry[0] == 'S':
+                ctx = SingletonPredictionContext.create(self._context(entry[1]), entry[2])
+            else:
+                ctx = ArrayPredictionContext([self._context(parent) for parent in entry[1]], list(entry[2]))
+            if context_cache is not None:
+                ctx = context_cache.add(ctx)
+            self.contexts.append(ctx)
+
+    def _context(self, ctx_id: Optional[int]):
+        return None if ctx_id is None else self.contexts[ctx_id]
+
+    def executor(self, actions: Optional[List[int]]):
+        from antlr4.atn.LexerActionExecutor import LexerActionExecutor
+        if actions is None:
+            return None
+        return LexerActionExecutor([self.atn.lexerActions[i] for i in actions])
+
+    def config(self, entry: list):
+        from antlr4.atn.ATNConfig import ATNConfig, LexerATNConfig
+        from antlr4.atn.SemanticContext import SemanticContext
+        state, context = self.atn.states[entry[0]], self._context(entry[2])
+        if self.lexer:
+            config = LexerATNConfig(state, entry[1], context, SemanticContext.NONE, self.executor(entry[5]))
+            config.passedThroughNonGreedyDecision = entry[6]
+        else:
+            config = ATNConfig(state, entry[1], context, SemanticContext.NONE)
+        config.reachesIntoOuterContext = entry[3]
+        config.precedenceFilterSuppressed = entry[4]
+        return config
+
+    def dfa(self, dfa, encoded: dict):
+        """Return the (states, s0) of an encoded DFA; dfa itself is left untouched."""
+        from antlr4.atn.ATNConfigSet import ATNConfigSet, OrderedATNConfigSet
+        from antlr4.dfa.DFAState import DFAState
+
+        states = []
+        for entry in encoded['states']:
+            full_ctx, unique_alt, conflicting_alts, has_semantic_context, dips = entry['set']
+            configs = OrderedATNConfigSet() if self.lexer else ATNConfigSet(full_ctx)
+            configs.fullCtx = full_ctx
+            configs.configs = [self.config(config) for config in entry['configs']]
+            configs.uniqueAlt = unique_alt
+            configs.conflictingAlts = set(conflicting_alts) if conflicting_alts is not None else None
+            configs.hasSemanticContext = has_semantic_context
+            configs.dipsIntoOuterContext = dips
+            configs.setReadonly(True)
+
+            state = DFAState(entry['number'], configs)
+            state.isAcceptState = entry['accept']
+            state.prediction = entry['prediction']
+            state.lexerActionExecutor = self.executor(entry['executor'])
+            state.requiresFullContext = entry['full_context']
+            states.append(state)
+
+        for state, entry in zip(states, encoded['states']):
+            if entry['edges'] is not None:
+                size, targets = entry['edges']
+                state.edges = [None] * size
+                for symbol, target in targets:
+                    state.edges[symbol] = self.error_state if target == _ERROR_EDGE else states[target]
+
+        s0 = states[encoded['s0']] if encoded['s0'] is not None else None
+        if dfa.precedenceDfa and s0 is None:
+            raise ValueError("precedence DFA without start state")
+        return states[:encoded['registered']], s0
+
+
+def _simulators():
+    from antlr4.atn.LexerATNSimulator import LexerATNSimulator
+    from antlr4.atn.ParserATNSimulator import ParserATNSimulator
+    lexer, parser = _recognizers()
+    return (('lexer', lexer, LexerATNSimulator.ERROR, True),
+            ('parser', parser, ParserATNSimulator.ERROR, False))
+
+
+def save_dfa_cache(path: Optional[str] = None) -> str:
+    """
+    Write the current lexer and parser DFAs to path (default in the cache directory).
+    DFAs the cache cannot represent are left out and rebuilt as usual after loading.
+    """
+    path = path or default_dfa_cache_path()
+    data = {'format': CACHE_FORMAT, 'grammar': grammar_version()}
+    for name, recognizer, error_state, lexer in _simulators():
+        encoder = _DFAEncoder(recognizer.atn, error_state, lexer)
+        dfas = []
+        for dfa in recognizer.decisionsToDFA:
+            if not dfa._states:
+                continue
+            try:
+                dfas.append(encoder.dfa(dfa))
+            except _Unsupported:
+                # Contexts already encoded for the skipped DFA stay in the table unused
+                pass
+        data[name] = {'contexts': encoder.contexts, 'dfas': dfas}
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(data, f, separators=(',', ':'))
+    os.replace(temp_path, path)
+    return path
+
+
+def load_dfa_cache(path: Optional[str] = None) -> bool:
+    """
+    Restore DFAs saved by save_dfa_cache into the lexer and parser.
+    Returns False, leaving the DFAs cold, when the file is missing, unreadable or was written
+    for another grammar version. DFAs that already hold states are not replaced.
+    """
+    path = path or default_dfa_cache_path()
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return False
+    if not isinstance(data, dict) or data.get('format') != CACHE_FORMAT or data.get('grammar') != grammar_version():
+        return False
+
+    restored = []
+    try:
+        for name, recognizer, error_state, lexer in _simulators():
+            section = data[name]
+            context_cache = getattr(recognizer, 'sharedContextCache', None)
+            decoder = _DFADecoder(recognizer.atn, error_state, lexer, section['contexts'], context_cache)
+            for encoded in section['dfas']:
+                dfa = recognizer.decisionsToDFA[encoded['decision']]
+                restored.append((dfa, *decoder.dfa(dfa, encoded)))
+    except (KeyError, IndexError, TypeError, ValueError):
+        return False
+
+    # Only touch the DFAs once the whole file decoded
+    for dfa, states, s0 in restored:
+        if dfa._states:
+            continue
+        dfa._states = {state: state for state in states}
+        dfa.s0 = s0
+    return True
@@ -0,0 +1,998 @@
+"""
+Hand-written parsing backend for GraphGif.
+This module implements the Graphgif.g4 grammar with a regex-driven tokenizer and a
+recursive-descent parser that produces the same AST and graph model as ASTBuilder,
+without going through the ANTLR runtime.
+
+Syntax errors are handled like ANTLR's DefaultErrorStrategy: token recognition errors are
+reported when the parser reaches them, interleaved with parser errors as ANTLR reports them; a failed
+match is repaired by single-token deletion or insertion; loops resynchronise on their follow
+sets; and a rule that cannot continue reports the error and skips to the follow sets of the
+rules being parsed. Tokens skipped inside a rule are seen by ASTBuilder as children of that
+rule, so they are kept per rule and read the same way. Where ASTBuilder cannot build a node
+from a malformed rule, the node is left out.
+"""
+
+import re
+from collections import deque
+from typing import Optional
+
+from errors import GraphGifErrorListener
+from models import *
+from models.arena import ASTArena, ArenaStatements
+from .model_builder import GraphModelBuilder
+
+
+# Token tuples are (type, text, line, column). Literal tokens use their text as type.
+TYPE, TEXT, LINE, COLUMN = 0, 1, 2, 3
+
+EOF = 'EOF'
+# Marks a follow set that can reach the end of the rule
+EPSILON = 'EPSILON'
+
+KEYWORDS = {
+    'var', 'node', 'edge', 'attributes', 'directed', 'undirected', 'graph', 'run', 'with'
+}
+
+# ANTLR token type order, used to format expected-token sets like the generated parser
+TOKEN_ORDER = [
+    EOF, ';', 'var', '=', 'node', 'edge', 'attributes', 'directed', 'undirected', 'graph',
+    '{', '}', '--', '->', '<-', ',', '[', ']', ':', '$', 'run', 'with', '(', ')', '.',
+    'ID', 'NUMBER', 'STRING'
+]
+TOKEN_RANK = {token_type: rank for rank, token_type in enumerate(TOKEN_ORDER)}
+
+TOKEN_PATTERN = re.compile(r"""
+      (?P<WS>[ \t\r\n]+)
+    | (?P<COMMENT>/\*.*?\*/)
+    | (?P<COMMENT_LINE>//[^\r\n]*)
+    | (?P<ID>[a-zA-Z_][a-zA-Z0-9_]*)
+    | (?P<NUMBER>[0-9]+)
+    | (?P<STRING>'(?:[^\r\n'\\]|\\.)*')
+    | (?P<OP>--|->|<-|[;={}\[\],:$().])
+""", re.VERBOSE | re.DOTALL)
+
+SKIPPED = {'WS', 'COMMENT', 'COMMENT_LINE'}
+
+EDGE_OPS = {'--', '->', '<-'}
+VALUE_TOKENS = {'ID', 'NUMBER', 'STRING'}
+VAR_TYPES = {'node', 'edge', 'attributes'}
+GRAPH_DIRECTIONS = {'directed', 'undirected'}
+GLOBAL_ATTR_TYPES = {'graph': GlobalAttrType.GRAPH, 'node': GlobalAttrType.NODE, 'edge': GlobalAttrType.EDGE}
+OPERATORS = {'=', ':'}
+
+# Tokens that can follow a grammar position, as computed by the ANTLR tool for the generated
+# parser; EPSILON means the position can reach the end of its rule
+RULE_END = {EPSILON}
+SEMICOLON = {';'}
+ID_SET = {'ID'}
+PROGRAM_VAR_LOOP = {'var', 'directed', 'undirected', 'run', EOF}
+PROGRAM_GRAPH_LOOP = {'directed', 'undirected', 'run', EOF}
+PROGRAM_COMMAND_LOOP = {'run', EOF}
+VAR_VALUE_START = {'[', '$', 'ID'}
+GLOBAL_ATTR_LOOP = {'graph', 'node', 'edge', '$', 'ID', '}'}
+STATEMENT_LOOP = {'$', 'ID', '}'}
+ATTRIBUTES_START = {'[', '$'}
+OPTIONAL_ATTRIBUTES = {EPSILON, '[', '$'}
+LIST_LOOP = {EPSILON, ','}
+ATTR_LIST_BODY = {']', 'ID'}
+ATTRIBUTE_LOOP = {',', ']'}
+ARG_LIST_START = {')', 'ID'}
+PATH_LOOP = {EPSILON, '.'}
+# ANTLR's Python runtime adds the recovery set to the cached follow set of a (...)* loop the
+# first time it resynchronises after an iteration, so from then on these loops also accept ';'
+GLOBAL_ATTR_LOOP_BACK = GLOBAL_ATTR_LOOP | SEMICOLON
+STATEMENT_LOOP_BACK = STATEMENT_LOOP | SEMICOLON
+ATTRIBUTE_LOOP_BACK = ATTRIBUTE_LOOP | SEMICOLON
+
+# State of the generated parser at each variable reference match, by reference class
+VAR_REF_STATES = {
+    NodeVarRef: ('nodeVarRef.$', 'nodeVarRef.ID'),
+    AttrVarRef: ('attrVarRef.$', 'attrVarRef.ID'),
+}
+
+
+def _lexer_error_end(text: str, pos: int) -> int:
+    """
+    Return the end of the text consumed by a lexer error starting at pos.
+    Mirrors ANTLR, which reports the longest attempted prefix up to and including the
+    character where no token could continue, then resumes after it.
+    """
+    n = len(text)
+    char = text[pos]
+    if char == "'":
+        i = pos + 1
+        while i < n:
+            c = text[i]
+            if c == '\\':
+                i += 2
+                continue
+            if c in '\r\n':
+                break
+            i += 1
+        return min(i + 1, n)
+    if text.startswith('/*', pos):
+        return n
+    if char in '-</':
+        return min(pos + 2, n)
+    return pos + 1
+
+
+def _needs_more_input(text: str, pos: int) -> bool:
+    """Whether unrecognised input at pos could still become a token once more text arrives."""
+    char = text[pos]
+    if char == "'":
+        # An unterminated string is only an error once a line break is reached
+        i = pos + 1
+        while i < len(text):
+            c = text[i]
+            if c == '\\':
+                i += 2
+            elif c in '\r\n':
+                return False
+            else:
+                i += 1
+        return True
+    if char in '-</' and pos + 1 >= len(text):
+        return True
+    if text.startswith('/*', pos):
+        return text.find('*/', pos + 2) < 0
+    return False
+
+
+class Tokenizer:
+    """
+    Incremental GraphGif tokenizer.
+    feed() accepts consecutive chunks of source text and returns the tokens completed so far;
+    text that may still be extended by the next chunk is held back until then. scan() yields
+    the same tokens one at a time, reporting each error only once the token after it is reached.
+    """
+
+    def __init__(self, on_error=None):
+        self.on_error = on_error
+        self.line = 1
+        self.line_start = 0  # absolute offset where the current line starts
+        self.offset = 0      # absolute offset of the held-back text
+        self.pending = ""
+
+    def feed(self, chunk: str, final: bool = False) -> list:
+        """
+        Tokenize chunk after any held-back text. With final set the input is complete:
+        everything is tokenized and an EOF token is appended.
+        on_error(message, line, column) is called for every token recognition error.
+        """
+        return list(self.scan(chunk, final))
+
+    def scan(self, chunk: str, final: bool = False):
+        """Generator version of feed(); the held-back text is only updated once it is exhausted."""
+        text = self.pending + chunk if self.pending else chunk
+        keywords = KEYWORDS
+        line = self.line
+        line_start = self.line_start - self.offset  # relative to text, may be negative
+        pos = 0
+        n = len(text)
+
+        while pos < n:
+            for match in TOKEN_PATTERN.finditer(text, pos):
+                start = match.start()
+                if start != pos:
+                    break
+                end = match.end()
+                if end == n and not final:
+                    # The token may continue in the next chunk
+                    break
+                kind = match.lastgroup
+                value = match.group()
+                pos = end
+                if kind == 'ID':
+                    yield (value if value in keywords else 'ID', value, line, start - line_start)
+                elif kind == 'OP':
+                    yield (value, value, line, start - line_start)
+                else:
+                    if kind not in SKIPPED:
+                        yield (kind, value, line, start - line_start)
+                    if kind != 'NUMBER':
+                        newlines = value.count('\n')
+                        if newlines:
+                            line += newlines
+                            line_start = start + value.rindex('\n') + 1
+            if pos >= n:
+                break
+            if not final and (TOKEN_PATTERN.match(text, pos) or _needs_more_input(text, pos)):
+                break
+
+            # Unrecognised input; resume scanning after the error
+            end = _lexer_error_end(text, pos)
+            bad_text = text[pos:end]
+            if self.on_error is not None:
+                self.on_error(f"token recognition error at: '{_escape(bad_text)}'", line, pos - line_start)
+            newlines = bad_text.count('\n')
+            if newlines:
+                line += newlines
+                line_start = pos + bad_text.rindex('\n') + 1
+            pos = end
+
+        if final:
+            yield (EOF, '<EOF>', line, pos - line_start)
+
+        self.pending = text[pos:]
+        self.offset += pos
+        self.line = line
+        self.line_start = self.offset - pos + line_start
+
+
+def tokenize(text: str, on_error=None) -> list:
+    """
+    Split GraphGif source into token tuples, ending with an EOF token.
+    on_error(message, line, column) is called for every token recognition error.
+    """
+    return Tokenizer(on_error).feed(text, final=True)
+
+
+def _escape(text: str) -> str:
+    return text.replace('\n', '\\n').replace('\r', '\\r').replace('\t', '\\t')
+
+
+def _token_name(token_type: str) -> str:
+    if token_type == EOF:
+        return '<EOF>'
+    if token_type in VALUE_TOKENS:
+        return token_type
+    return f"'{token_type}'"
+
+
+def _format_expected(expected) -> str:
+    names = [_token_name(t) for t in sorted(expected, key=TOKEN_RANK.__getitem__)]
+    if len(names) == 1:
+        return names[0]
+    return "{" + ", ".join(names) + "}"
+
+
+def _first_id(tokens):
+    """Text of the first ID token, the way ASTBuilder reads ctx.ID(); None if there is none."""
+    for token in tokens:
+        if token[TYPE] == 'ID':
+            return token[TEXT]
+    return None
+
+
+class _RecognitionError(Exception):
+    """Raised inside a rule when the input cannot be matched; state identifies where."""
+
+    def __init__(self, message: str, token: tuple, state: str, lexes_input: bool = False):
+        super().__init__(message)
+        self.message = message
+        self.token = token
+        self.state = state
+        # Reporting it lexes the rest of the input first, as ANTLR's token stream getText does
+        self.lexes_input = lexes_input
+
+
+class FastParser(GraphModelBuilder):
+    """
+    Recursive-descent parser for GraphGif building the AST and graph model directly.
+    With an arena, the statements of graph declarations are stored in it as each one is parsed.
+    """
+
+    def __init__(self, input_text: str, error_listener: GraphGifErrorListener = None, storage: str = 'dict',
+                 arena: Optional[ASTArena] = None):
+        self._init_state(error_listener, storage)
+        self.arena = arena
+        self.input_text = input_text
+        self._lines = None
+        self._lex(input_text)
+        self._fetch(0)
+
+    def _init_state(self, error_listener: GraphGifErrorListener = None, storage: str = 'dict'):
+        GraphModelBuilder.__init__(self, storage)
+        self.error_listener = error_listener if error_listener is not None else GraphGifErrorListener()
+        self._error_recovery = False
+        self._last_error_index = -1
+        self._last_error_states = None
+        # Follow set of every rule being parsed, outermost first
+        self._follow = []
+        # (rule depth, token) of tokens skipped by error recovery
+        self._error_nodes = []
+        # First error resolving variables and graphs, raised once the input is parsed
+        self._resolve_error = None
+        self.tokens = []
+        # Tokens below this index have been reached by the parser
+        self._fetched = 0
+        # (token index, message, line, column) of lexer errors the parser has not reached yet
+        self._pending_lexer_errors = deque()
+        self.pos = 0
+        self.program = None
+        self.arena = None
+        self.factory = InterningASTFactory()
+
+    # Error reporting
+
+    def _context_line(self, line: int) -> str:
+        if self._lines is None:
+            self._lines = self.input_text.split('\n')
+        return self._lines[line - 1] if 0 < line <= len(self._lines) else ""
+
+    def _report_lexer_error(self, message: str, line: int, column: int):
+        self.error_listener.add_error('lexer', message, line, column,
+                                      self._context_line(line), ' ' * column + '^', None)
+
+    def _report(self, token: tuple, message: str):
+        """Report a parser error at token unless already recovering from one."""
+        if self._error_recovery:
+            return
+        self._error_recovery = True
+        width = 1 if token[TYPE] == EOF else max(len(token[TEXT]), 1)
+        self.error_listener.add_error('parser', message, token[LINE], token[COLUMN],
+                                      self._context_line(token[LINE]),
+                                      ' ' * token[COLUMN] + '^' * width, token[TEXT])
+
+    def _display(self, token: tuple) -> str:
+        return f"'{_escape(token[TEXT])}'"
+
+    def _end_error_condition(self):
+        self._error_recovery = False
+        self._last_error_index = -1
+        self._last_error_states = None
+
+    def _expected(self, local) -> set:
+        """Tokens expected at a position with follow set local, through the rules being parsed."""
+        if EPSILON not in local:
+            return local
+        expected = set(local)
+        following = local
+        for follow in reversed(self._follow):
+            if EPSILON not in following:
+                break
+            following = follow
+            expected |= follow
+        expected.discard(EPSILON)
+        if EPSILON in following:
+            expected.add(EOF)
+        return expected
+
+    def _recovery_set(self) -> set:
+        """Tokens that can follow any rule being parsed, where a failed rule stops skipping."""
+        recovery = set()
+        for follow in self._follow:
+            recovery |= follow
+        recovery.discard(EPSILON)
+        return recovery
+
+    def _report_unwanted(self, expected):
+        token = self.tokens[self.pos]
+        self._report(token, f"extraneous input {self._display(token)} expecting "
+                            f"{_format_expected(self._expected(expected))}")
+
+    def _report_missing(self, expected):
+        token = self.tokens[self.pos]
+        self._report(token, f"missing {_format_expected(self._expected(expected))} at {self._display(token)}")
+
+    def _mismatch(self, expected, state: str) -> _RecognitionError:
+        token = self.tokens[self.pos]
+        return _RecognitionError(f"mismatched input {self._display(token)} expecting "
+                                 f"{_format_expected(self._expected(expected))}", token, state)
+
+    def _no_viable_alternative(self, start: int, offending: int, state: str) -> _RecognitionError:
+        """Error for a decision that failed at token offending, having started at token start."""
+        tokens = self.tokens
+        if tokens[start][TYPE] == EOF:
+            text = '<EOF>'
+        else:
+            text = ''.join(token[TEXT] for token in tokens[start:offending + 1] if token[TYPE] != EOF)
+        return _RecognitionError(f"no viable alternative at input '{_escape(text)}'", tokens[offending], state,
+                                 lexes_input=True)
+
+    # Token stream helpers
+
+    def _lex(self, input_text: str):
+        """Tokenize the whole input, holding each lexer error back until _fetch reaches it."""
+        tokens = self.tokens
+        pending = self._pending_lexer_errors
+
+        def on_error(message: str, line: int, column: int):
+            pending.append((len(tokens), message, line, column))
+
+        for token in Tokenizer(on_error).scan(input_text, final=True):
+            tokens.append(token)
+
+    def _fetch(self, index: int) -> bool:
+        """
+        Reach the tokens up to index; returns False if the input ends before it.
+        ANTLR lexes on demand, so a lexer error is reported when the parser first looks
+        at the token after the bad input, between the parser errors around it.
+        """
+        pending = self._pending_lexer_errors
+        while pending and pending[0][0] <= index:
+            _, message, line, column = pending.popleft()
+            self._report_lexer_error(message, line, column)
+        self._fetched = pending[0][0] if pending else len(self.tokens)
+        return index < len(self.tokens)
+
+    def _la(self, k: int = 1) -> str:
+        index = self.pos + k - 1
+        if index >= self._fetched and not self._fetch(index):
+            return EOF
+        return self.tokens[index][TYPE]
+
+    def _consume(self) -> tuple:
+        token = self.tokens[self.pos]
+        if token[TYPE] != EOF:
+            self.pos += 1
+            if self.pos >= self._fetched:
+                self._fetch(self.pos)
+        return token
+
+    def _consume_error(self):
+        """Consume a token skipped by error recovery, as a child of the current rule."""
+        token = self._consume()
+        if token[TYPE] != EOF:
+            self._error_nodes.append((len(self._follow), token))
+
+    def _consume_until(self, stop):
+        while self.tokens[self.pos][TYPE] != EOF and self.tokens[self.pos][TYPE] not in stop:
+            self._consume_error()
+
+    def _exit_rule(self) -> list:
+        """Leave the current rule, returning the tokens error recovery skipped inside it."""
+        depth = len(self._follow)
+        self._follow.pop()
+        nodes = self._error_nodes
+        if not nodes or nodes[-1][0] < depth:
+            return ()
+        skipped = []
+        while nodes and nodes[-1][0] >= depth:
+            skipped.append(nodes.pop()[1])
+        skipped.reverse()
+        return skipped
+
+    def _skipped_in_rule(self) -> list:
+        """Tokens error recovery has skipped so far in the current rule."""
+        depth = len(self._follow)
+        skipped = []
+        for node_depth, token in reversed(self._error_nodes):
+            if node_depth < depth:
+                break
+            skipped.append(token)
+        skipped.reverse()
+        return skipped
+
+    def _match(self, token_type: str, after, state: str) -> tuple:
+        """Match a token followed by the set after; a missing token is returned as a <missing> token."""
+        tokens = self.tokens
+        token = tokens[self.pos]
+        if token[TYPE] == token_type:
+            if self._error_recovery:
+                self._end_error_condition()
+            self.pos += 1
+            if self.pos >= self._fetched:
+                self._fetch(self.pos)
+            return token
+        return self._recover_inline((token_type,), after, state, True)
+
+    def _match_set(self, token_types, after, state: str):
+        """Match any token of a set (a rule like value: ID | NUMBER | STRING); None if missing."""
+        token = self.tokens[self.pos]
+        if token[TYPE] in token_types:
+            if self._error_recovery:
+                self._end_error_condition()
+            return self._consume()
+        return self._recover_inline(token_types, after, state, False)
+
+    def _recover_inline(self, expected, after, state: str, conjure: bool):
+        """Repair a failed match by single-token deletion, then insertion, or raise."""
+        token = self.tokens[self.pos]
+        if self._la(2) in expected:
+            # Single-token deletion: the expected token follows the offending one
+            self._report_unwanted(expected)
+            self._consume_error()
+            self._end_error_condition()
+            return self._consume()
+        if token[TYPE] in self._expected(after):
+            # Single-token insertion: the offending token can follow the missing one
+            self._report_missing(expected)
+            if not conjure:
+                return None
+            token_type = min(expected, key=TOKEN_RANK.__getitem__)
+            return (token_type, f"<missing {_token_name(token_type)}>", token[LINE], token[COLUMN])
+        raise self._mismatch(expected, state)
+
+    def _recover(self, error: _RecognitionError):
+        """Report a failed rule and skip tokens until one that can follow a rule being parsed."""
+        if error.lexes_input and not self._error_recovery:
+            while self._fetch(len(self.tokens)):
+                pass
+        self._report(error.token, error.message)
+        if (self._last_error_index == self.pos and self._last_error_states is not None
+                and error.state in self._last_error_states):
+            # Guarantee progress when failing twice at the same token and state
+            self._consume_error()
+        self._last_error_index = self.pos
+        if self._last_error_states is None:
+            self._last_error_states = []
+        self._last_error_states.append(error.state)
+        self._consume_until(self._recovery_set())
+
+    def _sync(self, expected, state: str):
+        """Resynchronise before a block or (...)* loop: drop a single stray token or raise."""
+        if self._error_recovery or self.tokens[self.pos][TYPE] in expected:
+            return
+        if self._la(2) in expected:
+            self._report_unwanted(expected)
+            self._consume_error()
+            self._end_error_condition()
+            return
+        raise self._mismatch(expected, state)
+
+    def _sync_loop_back(self, expected):
+        """Resynchronise after a (...)* loop iteration by skipping unwanted tokens."""
+        if self._error_recovery or self.tokens[self.pos][TYPE] in expected:
+            return
+        self._report_unwanted(expected)
+        self._consume_until(expected | self._recovery_set())
+
+    # Grammar rules
+
+    def parse(self):
+        """
+        Parse the whole input and return (program, graph_model).
+        Like ASTBuilder walking a complete parse tree, an undefined or mistyped variable raises
+        ValueError only after every syntax error has been reported.
+        """
+        self.program = self.parse_program()
+        if self._resolve_error is not None:
+            raise self._resolve_error
+        return self.program, self.graph_model
+
+    def _resolve(self, step, node):
+        """Run a graph model step unless an earlier one failed; a failure is kept for parse()."""
+        if self._resolve_error is None:
+            try:
+                step(node)
+            except ValueError as error:
+                self._resolve_error = error
+
+    def parse_program(self) -> Program:
+        """program: (varDecl ';')* (graphDecl ';')* (command ';')* EOF"""
+        variable_declarations = []
+        graph_declarations = []
+        commands = []
+
+        try:
+            self._sync(PROGRAM_VAR_LOOP, 'program.varDecls')
+            while self._la() == 'var':
+                var_decl = self.parse_var_decl()
+                if var_decl is not None:
+                    variable_declarations.append(var_decl)
+                    self._resolve(self._register_variable, var_decl)
+                self._match(';', PROGRAM_VAR_LOOP, 'program.varDecl;')
+                self._sync_loop_back(PROGRAM_VAR_LOOP)
+
+            self._sync(PROGRAM_GRAPH_LOOP, 'program.graphDecls')
+            while self._la() in GRAPH_DIRECTIONS:
+                graph_decl = self.parse_graph_decl()
+                if graph_decl is not None:
+                    graph_declarations.append(graph_decl)
+                    self._resolve(self._build_concrete_graph, graph_decl)
+                self._match(';', PROGRAM_GRAPH_LOOP, 'program.graphDecl;')
+                self._sync_loop_back(PROGRAM_GRAPH_LOOP)
+
+            self._sync(PROGRAM_COMMAND_LOOP, 'program.commands')
+            while self._la() == 'run':
+                command = self.parse_command()
+                if command is not None:
+                    commands.append(command)
+                self._match(';', PROGRAM_COMMAND_LOOP, 'program.command;')
+                self._sync_loop_back(PROGRAM_COMMAND_LOOP)
+
+            self._match_set({EOF}, RULE_END, 'program.EOF')
+        except _RecognitionError as error:
+            self._recover(error)
+        self._error_nodes.clear()
+
+        return Program(variable_declarations, graph_declarations, commands)
+
+    def parse_var_decl(self, follow=SEMICOLON):
+        """varDecl: 'var' varType ID '=' varValue"""
+        self._follow.append(follow)
+        var_type = name = value = None
+        try:
+            self._match('var', VAR_TYPES, 'varDecl.var')
+            var_type = self.parse_var_type(ID_SET)
+            name = self._match('ID', {'='}, 'varDecl.ID')[TEXT]
+            self._match('=', VAR_VALUE_START, 'varDecl.=')
+            value = self.parse_var_value(RULE_END)
+        except _RecognitionError as error:
+            self._recover(error)
+        self._exit_rule()
+        if var_type is None or value is None:
+            return None
+        return self.factory.create_var_decl(var_type, name, value)
+
+    def parse_var_type(self, follow):
+        """varType: 'node' | 'edge' | 'attributes'"""
+        self._follow.append(follow)
+        token = None
+        try:
+            token = self._match_set(VAR_TYPES, RULE_END, 'varType')
+        except _RecognitionError as error:
+            self._recover(error)
+        # ASTBuilder reads the text of the whole rule, a type only when nothing was skipped
+        if self._exit_rule() or token is None:
+            return None
+        return token[TEXT]
+
+    def parse_var_value(self, follow):
+        """varValue: nodeVarRef | edgeVarRef | attrVarRef | nodeList | edgeList | attrList"""
+        self._follow.append(follow)
+        value = None
+        try:
+            self._sync(VAR_VALUE_START, 'varValue')
+            la = self._la()
+            if la == '$':
+                if self._la(2) != 'ID':
+                    raise self._no_viable_alternative(self.pos, self.pos + 1, 'varValue')
+                # The three variable reference alternatives are ambiguous; ANTLR picks the first
+                value = self.parse_var_ref(RULE_END, NodeVarRef)
+            elif la == '[':
+                value = self.parse_attr_list(RULE_END)
+            elif la == 'ID':
+                if self._la(2) in EDGE_OPS:
+                    value = self.parse_edge_list(RULE_END)
+                else:
+                    value = self.parse_node_list(RULE_END)
+            else:
+                raise self._no_viable_alternative(self.pos, self.pos, 'varValue')
+        except _RecognitionError as error:
+            self._recover(error)
+        self._exit_rule()
+        return value
+
+    def parse_var_ref(self, follow, ref_class):
+        """nodeVarRef | edgeVarRef | attrVarRef: '$' ID"""
+        self._follow.append(follow)
+        dollar_state, id_state = VAR_REF_STATES[ref_class]
+        name = None
+        try:
+            self._match('$', ID_SET, dollar_state)
+            name = self._match('ID', RULE_END, id_state)[TEXT]
+        except _RecognitionError as error:
+            self._recover(error)
+        skipped = self._exit_rule()
+        if name is None:
+            name = _first_id(skipped)
+        return ref_class(name) if name is not None else None
+
+    def parse_graph_decl(self, follow=SEMICOLON):
+        """graphDecl: ('directed' | 'undirected') 'graph' ID '{' (globalAttrDecl ';')* (statement ';')* '}'"""
+        self._follow.append(follow)
+        direction = name_token = None
+        skipped_before_name = 0
+        global_attributes = []
+        statements = []
+        arena = self.arena
+        add_statement = statements.append if arena is None else arena.append
+        first_statement = 0 if arena is None else len(arena)
+
+        try:
+            direction = self._match_set(GRAPH_DIRECTIONS, {'graph'}, 'graphDecl.direction')[TEXT]
+            self._match('graph', ID_SET, 'graphDecl.graph')
+            skipped_before_name = len(self._skipped_in_rule())
+            name_token = self._match('ID', {'{'}, 'graphDecl.ID')
+            self._match('{', GLOBAL_ATTR_LOOP, 'graphDecl.{')
+
+            self._sync(GLOBAL_ATTR_LOOP, 'graphDecl.globalAttrDecls')
+            while self._la() in GLOBAL_ATTR_TYPES:
+                global_attr = self.parse_global_attr_decl()
+                if global_attr is not None:
+                    global_attributes.append(global_attr)
+                self._match(';', GLOBAL_ATTR_LOOP, 'graphDecl.globalAttrDecl;')
+                self._sync_loop_back(GLOBAL_ATTR_LOOP_BACK)
+
+            self._sync(STATEMENT_LOOP, 'graphDecl.statements')
+            while self._la() in ('$', 'ID'):
+                statement = self.parse_statement()
+                if statement is not None:
+                    add_statement(statement)
+                self._match(';', STATEMENT_LOOP, 'graphDecl.statement;')
+                self._sync_loop_back(STATEMENT_LOOP_BACK)
+
+            self._match('}', RULE_END, 'graphDecl.}')
+        except _RecognitionError as error:
+            self._recover(error)
+        skipped = self._exit_rule()
+        if name_token is not None:
+            skipped = [*skipped[:skipped_before_name], name_token, *skipped[skipped_before_name:]]
+        # The name is the first ID of the rule, which may be a token skipped before it
+        name = _first_id(skipped)
+        if name is None:
+            return None
+
+        if arena is not None:
+            statements = ArenaStatements(arena, first_statement, len(arena))
+        return self.factory.create_graph_decl(direction, name, global_attributes, statements)
+
+    def parse_global_attr_decl(self, follow=SEMICOLON):
+        """globalAttrDecl: ('graph' | 'node' | 'edge') (attrList | attrVarRef)"""
+        self._follow.append(follow)
+        attr_type = attributes = None
+        try:
+            attr_type = GLOBAL_ATTR_TYPES[
+                self._match_set(GLOBAL_ATTR_TYPES, ATTRIBUTES_START, 'globalAttrDecl.type')[TEXT]]
+            self._sync(ATTRIBUTES_START, 'globalAttrDecl')
+            la = self._la()
+            if la == '[':
+                attributes = self.parse_attr_list(RULE_END)
+            elif la == '$':
+                attributes = self.parse_var_ref(RULE_END, AttrVarRef)
+            else:
+                raise self._no_viable_alternative(self.pos, self.pos, 'globalAttrDecl')
+        except _RecognitionError as error:
+            self._recover(error)
+        self._exit_rule()
+        if attributes is None:
+            return None
+        return GlobalAttrDecl(attr_type, attributes)
+
+    def parse_statement(self, follow=SEMICOLON):
+        """statement: nodeDecl | edgeDecl"""
+        self._follow.append(follow)
+        if self._la() == 'ID' and self._la(2) in EDGE_OPS:
+            statement = self.parse_edge_decl(RULE_END)
+        else:
+            statement = self.parse_node_decl(RULE_END)
+        self._exit_rule()
+        return statement
+
+    def parse_node_decl(self, follow):
+        """nodeDecl: (nodeList | nodeVarRef) (attrList | attrVarRef)?"""
+        self._follow.append(follow)
+        if self._la() == '$':
+            nodes = self.parse_var_ref(OPTIONAL_ATTRIBUTES, NodeVarRef)
+        else:
+            nodes = self.parse_node_list(OPTIONAL_ATTRIBUTES)
+        attributes = None
+        la = self._la()
+        if la == '[':
+            attributes = self.parse_attr_list(RULE_END)
+        elif la == '$':
+            attributes = self.parse_var_ref(RULE_END, AttrVarRef)
+            if attributes is None:
+                nodes = None
+        self._exit_rule()
+        if nodes is None:
+            return None
+        return NodeDecl(nodes, attributes)
+
+    def parse_edge_decl(self, follow):
+        """edgeDecl: ID edgeOp ID (attrList | attrVarRef)?"""
+        self._follow.append(follow)
+        source = operator = target = attributes = None
+        complete = True
+        try:
+            source = self._match('ID', EDGE_OPS, 'edgeDecl.source')
+            operator = self.parse_edge_op(ID_SET)
+            target = self._match('ID', OPTIONAL_ATTRIBUTES, 'edgeDecl.target')
+            la = self._la()
+            if la == '[':
+                attributes = self.parse_attr_list(RULE_END)
+            elif la == '$':
+                attributes = self.parse_var_ref(RULE_END, AttrVarRef)
+                complete = attributes is not None
+        except _RecognitionError as error:
+            self._recover(error)
+        skipped = self._exit_rule()
+        if skipped:
+            # Endpoints are the first two IDs of the rule, skipped ones included
+            endpoints = [token for token in (source, target) if token is not None]
+            endpoints.extend(token for token in skipped if token[TYPE] == 'ID')
+            source, target = endpoints[:2] if len(endpoints) >= 2 else (None, None)
+        if operator is None or source is None or target is None or not complete:
+            return None
+        return self.factory.create_edge_decl(source[TEXT], operator, target[TEXT], attributes)
+
+    def parse_edge_op(self, follow):
+        """edgeOp: '--' | '->' | '<-'"""
+        self._follow.append(follow)
+        token = None
+        try:
+            token = self._match_set(EDGE_OPS, RULE_END, 'edgeOp')
+        except _RecognitionError as error:
+            self._recover(error)
+        if self._exit_rule() or token is None:
+            return None
+        return token[TEXT]
+
+    def parse_node_list(self, follow) -> NodeList:
+        """nodeList: ID (',' ID)*"""
+        self._follow.append(follow)
+        name = self.factory.name
+        nodes = []
+        try:
+            nodes.append(name(self._match('ID', LIST_LOOP, 'nodeList.ID')[TEXT]))
+            while self._la() == ',':
+                self._match(',', ID_SET, 'nodeList.,')
+                nodes.append(name(self._match('ID', LIST_LOOP, 'nodeList.nextID')[TEXT]))
+        except _RecognitionError as error:
+            self._recover(error)
+        nodes.extend(name(token[TEXT]) for token in self._exit_rule() if token[TYPE] == 'ID')
+        return NodeList(nodes)
+
+    def parse_edge_list(self, follow) -> EdgeList:
+        """edgeList: edgeDecl (',' edgeDecl)*"""
+        self._follow.append(follow)
+        edges = [self.parse_edge_decl(LIST_LOOP)]
+        while self._la() == ',':
+            self._match(',', ID_SET, 'edgeList.,')
+            edges.append(self.parse_edge_decl(LIST_LOOP))
+        self._exit_rule()
+        return EdgeList([edge for edge in edges if edge is not None])
+
+    def parse_attr_list(self, follow) -> AttrList:
+        """attrList: '[' (attribute (',' attribute)* ','?)? ']'"""
+        self._follow.append(follow)
+        attributes = []
+        try:
+            self._match('[', ATTR_LIST_BODY, 'attrList.[')
+            self._sync(ATTR_LIST_BODY, 'attrList.body')
+            if self._la() == 'ID':
+                attribute = self.parse_attribute(ATTRIBUTE_LOOP)
+                if attribute is not None:
+                    attributes.append(attribute)
+                self._sync(ATTRIBUTE_LOOP, 'attrList.loop')
+                state = 'attrList.loop'
+                while self._more_attributes(state):
+                    self._match(',', ID_SET, 'attrList.,')
+                    attribute = self.parse_attribute(ATTRIBUTE_LOOP)
+                    if attribute is not None:
+                        attributes.append(attribute)
+                    state = 'attrList.loopBack'
+                    self._sync_loop_back(ATTRIBUTE_LOOP_BACK)
+                if self._la() == ',':
+                    self._match(',', {']'}, 'attrList.trailing,')
+            self._match(']', RULE_END, 'attrList.]')
+        except _RecognitionError as error:
+            self._recover(error)
+        self._exit_rule()
+        return AttrList(attributes)
+
+    def _more_attributes(self, state: str) -> bool:
+        """Decide between another ', attribute' and the end of an attribute list."""
+        la = self._la()
+        if la == ',':
+            la2 = self._la(2)
+            if la2 == 'ID':
+                return True
+            if la2 == ']':
+                return False
+            raise self._no_viable_alternative(self.pos, self.pos + 1, state)
+        if la == ']':
+            return False
+        raise self._no_viable_alternative(self.pos, self.pos, state)
+
+    def parse_attribute(self, follow):
+        """attribute: ID ('=' | ':') value"""
+        self._follow.append(follow)
+        key = operator = value = None
+        try:
+            key = self._match('ID', OPERATORS, 'attribute.ID')[TEXT]
+            operator = self._match_set(OPERATORS, VALUE_TOKENS, 'attribute.operator')
+            if self._error_nodes and self._skipped_in_rule():
+                # ASTBuilder reads the operator from the second child, here a skipped token
+                operator = None
+            value = self.parse_value(RULE_END)
+        except _RecognitionError as error:
+            self._recover(error)
+        self._exit_rule()
+        if value is None:
+            return None
+        return self.factory.create_attribute(key, operator[TEXT] if operator is not None else ':', value)
+
+    def parse_value(self, follow):
+        """value: ID | NUMBER | STRING"""
+        self._follow.append(follow)
+        token = None
+        try:
+            token = self._match_set(VALUE_TOKENS, RULE_END, 'value')
+        except _RecognitionError as error:
+            self._recover(error)
+        skipped = self._exit_rule()
+        if skipped:
+            # ASTBuilder takes the first ID, else NUMBER, else STRING child of the rule
+            children = [token, *skipped] if token is not None else skipped
+            token = None
+            for value_type in ('ID', 'NUMBER', 'STRING'):
+                token = next((child for child in children if child[TYPE] == value_type), None)
+                if token is not None:
+                    break
+        if token is None:
+            return None
+        token_type = token[TYPE]
+        if token_type == 'NUMBER':
+            return self.factory.create_value(int(token[TEXT]), "NUMBER")
+        if token_type == 'STRING':
+            # Remove surrounding quotes
+            return self.factory.create_value(token[TEXT][1:-1], "STRING")
+        return self.factory.create_value(token[TEXT], "ID")
+
+    def parse_command(self, follow=SEMICOLON):
+        """command: 'run' ID 'with' '(' argList? ')'"""
+        self._follow.append(follow)
+        graph_name = None
+        arguments = []
+        try:
+            self._match('run', ID_SET, 'command.run')
+            graph_name = self._match('ID', {'with'}, 'command.ID')[TEXT]
+            self._match('with', {'('}, 'command.with')
+            self._match('(', ARG_LIST_START, 'command.(')
+            self._sync(ARG_LIST_START, 'command.argList')
+            if self._la() == 'ID':
+                arguments = self.parse_arg_list({')'})
+            self._match(')', RULE_END, 'command.)')
+        except _RecognitionError as error:
+            self._recover(error)
+        skipped = self._exit_rule()
+        if graph_name is None:
+            graph_name = _first_id(skipped)
+            if graph_name is None:
+                return None
+        return Command(graph_name, arguments)
+
+    def parse_arg_list(self, follow) -> list:
+        """argList: argument (',' argument)*"""
+        self._follow.append(follow)
+        arguments = [self.parse_argument(LIST_LOOP)]
+        while self._la() == ',':
+            self._match(',', ID_SET, 'argList.,')
+            arguments.append(self.parse_argument(LIST_LOOP))
+        self._exit_rule()
+        return [argument for argument in arguments if argument is not None]
+
+    def parse_argument(self, follow):
+        """argument: ID ('=' | ':') (path | value)"""
+        self._follow.append(follow)
+        name = operator = argument_value = None
+        try:
+            name = self._match('ID', OPERATORS, 'argument.ID')[TEXT]
+            operator = self._match_set(OPERATORS, VALUE_TOKENS, 'argument.operator')
+            if self._error_nodes and self._skipped_in_rule():
+                # ASTBuilder reads the operator from the second child, here another token
+                operator = None
+            self._sync(VALUE_TOKENS, 'argument.value')
+            la = self._la()
+            if la == 'ID':
+                # A bare ID is ambiguous between path and value; ANTLR looks one token
+                # further and picks path
+                self._la(2)
+                argument_value = self.parse_path(RULE_END)
+            elif la == 'NUMBER' or la == 'STRING':
+                argument_value = self.parse_value(RULE_END)
+            else:
+                raise self._no_viable_alternative(self.pos, self.pos, 'argument.value')
+        except _RecognitionError as error:
+            self._recover(error)
+        self._exit_rule()
+        if argument_value is None:
+            return None
+        operator = AttributeOperator.EQUALS if operator is not None and operator[TEXT] == '=' \
+            else AttributeOperator.COLON
+        return Argument(name, operator, argument_value)
+
+    def parse_path(self, follow) -> Path:
+        """path: ID ('.' ID)*"""
+        self._follow.append(follow)
+        components = []
+        try:
+            components.append(self._match('ID', PATH_LOOP, 'path.ID')[TEXT])
+            while self._la() == '.':
+                self._match('.', ID_SET, 'path..')
+                components.append(self._match('ID', PATH_LOOP, 'path.nextID')[TEXT])
+        except _RecognitionError as error:
+            self._recover(error)
+        components.extend(token[TEXT] for token in self._exit_rule() if token[TYPE] == 'ID')
+        return Path(components)
+
+
+def parse_graphgif_fast(input_text: str, error_listener: GraphGifErrorListener = None) -> tuple:
+    """Parse Graphgif source code with the fast backend and return AST and graph model."""
+    parser = FastParser(input_text, error_listener)
+    return parser.parse()
@@ -0,0 +1,99 @@
+"""
+Parsing entry points for GraphGif.
+The ANTLR runtime and generated parser are only imported when the ANTLR backend is used,
+so parsing with the fast backend, or importing this package, stays cheap.
+"""
+
+from typing import Optional
+
+from errors import GraphGifErrorListener
+
+
+class ParseResult(tuple):
+    """
+    (program, graph_model) pair returned by parse_graphgif.
+    Unpacks like the plain tuple it replaces and carries parse metadata as attributes.
+    """
+
+    def __new__(cls, program, graph_model, prediction_mode: Optional[str] = "LL", errors=None,
+                backend: str = "antlr"):
+        result = super().__new__(cls, (program, graph_model))
+        result.prediction_mode = prediction_mode
+        result.errors = errors if errors is not None else []
+        result.backend = backend
+        return result
+
+    @property
+    def program(self):
+        return self[0]
+
+    @property
+    def graph_model(self):
+        return self[1]
+
+
+def parse_graphgif(input_text: str, two_stage: bool = False, backend: str = "antlr",
+                   storage: str = "dict", source_name: str = "input",
+                   print_errors: bool = True, ast: str = "objects") -> ParseResult:
+    """
+    Parse Graphgif source code and return AST and graph model.
+    backend selects the ANTLR parser ("antlr") or the hand-written one ("fast");
+    two_stage only applies to the ANTLR backend. storage selects the graph storage
+    engine ("dict" for ConcreteGraph, "compact" for the array-backed CompactGraph).
+    Syntax errors are printed unless print_errors is False; they are always returned
+    in the result's errors. ast selects the representation of graph statements ("objects"
+    for NodeDecl and EdgeDecl lists, "arena" for the array-backed models.arena.ASTArena).
+    The fast backend stores each statement in the arena as soon as it is parsed; the ANTLR
+    backend converts the finished program, so only the memory it retains afterwards is reduced.
+    """
+    if ast not in ("objects", "arena"):
+        raise ValueError(f"Unknown AST representation: {ast}")
+    error_listener = GraphGifErrorListener(source_name) # added error listener
+
+    resolve_error = None
+    if backend == "fast":
+        from .fast_parser import FastParser
+        arena = None
+        if ast == "arena":
+            from models.arena import ASTArena
+            arena = ASTArena()
+        try:
+            program, graph_model = FastParser(input_text, error_listener, storage, arena).parse()
+        except ValueError as e:
+            # Raised after parsing, so syntax errors are printed first as with ANTLR
+            resolve_error = e
+        prediction_mode = None
+    elif backend == "antlr":
+        from .ast_builder import build_parse_tree
+        tree, prediction_mode = build_parse_tree(input_text, error_listener, two_stage)
+    else:
+        raise ValueError(f"Unknown parser backend: {backend}")
+
+    # Check for errors
+    if print_errors and error_listener.has_errors():
+        error_listener.print_errors()
+    if resolve_error is not None:
+        raise resolve_error
+
+    if backend == "antlr":
+        from antlr4 import ParseTreeWalker
+        from .ast_builder import ASTBuilder
+        ast_builder = ASTBuilder(storage)
+        walker = ParseTreeWalker()
+        walker.walk(ast_builder, tree)
+        program, graph_model = ast_builder.program, ast_builder.get_graph_model()
+
+    if ast == "arena" and backend == "antlr" and program is not None:
+        from models.arena import to_arena
+        program = to_arena(program)
+
+    return ParseResult(program, graph_model, prediction_mode, error_listener.get_errors(), backend)
+
+
+def parse_graphgif_file(file_path: str, two_stage: bool = False, backend: str = "antlr",
+                        storage: str = "dict", print_errors: bool = True, ast: str = "objects") -> ParseResult:
+    """Parse Graphgif file and return AST and graph model."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    return parse_graphgif(content, two_stage=two_stage, backend=backend, storage=storage,
+                          source_name=file_path, print_errors=print_errors, ast=ast)
@@ -0,0 +1,109 @@
+"""
+Graph model construction shared by the parsing backends.
+This module resolves AST declarations into the concrete GraphModel without depending on ANTLR.
+"""
+
+from models import *
+from models.graph_model import GraphModel, ConcreteGraph
+from models.compact_graph import CompactGraph
+
+# Graph storage engines selectable through the storage argument
+STORAGE_ENGINES = {
+    'dict': ConcreteGraph,
+    'compact': CompactGraph,
+}
+
+
+class GraphModelBuilder:
+    """Resolves variable and graph declarations into a GraphModel."""
+
+    def __init__(self, storage: str = 'dict'):
+        if storage not in STORAGE_ENGINES:
+            raise ValueError(f"Unknown graph storage engine: {storage}")
+        self.graph_model = GraphModel()
+        self.current_graph = None
+        self.graph_class = STORAGE_ENGINES[storage]
+
+    def _register_variable(self, var_decl: VarDecl):
+        """Add a variable declaration to the model's symbol table."""
+        self.graph_model.add_variable(var_decl.name, var_decl.var_type.value, var_decl.value)
+
+    def _build_concrete_graph(self, graph_decl: GraphDecl) -> ConcreteGraph:
+        """Create the concrete graph for a graph declaration and add it to the model."""
+        self.current_graph = self.graph_class(graph_decl.name, graph_decl.direction == GraphDirection.DIRECTED)
+
+        self._process_global_attributes(graph_decl.global_attributes)
+        self._process_statements(graph_decl.statements)
+        self.graph_model.add_graph(self.current_graph)
+        return self.current_graph
+
+    def _process_global_attributes(self, global_attributes):
+        """Process global attributes and apply them to the current concrete graph."""
+        for global_attr in global_attributes:
+            attr_dict = self._resolve_attributes(global_attr.attributes)
+
+            if global_attr.attr_type == GlobalAttrType.GRAPH:
+                self.current_graph.global_graph_attributes.update(attr_dict)
+            elif global_attr.attr_type == GlobalAttrType.NODE:
+                self.current_graph.global_node_attributes.update(attr_dict)
+            elif global_attr.attr_type == GlobalAttrType.EDGE:
+                self.current_graph.global_edge_attributes.update(attr_dict)
+
+    def _process_statements(self, statements):
+        """Process statements and build concrete graph elements."""
+        for statement in statements:
+            if isinstance(statement, NodeDecl):
+                self._process_node_declaration(statement)
+            elif isinstance(statement, EdgeDecl):
+                self._process_edge_declaration(statement)
+
+    def _process_node_declaration(self, node_decl):
+        """Process a node declaration and add nodes to concrete graph."""
+        node_ids = self._resolve_nodes(node_decl.nodes)
+        attributes = self._resolve_attributes(node_decl.attributes) if node_decl.attributes else {}
+        for node_id in node_ids:
+            self.current_graph._add_node(node_id, attributes)
+
+    def _process_edge_declaration(self, edge_decl):
+        """Process an edge declaration and add edge to concrete graph."""
+        attributes = self._resolve_attributes(edge_decl.attributes) if edge_decl.attributes else {}
+        self.current_graph._add_edge(edge_decl.source, edge_decl.target, attributes)
+
+    def _resolve_nodes(self, nodes_expr):
+        """Resolve nodes expression (NodeList or NodeVarRef) to list of node IDs."""
+        if isinstance(nodes_expr, NodeList):
+            return nodes_expr.nodes
+        elif isinstance(nodes_expr, NodeVarRef):
+            var_value = self.graph_model.get_variable(nodes_expr.name)
+            if isinstance(var_value, NodeList):
+                return var_value.nodes
+            else:
+                raise ValueError(f"Variable '{nodes_expr.name}' is not a node list")
+        else:
+            raise ValueError(f"Unknown nodes expression type: {type(nodes_expr)}")
+
+    def _resolve_attributes(self, attr_expr):
+        """Resolve attributes expression (AttrList or AttrVarRef) to dictionary."""
+        if attr_expr is None:
+            return {}
+        elif isinstance(attr_expr, AttrList):
+            result = {}
+            for attr in attr_expr.attributes:
+                result[attr.key] = attr.value.value if hasattr(attr.value, 'value') else attr.value
+            return result
+        elif isinstance(attr_expr, AttrVarRef):
+            # Resolve variable reference
+            var_value = self.graph_model.get_variable(attr_expr.name)
+            if isinstance(var_value, AttrList):
+                result = {}
+                for attr in var_value.attributes:
+                    result[attr.key] = attr.value.value if hasattr(attr.value, 'value') else attr.value
+                return result
+            else:
+                raise ValueError(f"Variable '{attr_expr.name}' is not an attribute list")
+        else:
+            raise ValueError(f"Unknown attributes expression type: {type(attr_expr)}")
+
+    def get_graph_model(self):
+        """Get the concrete graph model."""
+        return self.graph_model
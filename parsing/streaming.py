@@ -0,0 +1,211 @@
+"""
+Streaming ingestion of GraphGif files.
+This module reads a .gg file in chunks and resolves node and edge statements into the
+concrete graph model as soon as each statement is complete. Tokens and AST nodes are
+dropped once resolved, so memory is bounded by the graph model rather than the source size.
+"""
+
+from dataclasses import dataclass
+from typing import Iterator, Optional, Union
+
+from errors import GraphGifErrorListener
+from models import *
+from models.graph_model import GraphModel, GraphNode, GraphEdge
+from .fast_parser import (
+    FastParser, Tokenizer, _RecognitionError, _first_id, EOF, TEXT,
+    RULE_END, SEMICOLON, ID_SET, GRAPH_DIRECTIONS, GLOBAL_ATTR_TYPES,
+    PROGRAM_VAR_LOOP, PROGRAM_GRAPH_LOOP, PROGRAM_COMMAND_LOOP, GLOBAL_ATTR_LOOP, STATEMENT_LOOP,
+    GLOBAL_ATTR_LOOP_BACK, STATEMENT_LOOP_BACK
+)
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+# Consumed tokens are dropped from the buffer once this many have accumulated
+TOKEN_TRIM_THRESHOLD = 4096
+
+
+@dataclass
+class GraphEvent:
+    """A node or edge resolved into a concrete graph while streaming."""
+    graph_name: str
+    element: Union[GraphNode, GraphEdge]
+
+
+class StreamingParser(FastParser):
+    """FastParser that reads its input file in chunks and resolves statements as they complete."""
+
+    def __init__(self, file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 graph_model: Optional[GraphModel] = None,
+                 error_listener: GraphGifErrorListener = None,
+                 retain_edges: bool = True, storage: str = 'dict'):
+        self._init_state(error_listener, storage)
+        # Interning would keep every value and attribute of the file alive
+        self.factory = ASTFactory()
+        if graph_model is not None:
+            self.graph_model = graph_model
+        self.file_path = file_path
+        self.chunk_size = chunk_size
+        self.retain_edges = retain_edges
+        self.commands = []
+        self._tokenizer = Tokenizer(self._report_lexer_error)
+        self._file = None
+        self._exhausted = False
+
+    # Token buffering
+
+    def _read_more(self) -> bool:
+        """Tokenize the next chunk of the file; returns False once EOF has been buffered."""
+        if self._exhausted:
+            return False
+        chunk = self._file.read(self.chunk_size)
+        if chunk:
+            self.tokens.extend(self._tokenizer.feed(chunk))
+        else:
+            self.tokens.extend(self._tokenizer.feed("", final=True))
+            self._exhausted = True
+        return True
+
+    def _fetch(self, index: int) -> bool:
+        while index >= len(self.tokens):
+            if not self._read_more():
+                self._fetched = len(self.tokens)
+                return False
+        self._fetched = len(self.tokens)
+        return True
+
+    def _discard_consumed(self):
+        """Drop tokens that have already been parsed."""
+        if self.pos >= TOKEN_TRIM_THRESHOLD:
+            del self.tokens[:self.pos]
+            if self._last_error_index >= 0:
+                self._last_error_index -= self.pos
+            self._fetched -= self.pos
+            self.pos = 0
+
+    def _context_line(self, line: int) -> str:
+        # The source is not kept in memory; re-read the line for the error report
+        with open(self.file_path, 'r', encoding='utf-8') as f:
+            for number, text in enumerate(f, 1):
+                if number == line:
+                    return text.rstrip('\n')
+        return ""
+
+    # Streaming grammar rules
+
+    def events(self) -> Iterator[GraphEvent]:
+        """Parse the file, yielding an event for every node and edge as it is resolved."""
+        with open(self.file_path, 'r', encoding='utf-8') as self._file:
+            self._fetch(0)
+            try:
+                self._sync(PROGRAM_VAR_LOOP, 'program.varDecls')
+                while self._la() == 'var':
+                    var_decl = self.parse_var_decl()
+                    if var_decl is not None:
+                        self._register_variable(var_decl)
+                    self._match(';', PROGRAM_VAR_LOOP, 'program.varDecl;')
+                    self._sync_loop_back(PROGRAM_VAR_LOOP)
+
+                self._sync(PROGRAM_GRAPH_LOOP, 'program.graphDecls')
+                while self._la() in GRAPH_DIRECTIONS:
+                    yield from self._stream_graph_decl()
+                    self._match(';', PROGRAM_GRAPH_LOOP, 'program.graphDecl;')
+                    self._sync_loop_back(PROGRAM_GRAPH_LOOP)
+
+                self._sync(PROGRAM_COMMAND_LOOP, 'program.commands')
+                while self._la() == 'run':
+                    command = self.parse_command()
+                    if command is not None:
+                        self.commands.append(command)
+                    self._match(';', PROGRAM_COMMAND_LOOP, 'program.command;')
+                    self._sync_loop_back(PROGRAM_COMMAND_LOOP)
+
+                self._match_set({EOF}, RULE_END, 'program.EOF')
+            except _RecognitionError as error:
+                self._recover(error)
+            self._error_nodes.clear()
+
+    def _stream_graph_decl(self) -> Iterator[GraphEvent]:
+        """graphDecl, resolving each statement into the concrete graph as soon as it is parsed."""
+        self._follow.append(SEMICOLON)
+        try:
+            direction = self._match_set(GRAPH_DIRECTIONS, {'graph'}, 'graphDecl.direction')[TEXT]
+            self._match('graph', ID_SET, 'graphDecl.graph')
+            skipped = self._skipped_in_rule()
+            name = _first_id([*skipped, self._match('ID', {'{'}, 'graphDecl.ID')])
+
+            self.current_graph = self.graph_class(name, direction == 'directed')
+            self.graph_model.add_graph(self.current_graph)
+
+            self._match('{', GLOBAL_ATTR_LOOP, 'graphDecl.{')
+
+            self._sync(GLOBAL_ATTR_LOOP, 'graphDecl.globalAttrDecls')
+            while self._la() in GLOBAL_ATTR_TYPES:
+                global_attr = self.parse_global_attr_decl()
+                if global_attr is not None:
+                    self._process_global_attributes([global_attr])
+                self._match(';', GLOBAL_ATTR_LOOP, 'graphDecl.globalAttrDecl;')
+                self._sync_loop_back(GLOBAL_ATTR_LOOP_BACK)
+
+            self._sync(STATEMENT_LOOP, 'graphDecl.statements')
+            while self._la() in ('$', 'ID'):
+                statement = self.parse_statement()
+                if statement is not None:
+                    yield from self._resolve_statement(statement)
+                self._match(';', STATEMENT_LOOP, 'graphDecl.statement;')
+                self._sync_loop_back(STATEMENT_LOOP_BACK)
+                self._discard_consumed()
+
+            self._match('}', RULE_END, 'graphDecl.}')
+        except _RecognitionError as error:
+            self._recover(error)
+        self._exit_rule()
+
+    def _resolve_statement(self, statement) -> Iterator[GraphEvent]:
+        """Add a parsed statement to the current graph and yield the affected elements."""
+        graph = self.current_graph
+        if isinstance(statement, NodeDecl):
+            node_ids = self._resolve_nodes(statement.nodes)
+            attributes = self._resolve_attributes(statement.attributes) if statement.attributes else {}
+            for node_id in node_ids:
+                yield GraphEvent(graph.name, graph._add_node(node_id, attributes))
+            return
+
+        attributes = self._resolve_attributes(statement.attributes) if statement.attributes else {}
+        new_nodes = [node_id for node_id in dict.fromkeys((statement.source, statement.target))
+                     if node_id not in graph.nodes]
+        if self.retain_edges:
+            edge = graph._add_edge(statement.source, statement.target, attributes)
+        else:
+            graph._add_node(statement.source)
+            graph._add_node(statement.target)
+            edge = graph._resolve_edge(statement.source, statement.target, attributes)
+        for node_id in new_nodes:
+            yield GraphEvent(graph.name, graph.nodes[node_id])
+        yield GraphEvent(graph.name, edge)
+
+
+def iter_graph_events(file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                      graph_model: Optional[GraphModel] = None,
+                      error_listener: GraphGifErrorListener = None,
+                      retain_edges: bool = True, storage: str = 'dict') -> Iterator[GraphEvent]:
+    """
+    Stream a Graphgif file, yielding a GraphEvent for every resolved node and edge.
+    Elements are added to graph_model (a fresh GraphModel when omitted); with retain_edges
+    disabled edges are only yielded, so memory stays proportional to the number of nodes.
+    storage selects the graph storage engine, as for parse_graphgif.
+    """
+    parser = StreamingParser(file_path, chunk_size, graph_model, error_listener, retain_edges, storage)
+    yield from parser.events()
+
+    # Check for errors
+    if parser.error_listener.has_errors():
+        parser.error_listener.print_errors()
+
+
+def load_graph_model(file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                     error_listener: GraphGifErrorListener = None, storage: str = 'dict') -> GraphModel:
+    """Stream a Graphgif file into a GraphModel without building its parse tree or AST."""
+    graph_model = GraphModel()
+    for _ in iter_graph_events(file_path, chunk_size, graph_model, error_listener, storage=storage):
+        pass
+    return graph_model
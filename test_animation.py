@@ -0,0 +1,257 @@
+import contextlib
+import io
+import json
+
+import pytest
+
+import animation.export
+from animation import (
+    command_arguments, traverse_command, frames_from_traversal, export_dot_sequence, export_gif,
+    rasterize_frames, FrameDelta, FrameState, TraversalStyle
+)
+from animation.cache import RenderCache
+from animation.compositor import SvgCompositor
+from animation.layout import Layout, compute_layout
+from animation.runner import build_frame_log
+from errors import RuntimeError as GraphgifRuntimeError
+from parsing import parse_graphgif
+
+SOURCE = """
+undirected graph G {
+    A -- B;
+    A -- C;
+    B -- D;
+    C -- D;
+    D -- E;
+};
+run G with (algorithm=bfs, start=B, output='g.gif');
+run G with (algorithm=dfs);
+run G with (start=X);
+"""
+
+
+def _parse(source):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return parse_graphgif(source, backend="fast")
+
+
+def _names(log, nodes):
+    return [log.graph.node_ids[i] for i in nodes.tolist()]
+
+
+def test_command_arguments():
+    program, _ = _parse(SOURCE)
+
+    assert command_arguments(program.commands[0]) == {'algorithm': 'bfs', 'start': 'B', 'output': 'g.gif'}
+
+
+def test_bfs_frame_log():
+    program, graph_model = _parse(SOURCE)
+    log = traverse_command(graph_model, program.commands[0])
+
+    assert [_names(log, step.frontier) for step in log.steps()] == [['B'], ['D', 'A'], ['E', 'C']]
+    assert _names(log, log.visited(1)) == ['B', 'D', 'A']
+    assert log.tree_edges(2).tolist() == [2, 0, 4, 3]
+
+
+def test_dfs_frame_log():
+    program, graph_model = _parse(SOURCE)
+    snapshots = {}
+    log = traverse_command(graph_model, program.commands[1], snapshots)
+
+    assert log.step_count == 5
+    assert _names(log, log.order) == ['A', 'B', 'D', 'E', 'C']
+    assert log.graph is snapshots['G']
+
+
+def test_unknown_start_node():
+    program, graph_model = _parse(SOURCE)
+
+    with pytest.raises(GraphgifRuntimeError, match="'X'"):
+        traverse_command(graph_model, program.commands[2])
+
+
+def test_frame_log_seeking_matches_replay():
+    program, graph_model = _parse(SOURCE)
+    log = traverse_command(graph_model, program.commands[1])
+    frames = frames_from_traversal(graph_model.get_graph('G'), log, keyframe_interval=2)
+
+    assert len(frames) == log.step_count + 2
+    assert frames.delta(0) == FrameDelta()
+    replayed = [FrameState(dict(state.nodes), dict(state.edges)) for state in frames.iter_states()]
+    assert [frames.state(i) for i in range(len(frames))] == replayed
+    assert set(replayed[-1].nodes) == {'A', 'B', 'C', 'D', 'E'}
+    assert replayed[-1].nodes['E'] == TraversalStyle().visited
+
+
+def test_export_dot_sequence(tmp_path):
+    program, graph_model = _parse(SOURCE)
+    frames = build_frame_log(graph_model, program.commands[0])
+    paths = export_dot_sequence(frames, str(tmp_path))
+
+    assert len(paths) == len(frames) == 5
+    last = open(paths[-1], encoding='utf-8').read()
+    assert last.startswith('graph "G" {')
+    assert '"B" -- "D" [color="red", penwidth=2];' in last
+    assert '"E" [style="filled", fillcolor="lightblue"];' in last
+
+
+def test_export_gif_streams_frames(tmp_path, monkeypatch):
+    from PIL import Image
+
+    def fake_render(dot_source, engine='dot', image_format='png', timeout=None, neato_no_op=None):
+        buffer = io.BytesIO()
+        Image.new('RGB', (20, 10), 'white' if 'gold' in dot_source else 'black').save(buffer, format='PNG')
+        return buffer.getvalue()
+
+    monkeypatch.setattr(animation.export, 'render_dot', fake_render)
+    program, graph_model = _parse(SOURCE)
+    output = tmp_path / 'g.gif'
+    frames = build_frame_log(graph_model, program.commands[0])
+
+    assert export_gif(frames, str(output)) == len(frames)
+    with Image.open(output) as image:
+        assert image.n_frames == len(frames)
+
+
+def _slow_first_render(dot_source, engine='dot', image_format='png', timeout=None, neato_no_op=None):
+    import time
+    if dot_source == 'frame 0':
+        time.sleep(0.2)
+    return dot_source.encode()
+
+
+def test_rasterize_frames_keeps_order_in_pool():
+    sources = [f"frame {index}" for index in range(8)]
+    images = rasterize_frames(iter(sources), workers=2, max_in_flight=3, render=_slow_first_render)
+    assert list(images) == [source.encode() for source in sources]
+
+
+def test_rasterize_frames_propagates_errors():
+    def failing_render(dot_source, engine='dot', image_format='png', timeout=None, neato_no_op=None):
+        raise GraphgifRuntimeError(f"Graphviz '{engine}' timed out after {timeout} s")
+
+    with pytest.raises(GraphgifRuntimeError):
+        list(rasterize_frames(["graph {}"], timeout=0.5, render=failing_render))
+
+
+def test_short_animations_render_in_process(tmp_path, monkeypatch):
+    import os
+    import animation.rasterize
+    from animation.rasterize import POOL_MIN_FRAMES, default_workers
+    from animation.runner import run_command
+
+    def no_pool(*args, **kwargs):
+        raise AssertionError("a process pool was started")
+
+    monkeypatch.setattr(animation.rasterize, 'ProcessPoolExecutor', no_pool)
+    monkeypatch.setattr(animation.export, 'render_dot', lambda dot_source, *args: b'image')
+    output = tmp_path / 'g.png'
+    program, graph_model = _parse(f"""
+directed graph G {{ A -> B; }};
+run G with (algorithm=bfs, start=A, fixed_layout=false, output='{output.as_posix()}');
+""")
+
+    assert len(run_command(graph_model, program.commands[0])) < POOL_MIN_FRAMES
+    assert default_workers(POOL_MIN_FRAMES - 1) == 1
+    assert default_workers(POOL_MIN_FRAMES) == (os.cpu_count() or 1)
+
+
+def test_fixed_layout_pins_every_frame(tmp_path, monkeypatch):
+    from PIL import Image
+
+    calls = []
+
+    def fake_layout(dot_source, engine='dot', image_format='json0', timeout=None, neato_no_op=None):
+        return json.dumps({
+            'bb': '0,0,100,200',
+            'objects': [{'_gvid': i, 'name': name, 'pos': f"{i * 10},{i * 20}"}
+                        for i, name in enumerate('ABCDE')],
+            'edges': [{'_gvid': i, 'tail': 0, 'head': 1, 'pos': f"{i},0 {i},1 {i},2 {i},3"}
+                      for i in range(5)],
+        }).encode()
+
+    def fake_render(dot_source, engine='dot', image_format='png', timeout=None, neato_no_op=None):
+        calls.append((engine, neato_no_op, dot_source))
+        buffer = io.BytesIO()
+        Image.new('RGB', (20, 10), 'white').save(buffer, format='PNG')
+        return buffer.getvalue()
+
+    program, graph_model = _parse(SOURCE)
+    frames = build_frame_log(graph_model, program.commands[0])
+    layout = compute_layout(frames.graph, render=fake_layout)
+    assert layout.node_attributes('C') == {'pos': '20,40'}
+
+    monkeypatch.setattr(animation.export, 'render_dot', fake_render)
+    export_gif(frames, str(tmp_path / 'g.gif'), layout=layout, composite=False)
+
+    assert len(calls) == len(frames)
+    assert all(engine == 'neato' and neato_no_op == 2 for engine, neato_no_op, _ in calls)
+    assert all('bb="0,0,100,200"' in dot_source and '"B" -- "D" [' in dot_source and 'pos="2,0 2,1 2,2 2,3"'
+               in dot_source for _, _, dot_source in calls)
+
+
+def _base_svg(graph):
+    nodes = ''.join(
+        f'<g id="node{i + 1}" class="node"><title>{node_id}</title>'
+        f'<ellipse fill="none" stroke="black" cx="{i * 10}" cy="0" rx="27" ry="18"/>'
+        f'<text x="{i * 10}" y="0">{node_id}</text></g>'
+        for i, node_id in enumerate(graph.nodes))
+    edges = ''.join(
+        f'<g id="edge{i + 1}" class="edge"><title>{edge.source}&#45;&#45;{edge.target}</title>'
+        f'<path fill="none" stroke="black" d="M0,0C1,1 2,2 3,3"/></g>'
+        for i, edge in enumerate(graph.edges))
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" width="62pt" height="116pt" viewBox="0 0 62 116">'
+            f'<g id="graph0" class="graph">{nodes}{edges}</g></svg>').encode()
+
+
+def test_compositor_patches_style_only_frames(tmp_path, monkeypatch):
+    program, graph_model = _parse(SOURCE)
+    frames = build_frame_log(graph_model, program.commands[0])
+    calls = []
+
+    def fake_render(dot_source, engine='dot', image_format='png', timeout=None, neato_no_op=None):
+        calls.append(image_format)
+        return _base_svg(frames.graph)
+
+    monkeypatch.setattr(animation.export, 'render_dot', fake_render)
+    layout = Layout(None, {}, [])
+    paths = animation.export.export_image_sequence(frames, str(tmp_path / 'g.svg'), layout=layout, workers=1)
+
+    assert calls == ['svg']
+    assert len(paths) == len(frames)
+    last = open(paths[-1], encoding='utf-8').read()
+    assert '<ellipse fill="lightblue" stroke="black"' in last
+    assert '<path fill="none" stroke="red" d="M0,0C1,1 2,2 3,3" stroke-width="2.0"' in last
+    assert 'width="62pt"' in last
+
+
+def test_compositor_falls_back_on_label_change():
+    program, graph_model = _parse(SOURCE)
+    graph = graph_model.get_graph('G')
+    compositor = SvgCompositor(graph, _base_svg(graph), dpi=144)
+
+    assert compositor.composite(FrameState({'A': {'label': 'start'}})) is None
+    svg = compositor.composite(FrameState({'A': {'style': 'filled', 'fillcolor': 'gold'}})).decode()
+    assert 'width="124px"' in svg
+    assert svg.count('fill="gold"') == 1
+
+
+def test_render_cache_hits_and_eviction(tmp_path):
+    cache = RenderCache(str(tmp_path), max_size=600)
+    rendered = []
+
+    def render(source, engine='dot', image_format='png', timeout=None, neato_no_op=None):
+        rendered.append(source)
+        return source.encode() * 20
+
+    sources = ['graph "a" {}\n', 'graph "a" {}  \r\n', 'graph "b" {}\n', 'graph "c" {}\n']
+    images = list(rasterize_frames(sources, render=render, cache=cache, dpi=96))
+
+    assert rendered == [sources[0], sources[2], sources[3]]
+    assert images[0] == images[1]
+    assert (cache.hits, cache.misses) == (1, 3)
+    # The third image exceeded the bound; the least recently used entry went first
+    assert cache.get(cache.key(sources[0], 'dot', 'png', 96)) is None
+    assert cache.get(cache.key(sources[3], 'dot', 'png', 96)) == images[3]
+    assert cache.key(sources[0], 'dot', 'png', 96) != cache.key(sources[0], 'dot', 'png', 300)
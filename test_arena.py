@@ -0,0 +1,170 @@
+import contextlib
+import io
+import os
+import pickle
+
+import pytest
+
+from analysis import analyze_program
+from benchmarks.synthetic import generate_program
+from incremental import parse_declarations
+from models import Attribute, AttributeOperator, AttrList, EdgeDecl, NodeDecl, Value
+from models.arena import ASTArena, ArenaStatements, to_arena
+from models.serialization import dumps, loads
+from parsing import parse_graphgif, parse_graphgif_file
+from parsing.ast_cache import ASTCache
+from validation import analyze_graphs, validate_ast
+from visitors import GraphStatisticsVisitor
+from visitors.ast_to_dot import ast_to_dot
+from visitors.pretty_printer import GraphgifPrettyPrinter
+
+example_dirs = ['./examples', './errors/examples']
+
+SOURCE = """
+var node ring = A, B;
+var attributes hot = [color='red'];
+directed graph G {
+    node [shape='box'];
+    $ring $hot;
+    X, Y [size=2, label='big'];
+    A -> X [weight=5];
+    X <- Y [weight=5];
+    Y -- A $hot;
+    $missing;
+    Q -> R [size=99999999999999999999];
+};
+undirected graph H {
+    P -- Q;
+};
+run G with (algorithm=bfs, start=A);
+"""
+
+
+@pytest.mark.parametrize('backend', ['fast', 'antlr'])
+def test_arena_program_equals_object_program(backend):
+    for example_dir in example_dirs:
+        for example_file in sorted(os.listdir(example_dir)):
+            example_path = os.path.join(example_dir, example_file)
+            with contextlib.redirect_stdout(io.StringIO()):
+                objects = parse_graphgif_file(example_path, backend=backend)
+                arena = parse_graphgif_file(example_path, backend=backend, ast='arena')
+            assert arena.program == objects.program, example_path
+            assert arena.graph_model == objects.graph_model, example_path
+            for graph_decl in arena.program.graph_declarations:
+                assert isinstance(graph_decl.statements, ArenaStatements)
+
+
+def test_visitors_run_on_either_representation():
+    program, _, errors = parse_declarations(SOURCE)
+    assert errors == []
+    arena_program = to_arena(program)
+    assert arena_program == program
+
+    def messages(findings):
+        return [finding.message for finding in findings]
+
+    validator, arena_validator = validate_ast(program), validate_ast(arena_program)
+    assert validator.errors and validator.warnings
+    assert messages(arena_validator.errors) == messages(validator.errors)
+    assert messages(arena_validator.warnings) == messages(validator.warnings)
+
+    analyzer, arena_analyzer = analyze_graphs(program), analyze_graphs(arena_program)
+    assert arena_analyzer.get_all_graphs() == analyzer.get_all_graphs()
+    assert arena_analyzer.weak_components('G').groups() == analyzer.weak_components('G').groups()
+
+    statistics, arena_statistics = GraphStatisticsVisitor(), GraphStatisticsVisitor()
+    statistics.visit_program(program)
+    arena_statistics.visit_program(arena_program)
+    assert arena_statistics.get_statistics() == statistics.get_statistics()
+
+    printer, arena_printer = GraphgifPrettyPrinter(), GraphgifPrettyPrinter()
+    printer.visit_program(program)
+    arena_printer.visit_program(arena_program)
+    assert arena_printer.output == printer.output
+    assert ast_to_dot(arena_program) == ast_to_dot(program)
+
+    fused, arena_fused = analyze_program(program), analyze_program(arena_program)
+    assert messages(arena_fused['validation'].errors) == messages(fused['validation'].errors)
+    assert messages(arena_fused['validation'].warnings) == messages(fused['validation'].warnings)
+
+
+def test_arena_stores_statements_compactly():
+    result = parse_graphgif(generate_program(500), backend='fast', print_errors=False)
+    arena = ASTArena()
+    statements = arena.add_statements(result.program.graph_declarations[0].statements)
+    assert len(arena) == len(statements) == 500
+    assert statements == result.program.graph_declarations[0].statements
+
+    edge, node = statements[1], statements[0]
+    assert isinstance(edge, EdgeDecl) and isinstance(node, NodeDecl)
+    assert not hasattr(edge, '__dict__')
+    assert statements[5:7] == result.program.graph_declarations[0].statements[5:7]
+    # Endpoints come from the shared string table
+    assert statements[2].source is statements[3].source
+    with pytest.raises(AttributeError):
+        edge.source = 'other'
+
+    # Views pickle as the plain nodes they stand for
+    assert type(pickle.loads(pickle.dumps(edge))) is EdgeDecl
+    assert pickle.loads(pickle.dumps(edge)) == edge
+
+    # Repeated attribute lists are stored once
+    def sizes(*attributes):
+        start = arena.nbytes()
+        for attrs in attributes:
+            arena.append(EdgeDecl('A', edge.operator, 'B', attrs))
+        return arena.nbytes() - start
+
+    row = sizes(None)
+    new_list = sizes(AttrList([Attribute('fresh', AttributeOperator.EQUALS, Value(1, 'NUMBER'))]))
+    assert new_list > row
+    assert sizes(*(AttrList([Attribute('fresh', AttributeOperator.EQUALS, Value(1, 'NUMBER'))])
+                   for _ in range(10))) == 10 * row
+
+
+@pytest.mark.parametrize('storage', ['dict', 'compact'])
+def test_arena_program_round_trips_through_serialization(tmp_path, storage):
+    cache = ASTCache(str(tmp_path))
+    for source in (SOURCE.replace('    $missing;\n', ''), generate_program(300)):
+        result = parse_graphgif(source, backend='fast', storage=storage, print_errors=False, ast='arena')
+        assert result.errors == []
+        program, graph_model = loads(dumps(result.program, result.graph_model))
+        assert program == result.program
+        assert graph_model.graphs == result.graph_model.graphs
+        statements = program.graph_declarations[0].statements
+        assert type(statements) is list and type(statements[0]) is NodeDecl
+
+        cache.put(source, result, storage)
+        assert cache.get(source, 'fast', storage).program == result.program
+
+    # Statements with equal attributes share them in the plain program too
+    program, _ = loads(dumps(*parse_graphgif(SOURCE.replace('    $missing;\n', ''), backend='fast', ast='arena')))
+    first, second = [statement for statement in program.graph_declarations[0].statements
+                     if isinstance(statement, EdgeDecl)][:2]
+    assert first.attributes is second.attributes
+
+
+def test_fast_parser_fills_the_arena_while_parsing(monkeypatch):
+    from models.arena import ASTArena
+    import parsing.fast_parser
+
+    arena = ASTArena()
+    sizes = []
+    parse_statement = parsing.fast_parser.FastParser.parse_statement
+
+    def record_size(self, *args):
+        sizes.append(len(arena))
+        return parse_statement(self, *args)
+
+    monkeypatch.setattr(parsing.fast_parser.FastParser, 'parse_statement', record_size)
+    program, _ = parsing.fast_parser.FastParser(generate_program(300), arena=arena).parse()
+
+    # Each statement is in the arena before the next one is parsed
+    assert sizes == list(range(300))
+    statements = program.graph_declarations[0].statements
+    assert isinstance(statements, ArenaStatements) and len(arena) == len(statements) == 300
+
+
+def test_unknown_representation_is_rejected():
+    with pytest.raises(ValueError):
+        parse_graphgif(SOURCE, backend='fast', ast='tree')
@@ -0,0 +1,107 @@
+import contextlib
+import io
+from dataclasses import fields, make_dataclass
+
+import pytest
+
+from benchmarks.synthetic import generate_program
+from models.serialization import dumps, loads
+from parsing import parse_graphgif
+from parsing.ast_cache import ASTCache
+
+SOURCE = """
+var node ring = A, B, C;
+var attributes hot = [color='red', size=10, style='bold'];
+directed graph G {
+    node $hot;
+    $ring;
+    A -> B [weight=5];
+    B -> C;
+    C -> A;
+};
+undirected graph H {
+    X -- Y [label='path'];
+    Y -- Z;
+};
+run G with (algorithm=bfs, start=A);
+"""
+
+
+def _parse(source, **options):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return parse_graphgif(source, **options)
+
+
+@pytest.mark.parametrize('backend', ['fast', 'antlr'])
+@pytest.mark.parametrize('storage', ['dict', 'compact'])
+def test_round_trip_is_exact(backend, storage):
+    for source in (SOURCE, generate_program(300)):
+        result = _parse(source, backend=backend, storage=storage)
+        assert result.errors == []
+        program, graph_model = loads(dumps(result.program, result.graph_model))
+        assert program == result.program
+        assert graph_model.variables == result.graph_model.variables
+        assert graph_model.graphs.keys() == result.graph_model.graphs.keys()
+        for name, graph in result.graph_model.graphs.items():
+            assert graph_model.graphs[name] == graph
+            assert str(graph_model.graphs[name]) == str(graph)
+
+
+def test_corrupt_data_is_rejected():
+    result = _parse(SOURCE, backend='fast')
+    data = dumps(result.program, result.graph_model)
+    for bad in (b'', b'GGAST', data[:len(data) // 2], b'XXXXX' + data[5:], data + b'\0'):
+        with pytest.raises(ValueError):
+            loads(bad)
+
+
+def test_cache_skips_parsing_unchanged_sources(tmp_path, monkeypatch):
+    cache = ASTCache(str(tmp_path))
+    first = cache.parse(SOURCE, backend='fast')
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    import parsing.ast_cache
+    monkeypatch.setattr(parsing.ast_cache, 'parse_graphgif', None)
+    second = ASTCache(str(tmp_path)).parse(SOURCE, backend='fast')
+    assert second.program == first.program
+    assert second.graph_model.graphs == first.graph_model.graphs
+    # Other options and sources are separate entries
+    assert cache.get(SOURCE, backend='fast', storage='compact') is None
+    assert cache.get(SOURCE + '\n', backend='fast') is None
+
+
+def test_cache_ignores_errors_and_unreadable_entries(tmp_path):
+    cache = ASTCache(str(tmp_path))
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert cache.parse("directed graph Broken { A -> ; };", backend='fast').errors
+    assert cache.get("directed graph Broken { A -> ; };", backend='fast') is None
+
+    cache.parse(SOURCE, backend='fast')
+    cache.store.put(cache.key(SOURCE, 'fast', 'dict'), b'not a program')
+    assert cache.get(SOURCE, backend='fast') is None
+    assert cache.parse(SOURCE, backend='fast').errors == []
+
+
+def test_schema_version_covers_the_graph_storage_engines(monkeypatch):
+    from models.compact_graph import CompactGraph
+    from models.graph_model import GraphEdge
+    from models.serialization import schema_version
+
+    version = schema_version()
+    init = CompactGraph.__init__
+
+    def init_with_keys(self, *args):
+        init(self, *args)
+        self._edge_keys = {}
+
+    monkeypatch.setattr(CompactGraph, '__init__', init_with_keys)
+    assert schema_version() != version
+    monkeypatch.undo()
+    assert schema_version() == version
+
+    # A graph model dataclass gaining a field
+    import models.serialization
+    keyed_edge = make_dataclass('GraphEdge', [*(f.name for f in fields(GraphEdge)), 'key'])
+    graph_classes = tuple(keyed_edge if cls is GraphEdge else cls for cls in models.serialization.GRAPH_CLASSES)
+    monkeypatch.setattr(models.serialization, 'GRAPH_CLASSES', graph_classes)
+    assert schema_version() != version
@@ -0,0 +1,78 @@
+import pytest
+
+from batch import compile_directory, find_sources
+
+GOOD = """
+var node ring = A, B, C;
+directed graph G{i} {{
+    $ring;
+    A -> B;
+}};
+run G{i} with (algorithm=bfs);
+"""
+
+BAD = """
+directed graph Broken {
+    A -> ;
+};
+"""
+
+UNDEFINED = """
+directed graph Undefined {
+    $missing;
+};
+"""
+
+
+def _write_sources(directory):
+    for i in range(6):
+        (directory / f'good{i}.gg').write_text(GOOD.format(i=i))
+    (directory / 'nested').mkdir()
+    (directory / 'nested' / 'bad.gg').write_text(BAD)
+    (directory / 'notes.txt').write_text('not a source')
+
+
+def _summary(results):
+    return [(result.path, repr(result.program), result.errors) for result in results]
+
+
+def test_batch_is_deterministic_across_workers(tmp_path, capsys):
+    _write_sources(tmp_path)
+    serial = compile_directory(str(tmp_path), workers=1)
+    parallel = compile_directory(str(tmp_path), workers=3)
+
+    assert [result.path for result in serial] == find_sources(str(tmp_path))
+    assert _summary(parallel) == _summary(serial)
+    # Diagnostics are collected per file, not printed while parsing
+    assert capsys.readouterr().out == ''
+
+    failed = [result for result in serial if not result.ok]
+    assert [result.path for result in failed] == [str(tmp_path / 'nested' / 'bad.gg')]
+    assert failed[0].errors[0]['type'] == 'parser'
+    assert all('parse' in result.timings for result in serial)
+    assert serial[0].program.graph_declarations[0].name == 'G0'
+
+
+@pytest.mark.parametrize('backend, workers', [('fast', 1), ('antlr', 2)])
+def test_batch_records_semantic_errors_and_continues(tmp_path, backend, workers):
+    for i in range(3):
+        (tmp_path / f'good{i}.gg').write_text(GOOD.format(i=i))
+    (tmp_path / 'undefined.gg').write_text(UNDEFINED)
+    results = compile_directory(str(tmp_path), workers=workers, backend=backend)
+
+    assert [result.ok for result in results] == [True, True, True, False]
+    error = results[-1].errors[0]
+    assert error['type'] == 'semantic' and "'missing'" in error['message']
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_batch_records_builder_crashes_and_continues(tmp_path, workers):
+    for i in range(3):
+        (tmp_path / f'good{i}.gg').write_text(GOOD.format(i=i))
+    # Recovered by the ANTLR parser, but the declaration has no variable type
+    (tmp_path / 'malformed.gg').write_text('var nodemy_nodes = E, F, G;\n')
+    results = compile_directory(str(tmp_path), workers=workers, backend='antlr')
+
+    assert [result.ok for result in results] == [True, True, True, False]
+    assert results[-1].errors[0]['type'] == 'internal' and 'KeyError' in results[-1].errors[0]['message']
+    assert results[-1].program is None
@@ -0,0 +1,66 @@
+import contextlib
+import io
+import json
+
+from parsing import parse_graphgif
+from parsing.dfa_cache import dfa_state_count, load_dfa_cache, save_dfa_cache
+from parsing.grammar.GraphgifLexer import GraphgifLexer
+from parsing.grammar.GraphgifParser import GraphgifParser
+
+SOURCE = """
+var node ring = A, B, C;
+var attributes hot = [color='red', size=10];
+directed graph G {
+    node $hot;
+    $ring;
+    A -> B [weight=5];
+    B -> C;
+    // comment
+    C -> A;
+};
+run G with (algorithm=bfs, start=A);
+"""
+
+
+def _parse():
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = parse_graphgif(SOURCE)
+    assert result.errors == []
+    return repr(result.program)
+
+
+def _clear_dfas():
+    for recognizer in (GraphgifLexer, GraphgifParser):
+        for dfa in recognizer.decisionsToDFA:
+            dfa._states = {}
+            dfa.s0 = None
+
+
+def test_dfa_cache_round_trip(tmp_path):
+    expected = _parse()
+    warm_states = dfa_state_count()
+    path = str(tmp_path / 'dfa.json')
+    save_dfa_cache(path)
+
+    _clear_dfas()
+    assert dfa_state_count() == 0
+    assert load_dfa_cache(path)
+    assert dfa_state_count() == warm_states
+
+    # The restored DFAs predict the same parse without growing
+    assert _parse() == expected
+    assert dfa_state_count() == warm_states
+
+
+def test_dfa_cache_ignores_other_grammar_versions(tmp_path):
+    _parse()
+    path = tmp_path / 'dfa.json'
+    save_dfa_cache(str(path))
+    data = json.loads(path.read_text())
+    data['grammar'] = 'stale'
+    path.write_text(json.dumps(data))
+
+    assert not load_dfa_cache(str(path))
+    assert not load_dfa_cache(str(tmp_path / 'missing.json'))
+    path.write_text('{"format": 1')
+    assert not load_dfa_cache(str(path))
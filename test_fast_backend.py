@@ -0,0 +1,232 @@
+import contextlib
+import io
+import os
+import pickle
+import random
+
+import pytest
+from antlr4 import ParseTreeWalker
+
+from errors import GraphGifErrorListener
+from models.serialization import dumps, loads
+from parsing import parse_graphgif, parse_graphgif_file, load_graph_model
+from parsing.ast_builder import ASTBuilder, build_parse_tree
+from parsing.fast_parser import SKIPPED, TOKEN_PATTERN, FastParser
+
+example_dirs = ['./examples', './errors/examples']
+
+
+def _parse(path, backend):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return parse_graphgif_file(path, backend=backend)
+
+
+def test_fast_backend_matches_antlr():
+    for example_dir in example_dirs:
+        for example_file in sorted(os.listdir(example_dir)):
+            example_path = os.path.join(example_dir, example_file)
+            antlr_result = _parse(example_path, "antlr")
+            fast_result = _parse(example_path, "fast")
+
+            assert fast_result.program == antlr_result.program, example_path
+            assert fast_result.graph_model == antlr_result.graph_model, example_path
+            assert fast_result.errors == antlr_result.errors, example_path
+
+
+def test_streaming_matches_fast_backend():
+    for example_dir in example_dirs:
+        for example_file in sorted(os.listdir(example_dir)):
+            example_path = os.path.join(example_dir, example_file)
+            fast_result = _parse(example_path, "fast")
+            for chunk_size in (1, 7, 1 << 16):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    graph_model = load_graph_model(example_path, chunk_size)
+                assert graph_model == fast_result.graph_model, (example_path, chunk_size)
+
+
+def test_compact_storage_matches_dict():
+    for example_dir in example_dirs:
+        for example_file in sorted(os.listdir(example_dir)):
+            example_path = os.path.join(example_dir, example_file)
+            with contextlib.redirect_stdout(io.StringIO()):
+                dict_result = parse_graphgif_file(example_path, backend="fast")
+                compact_result = parse_graphgif_file(example_path, backend="fast", storage="compact")
+            assert compact_result.graph_model == dict_result.graph_model, example_path
+            assert str(compact_result.graph_model) == str(dict_result.graph_model), example_path
+
+
+SHARED_SOURCE = """
+directed graph G {
+    A, B, C [color='red'];
+    A -> B [color='red', weight=1];
+    B -> C [color='red', weight=1];
+    C -> A [weight=2];
+};
+"""
+
+
+@pytest.mark.parametrize('backend', ['fast', 'antlr'])
+def test_parsers_share_repeated_identifiers_and_values(backend):
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = parse_graphgif(SHARED_SOURCE, backend=backend)
+    assert result.errors == []
+    node_decl, *edges = result.program.graph_declarations[0].statements
+    assert not hasattr(node_decl, '__dict__')
+
+    for program in (result.program, loads(dumps(result.program, result.graph_model))[0]):
+        node_decl, first, second, third = program.graph_declarations[0].statements
+        assert first.target is second.source
+        assert third.target is node_decl.nodes.nodes[0]
+        assert first.attributes.attributes[0] is node_decl.attributes.attributes[0]
+        assert first.attributes.attributes[1] is second.attributes.attributes[1]
+        assert third.attributes.attributes[0].value is not first.attributes.attributes[1].value
+
+    assert pickle.loads(pickle.dumps(result.program)) == result.program
+
+
+# Prime ANTLR's error recovery: the runtime adds the recovery set to the expected set of a
+# (...)* loop it cached on the first resynchronisation inside the loop, which changes later
+# "extraneous input" messages for the rest of the process; the fast parser mirrors that state
+ANTLR_PRIMERS = [
+    "directed graph G { node [a=1]; = A; };",
+    "directed graph G { A; = B; };",
+    "directed graph G { A [a=1, b=2 c=3]; };",
+]
+
+MUTATION_TOKENS = [',', ':', ';', '5', 'X', '[', ']', '$', '->', '{', '}', '=', "'s'", 'var', 'node',
+                   '(', '.', '@', '<', '-', "'open", '/*']
+
+MUTATED_SOURCE = """
+var node ring = A, B, C;
+var node alias = $ring;
+var edge links = A -> B [w=1], B -- C, C <- A;
+var attributes hot = [color: 'red', size=10,];
+directed graph G {
+    node $hot;
+    edge [style='dashed'];
+    graph [rankdir=LR];
+    $alias [x=1];
+    A, B $hot;
+    A -> B $hot;
+    B <- C [label='x', w: 3];
+    /* comment */ C -- A;
+};
+run G with (algorithm=bfs, start=A, out.file.name='x.png', steps: 5);
+run G with ();
+"""
+
+
+class _TrackedStack(list):
+    """List remembering the lowest length it has been popped down to."""
+    low = 0
+
+    def pop(self, *args):
+        item = super().pop(*args)
+        self.low = min(self.low, len(self))
+        return item
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self.low = min(self.low, len(self))
+
+
+class _CheckedASTBuilder(ASTBuilder):
+    """
+    ASTBuilder noting when a rule pops nodes its own children did not push, which happens
+    on some recovered parse trees; the program it builds then depends on stack leftovers.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.ast_stack = _TrackedStack()
+        self.heights = []
+        self.misaligned = False
+
+    def enterEveryRule(self, ctx):
+        self.heights.append(len(self.ast_stack))
+
+
+def _checked_exit(exit_rule):
+    def exit(self, ctx):
+        height = self.heights.pop()
+        self.ast_stack.low = len(self.ast_stack)
+        exit_rule(self, ctx)
+        self.misaligned = self.misaligned or self.ast_stack.low < height
+    return exit
+
+
+for _name in dir(ASTBuilder):
+    if _name.startswith('exit') and _name != 'exitEveryRule':
+        setattr(_CheckedASTBuilder, _name, _checked_exit(getattr(ASTBuilder, _name)))
+
+
+def _diagnostics(listener):
+    return [(error['type'], error['message'], error['line'], error['column'])
+            for error in listener.get_errors()]
+
+
+def _antlr_outcome(source):
+    """Diagnostics and program (or ValueError text); None for the program when misaligned."""
+    listener = GraphGifErrorListener('mutant')
+    tree, _ = build_parse_tree(source, listener)
+    builder = _CheckedASTBuilder()
+    try:
+        ParseTreeWalker().walk(builder, tree)
+        outcome = builder.program
+    except ValueError as e:
+        outcome = str(e)
+    except Exception:
+        # The builder crashed on a node popped out of place
+        builder.misaligned = True
+    return _diagnostics(listener), None if builder.misaligned else outcome
+
+
+def _fast_outcome(source):
+    listener = GraphGifErrorListener('mutant')
+    try:
+        outcome, _ = FastParser(source, listener).parse()
+    except ValueError as e:
+        outcome = str(e)
+    return _diagnostics(listener), outcome
+
+
+def _mutants(source, rng, count):
+    """Copies of source with two to four tokens deleted, replaced or preceded by another."""
+    for _ in range(count):
+        mutant = source
+        for _ in range(rng.randint(2, 4)):
+            spans = [match.span() for match in TOKEN_PATTERN.finditer(mutant) if match.lastgroup not in SKIPPED]
+            if not spans:
+                break
+            start, end = rng.choice(spans)
+            token, operation = rng.choice(MUTATION_TOKENS), rng.random()
+            if operation < 0.3:
+                mutant = mutant[:start] + mutant[end:]
+            elif operation < 0.6:
+                mutant = mutant[:start] + token + ' ' + mutant[start:]
+            else:
+                mutant = mutant[:start] + token + mutant[end:]
+        yield mutant
+
+
+def test_fast_backend_recovers_like_antlr_on_malformed_input():
+    for primer in ANTLR_PRIMERS:
+        build_parse_tree(primer, GraphGifErrorListener('primer'))
+
+    sources = [MUTATED_SOURCE]
+    for example_dir in example_dirs:
+        for example_file in sorted(os.listdir(example_dir)):
+            with open(os.path.join(example_dir, example_file), encoding='utf-8') as f:
+                sources.append(f.read())
+
+    rng = random.Random(2024)
+    compared = 0
+    for source in sources:
+        for mutant in _mutants(source, rng, 40):
+            antlr_errors, antlr_outcome = _antlr_outcome(mutant)
+            fast_errors, fast_outcome = _fast_outcome(mutant)
+            assert fast_errors == antlr_errors, mutant
+            if antlr_outcome is not None:
+                assert fast_outcome == antlr_outcome, mutant
+                compared += 1
+    assert compared > len(sources) * 20
@@ -0,0 +1,108 @@
+import pytest
+
+from models.graph_model import ConcreteGraph, GraphEdge
+
+
+STORAGES = ['dict', 'compact']
+
+
+def _graph(directed, storage='dict'):
+    from parsing.model_builder import STORAGE_ENGINES
+
+    graph = STORAGE_ENGINES[storage]("G", directed)
+    graph.add_node("D")
+    graph.add_edge("A", "B")
+    graph.add_edge("A", "C")
+    graph.add_edge("C", "A")
+    graph.add_edge("A", "B")
+    return graph
+
+
+@pytest.mark.parametrize('storage', STORAGES)
+def test_directed_adjacency(storage):
+    graph = _graph(True, storage)
+
+    assert graph.successors("A") == ["B", "C"]
+    assert graph.predecessors("A") == ["C"]
+    assert graph.neighbors("A") == ["B", "C"]
+    assert graph.neighbors("D") == []
+    assert graph.out_degree("A") == 3
+    assert graph.in_degree("B") == 2
+    assert graph.has_edge("C", "A")
+    assert not graph.has_edge("B", "A")
+    assert graph.edge_ids("A", "B") == [0, 3]
+
+
+@pytest.mark.parametrize('storage', STORAGES)
+def test_undirected_adjacency(storage):
+    graph = _graph(False, storage)
+
+    assert graph.neighbors("B") == ["A"]
+    assert graph.neighbors("A") == ["B", "C"]
+    assert graph.out_degree("A") == graph.in_degree("A") == 4
+    assert graph.has_edge("B", "A")
+    assert graph.edge_ids("C", "A") == [1, 2]
+
+
+def test_adjacency_indexes_constructor_edges():
+    graph = ConcreteGraph("G", True, edges=[GraphEdge("A", "B"), GraphEdge("B", "C")])
+
+    assert graph.successors("B") == ["C"]
+    assert graph.in_degree("C") == 1
+
+
+@pytest.mark.parametrize('storage', STORAGES)
+def test_unknown_node(storage):
+    graph = _graph(True, storage)
+    with pytest.raises(ValueError, match="'X'"):
+        graph.neighbors("X")
+    assert not graph.has_edge("X", "A")
+    assert graph.edge_ids("A", "X") == []
+
+
+@pytest.mark.parametrize('storage', STORAGES)
+def test_adjacency_follows_added_edges(storage):
+    graph = _graph(True, storage)
+    assert graph.successors("B") == []
+    graph.add_edge("B", "D")
+    graph.add_edge("B", "B")
+
+    assert graph.successors("B") == ["D", "B"]
+    assert graph.predecessors("B") == ["A", "B"]
+    assert graph.out_degree("B") == 2 and graph.in_degree("B") == 3
+    assert graph.edge_ids("B", "B") == [5]
+
+
+def test_freeze_snapshot():
+    graph = _graph(True)
+    graph.add_edge("B", "D", {'weight': 5})
+    frozen = graph.freeze()
+
+    assert frozen.node_ids == ("D", "A", "B", "C")
+    assert frozen.neighbors("A") == graph.neighbors("A")
+    assert frozen.out_degree("A") == graph.out_degree("A")
+    assert frozen.bfs_order("A") == ["A", "B", "C", "D"]
+    assert frozen.edge_attributes['weight'].tolist() == [None, None, None, None, 5]
+    assert not frozen.indices.flags.writeable
+
+    levels = [(nodes.tolist(), edges.tolist()) for nodes, edges in frozen.bfs_levels("A")]
+    assert levels == [([1], [-1]), ([2, 3], [0, 1]), ([0], [4])]
+
+
+@pytest.mark.parametrize('storage', ['dict', 'compact'])
+def test_caller_attributes_are_copied(storage):
+    from parsing.model_builder import STORAGE_ENGINES
+
+    graph = STORAGE_ENGINES[storage]("G", True)
+    graph.global_edge_attributes['x'] = 1
+    node_attributes, edge_attributes = {'shape': 'box'}, {'color': 'red'}
+    graph.add_node('A', node_attributes)
+    edge = graph.add_edge('A', 'B', edge_attributes)
+    resolved = graph.resolve_edge('A', 'B', edge_attributes)
+    node_attributes['shape'] = 'circle'
+    edge_attributes['color'] = 'blue'
+    edge_attributes['y'] = 2
+
+    assert dict(graph.nodes['A'].attributes) == {'shape': 'box'}
+    assert dict(edge.attributes) == dict(graph.edges[0].attributes) == {'x': 1, 'color': 'red'}
+    assert dict(resolved.attributes) == {'x': 1, 'color': 'red'}
@@ -0,0 +1,16 @@
+import pytest
+
+from benchmarks.bench_import import IMPORT_BUDGET_MS, LIGHT_MODULES, heavy_imports, measure
+
+
+@pytest.mark.parametrize('module', LIGHT_MODULES)
+def test_light_modules_skip_heavy_dependencies(module):
+    _, imported = measure(module)
+
+    assert heavy_imports(imported) == []
+
+
+def test_cli_import_budget():
+    milliseconds = min(measure('cli')[0] for _ in range(3))
+
+    assert milliseconds < IMPORT_BUDGET_MS
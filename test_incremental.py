@@ -0,0 +1,92 @@
+import contextlib
+import io
+
+from incremental import IncrementalBuilder, graph_fingerprint, parse_declarations, referenced_variables
+
+SOURCE = """
+var node ring = A, B, C;
+var attributes hot = [color='red'];
+var attributes unused = [color='blue'];
+undirected graph G {{
+    node $hot;
+    $ring;
+    A -- B;
+    B -- C;
+}};
+directed graph H {{
+    X -> Y;
+}};
+run G with (output='{out}/g');
+run H with (output='{out}/h');
+"""
+
+
+def _parse(source):
+    with contextlib.redirect_stdout(io.StringIO()):
+        program, _, errors = parse_declarations(source)
+    assert errors == []
+    return program
+
+
+def test_fingerprint_follows_variables():
+    program = _parse(SOURCE.format(out='out'))
+    graph, other = program.graph_declarations
+
+    assert [var_decl.name for var_decl in referenced_variables(program, graph)] == ['hot', 'ring']
+    assert referenced_variables(program, other) == []
+
+    edited = _parse(SOURCE.format(out='out').replace("color='red'", "color='green'"))
+    assert graph_fingerprint(edited, edited.graph_declarations[0]) != graph_fingerprint(program, graph)
+    assert graph_fingerprint(edited, edited.graph_declarations[1]) == graph_fingerprint(program, other)
+
+    unused = _parse(SOURCE.format(out='out').replace("color='blue'", "color='green'"))
+    assert graph_fingerprint(unused, unused.graph_declarations[0]) == graph_fingerprint(program, graph)
+
+
+def test_only_changed_graphs_are_rebuilt(tmp_path):
+    source = SOURCE.format(out=tmp_path)
+    state_path = str(tmp_path / 'state.json')
+
+    first = IncrementalBuilder(state_path).build_source(source, 'example.gg')
+    assert first.rebuilt == ['G', 'H']
+    assert first.outputs == [str(tmp_path / 'g'), str(tmp_path / 'h')]
+
+    # A new builder picks the fingerprints up from the state file
+    builder = IncrementalBuilder(state_path)
+    assert builder.build_source(source, 'example.gg').rebuilt == []
+
+    edited = builder.build_source(source.replace('X -> Y;', 'X -> Y;\n    Y -> Z;'), 'example.gg')
+    assert (edited.rebuilt, edited.unchanged) == (['H'], ['G'])
+    assert len(list((tmp_path / 'h').iterdir())) == 5
+
+
+def test_missing_outputs_are_rebuilt(tmp_path):
+    source = SOURCE.format(out=tmp_path)
+    builder = IncrementalBuilder()
+    builder.build_source(source, 'example.gg')
+
+    for path in (tmp_path / 'g').iterdir():
+        path.unlink()
+    (tmp_path / 'g').rmdir()
+    assert builder.build_source(source, 'example.gg').rebuilt == ['G']
+
+
+def test_image_sequence_outputs_are_recorded(tmp_path, monkeypatch):
+    import animation.export
+
+    monkeypatch.setattr(animation.export, 'render_dot', lambda dot_source, *args, **kwargs: b'image')
+    source = """
+directed graph G {
+    A -> B;
+};
+run G with (output='%s', fixed_layout=false, workers=1);
+""" % (tmp_path / 'g.png')
+    builder = IncrementalBuilder(str(tmp_path / 'state.json'))
+
+    first = builder.build_source(source, 'example.gg')
+    assert first.rebuilt == ['G'] and first.outputs
+    assert first.outputs == sorted(str(path) for path in tmp_path.glob('g_*.png'))
+    assert not (tmp_path / 'g.png').exists()
+
+    second = builder.build_source(source, 'example.gg')
+    assert (second.rebuilt, second.unchanged) == ([], ['G'])
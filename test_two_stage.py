@@ -0,0 +1,43 @@
+import contextlib
+import io
+import os
+
+from parsing import parse_graphgif
+
+VALID = """
+var node ring = A, B, C;
+directed graph G {
+    $ring [color='red'];
+    A -> B [weight=5];
+};
+run G with (algorithm=bfs, start=A);
+"""
+
+
+def _parse(source, two_stage):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return parse_graphgif(source, two_stage=two_stage)
+
+
+def test_valid_input_is_parsed_with_sll():
+    result = _parse(VALID, two_stage=True)
+    assert result.prediction_mode == 'SLL'
+    assert result.errors == []
+    assert result.program == _parse(VALID, two_stage=False).program
+
+
+def test_syntax_error_falls_back_to_ll():
+    result = _parse(VALID.replace('A -> B', 'A -> '), two_stage=True)
+    assert result.prediction_mode == 'LL'
+    assert result.errors and result.errors[0]['type'] == 'parser'
+
+
+def test_two_stage_errors_match_ll():
+    example_dir = './errors/examples'
+    for example_file in sorted(os.listdir(example_dir)):
+        with open(os.path.join(example_dir, example_file), encoding='utf-8') as f:
+            source = f.read()
+        two_stage, single_stage = _parse(source, two_stage=True), _parse(source, two_stage=False)
+        assert two_stage.prediction_mode == 'LL', example_file
+        assert two_stage.errors == single_stage.errors, example_file
+        assert two_stage.program == single_stage.program, example_file
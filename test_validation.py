@@ -0,0 +1,141 @@
+import sys
+
+from models import EdgeDecl, EdgeOperator, GraphDecl, GraphDirection, NodeDecl, NodeList, Program
+from validation import analyze_graphs
+
+DIRECTED, UNDIRECTED = EdgeOperator.DIRECTED_RIGHT, EdgeOperator.UNDIRECTED
+
+
+def _program(*graphs):
+    return Program([], [GraphDecl(direction, name, [], statements) for direction, name, statements in graphs], [])
+
+
+def _edges(pairs, operator=DIRECTED):
+    return [EdgeDecl(source, operator, target) for source, target in pairs]
+
+
+def test_components_of_directed_graph():
+    statements = _edges([('A', 'B'), ('B', 'C'), ('C', 'A'), ('C', 'D'), ('E', 'F')])
+    statements.append(NodeDecl(NodeList(['G'])))
+    # E <- F closes the cycle E -> F -> E
+    statements.append(EdgeDecl('E', EdgeOperator.DIRECTED_LEFT, 'F'))
+    analyzer = analyze_graphs(_program((GraphDirection.DIRECTED, 'G', statements)))
+
+    weak = analyzer.weak_components('G')
+    assert weak.count == 3
+    assert weak.groups() == [['A', 'B', 'C', 'D'], ['E', 'F'], ['G']]
+    assert weak.sizes() == [4, 2, 1]
+    assert weak.component_of('D') == weak.component_of('A')
+    assert not analyzer.is_connected('G')
+
+    strong = analyzer.strong_components('G')
+    assert sorted(map(sorted, strong.groups())) == [['A', 'B', 'C'], ['D'], ['E', 'F'], ['G']]
+    # Numbered in reverse topological order: D is completed before the cycle leading to it
+    assert strong.component_of('D') < strong.component_of('A')
+    assert not analyzer.is_strongly_connected('G')
+    # Labellings are computed once per graph
+    assert analyzer.weak_components('G') is weak
+    assert analyzer.strong_components('missing') is None
+    assert not analyzer.is_connected('missing')
+
+
+def test_undirected_edges_are_strongly_connected():
+    analyzer = analyze_graphs(_program(
+        (GraphDirection.UNDIRECTED, 'U', _edges([('A', 'B'), ('B', 'C')], UNDIRECTED)),
+        (GraphDirection.DIRECTED, 'M', _edges([('A', 'B')], UNDIRECTED) + _edges([('B', 'C'), ('C', 'B')])),
+    ))
+    assert analyzer.is_connected('U') and analyzer.is_strongly_connected('U')
+    assert analyzer.is_strongly_connected('M')
+
+
+def test_long_paths_do_not_recurse():
+    length = sys.getrecursionlimit() * 5
+    pairs = [(f'n{i}', f'n{i + 1}') for i in range(length)] + [(f'n{length}', 'n0')]
+    analyzer = analyze_graphs(_program((GraphDirection.DIRECTED, 'Ring', _edges(pairs))))
+    assert analyzer.strong_components('Ring').count == 1
+    assert analyzer.weak_components('Ring').sizes() == [length + 1]
+
+
+FUSED_SOURCE = """
+var node ring = A, B;
+var edge links = A -> B [color='red', color='blue'], B -> C;
+var attributes hot = [color='red'];
+var node ring = X;
+directed graph G {
+    node [shape='box', shape='circle'];
+    $ring [color='x', color='y'];
+    $missing;
+    A -> Z $hot;
+    Z;
+    Q -> R [w=1, w=2];
+    $hot;
+    B -> A $links;
+};
+directed graph G { A -> B; };
+run H with (algorithm=bfs);
+run G with (algorithm=bfs);
+"""
+
+
+def test_fused_pass_matches_separate_visitors():
+    from analysis import analyze_program
+    from incremental import parse_declarations
+    from validation import validate_ast
+    from visitors import GraphStatisticsVisitor
+
+    # Declarations only: building graphs would stop at the first unknown variable
+    program, _, errors = parse_declarations(FUSED_SOURCE)
+    assert errors == []
+    fused = analyze_program(program)
+    validator = validate_ast(program)
+    statistics = GraphStatisticsVisitor()
+    statistics.visit_program(program)
+
+    def findings(errors):
+        return [(error.message, id(error.node)) for error in errors]
+
+    assert len(validator.errors) == 8 and len(validator.warnings) == 10
+    # Every check of the validator contributes
+    messages = {' '.join(error.message.split()[:2]) for error in validator.errors + validator.warnings}
+    assert messages >= {'Duplicate graph', 'Duplicate variable', 'Unknown variable', 'Unknown graph',
+                        'Duplicate attribute', 'Edge source', 'Edge target', "Variable 'hot'"}
+    assert findings(fused['validation'].errors) == findings(validator.errors)
+    assert findings(fused['validation'].warnings) == findings(validator.warnings)
+    assert fused['graphs'].graphs == analyze_graphs(program).graphs
+    assert fused['statistics'].get_statistics() == statistics.get_statistics()
+
+
+def test_fused_pass_follows_validator_checks(monkeypatch):
+    from analysis import analyze_program
+    from validation import SemanticValidator, validate_ast
+
+    # The plugin goes through the validator's public checks, so changes to them carry over
+    def validate_edge_endpoints(self, node):
+        self.add_warning(f"Edge {node.source} -> {node.target}", node)
+
+    monkeypatch.setattr(SemanticValidator, 'validate_edge_endpoints', validate_edge_endpoints)
+    # Endpoints declared before and after their edges, as well as undeclared ones
+    statements = [NodeDecl(NodeList(['A', 'B'])), *_edges([('A', 'B'), ('B', 'C'), ('C', 'D')]),
+                  NodeDecl(NodeList(['C']))]
+    program = _program((GraphDirection.DIRECTED, 'G', statements))
+    fused = analyze_program(program, ['validation'])['validation']
+    assert [warning.message for warning in fused.warnings] == \
+        [warning.message for warning in validate_ast(program).warnings] == \
+        ['Edge A -> B', 'Edge B -> C', 'Edge C -> D']
+
+
+def test_registered_plugins_run_in_the_same_pass(monkeypatch):
+    from analysis import PLUGINS, analyze_program, register_plugin
+
+    class EdgeCounter:
+        def begin_program(self, program):
+            self.result = 0
+
+        def visit_edge_decl(self, node):
+            self.result += 1
+
+    monkeypatch.setattr('analysis.PLUGINS', dict(PLUGINS))
+    register_plugin('edges', EdgeCounter)
+    program = _program((GraphDirection.DIRECTED, 'G', _edges([('A', 'B'), ('B', 'C')])))
+    assert analyze_program(program)['edges'] == 2
+    assert list(analyze_program(program, ['edges'])) == ['edges']
@@ -0,0 +1,98 @@
+import contextlib
+import io
+
+from models import EdgeDecl, NodeList
+from parsing import parse_graphgif
+from visitors import BaseASTVisitor, GraphStatisticsVisitor
+
+SOURCE = """
+var node ring = A, B;
+var edge links = A -> B, B -> C [color='red'];
+var attributes hot = [color='red'];
+directed graph G {
+    node [shape='box'];
+    $ring $hot;
+    X, Y [size=2];
+    A -> X [weight=5];
+};
+run G with (algorithm=bfs);
+"""
+
+
+def _program():
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = parse_graphgif(SOURCE, backend='fast')
+    assert result.errors == []
+    return result.program
+
+
+NAMES = ('program', 'var_decl', 'graph_decl', 'node_decl', 'edge_decl', 'command', 'attr_list',
+         'node_list', 'edge_list')
+
+
+class RecursiveRecorder(BaseASTVisitor):
+    def __init__(self):
+        self.order = []
+
+
+class WalkRecorder(BaseASTVisitor):
+    def __init__(self):
+        self.order = []
+
+
+def _recording_visit(name):
+    def visit(self, node):
+        self.order.append(name)
+        getattr(BaseASTVisitor, f'visit_{name}')(self, node)
+    return visit
+
+
+def _recording_enter(name):
+    def enter(self, node):
+        self.order.append(name)
+    return enter
+
+
+for _name in NAMES:
+    setattr(RecursiveRecorder, f'visit_{_name}', _recording_visit(_name))
+    setattr(WalkRecorder, f'enter_{_name}', _recording_enter(_name))
+
+
+def test_walk_visits_in_recursive_order():
+    program = _program()
+    recursive, walker = RecursiveRecorder(), WalkRecorder()
+    recursive.visit(program)
+    walker.walk(program)
+    assert walker.order == recursive.order
+    assert recursive.order[:4] == ['program', 'var_decl', 'node_list', 'var_decl']
+    assert recursive.order.count('edge_decl') == 3
+
+
+def test_dispatch_is_per_class_and_follows_subclasses():
+    class TaggedNodeList(NodeList):
+        pass
+
+    class Collector(BaseASTVisitor):
+        def __init__(self):
+            self.seen = []
+
+        def visit_node_list(self, node):
+            self.seen.append(node.nodes)
+
+        def leave_edge_decl(self, node):
+            self.seen.append((node.source, node.target))
+
+    collector = Collector()
+    collector.visit(TaggedNodeList(['A']))
+    collector.visit(None)
+    collector.walk(EdgeDecl('A', None, 'B'))
+    assert collector.seen == [['A'], ('A', 'B')]
+    assert TaggedNodeList in Collector._visit_table
+    assert TaggedNodeList not in BaseASTVisitor._visit_table
+
+
+def test_existing_visitors_are_unchanged():
+    statistics = GraphStatisticsVisitor()
+    statistics.visit(_program())
+    assert statistics.get_statistics()['total_edges'] == 3
+    assert statistics.get_statistics()['node_list'] == ['A', 'B', 'C', 'X', 'Y']
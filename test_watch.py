@@ -0,0 +1,56 @@
+import contextlib
+import io
+import os
+
+from incremental import IncrementalBuilder
+from watch import Watcher
+
+SOURCE = """
+undirected graph G {{
+    A -- B;
+    B -- C;
+}};
+run G with (output='{out}');
+"""
+
+
+def _touch(path, text):
+    path.write_text(text)
+    # Make the edit visible even on filesystems with coarse timestamps
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_watcher_debounces_and_rebuilds_changed_files(tmp_path):
+    source_dir = tmp_path / 'src'
+    source_dir.mkdir()
+    first, second = source_dir / 'a.gg', source_dir / 'b.gg'
+    first.write_text(SOURCE.format(out=tmp_path / 'a'))
+    second.write_text(SOURCE.format(out=tmp_path / 'b'))
+    watcher = Watcher(str(source_dir), IncrementalBuilder(validate=True), debounce=1.0)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert [result.rebuilt for result in watcher.start()] == [['G'], ['G']]
+        assert watcher.poll(now=0.0) == []
+
+        _touch(first, SOURCE.format(out=tmp_path / 'a').replace('B -- C;', 'B -- C;\n    C -- D;'))
+        assert watcher.poll(now=10.0) == []
+        _touch(first, SOURCE.format(out=tmp_path / 'a').replace('B -- C;', 'B -- C;\n    C -- E;'))
+        assert watcher.poll(now=10.5) == []
+        assert watcher.poll(now=11.0) == []
+        results = watcher.poll(now=11.6)
+
+    assert [(result.path, result.rebuilt) for result in results] == [(str(first), ['G'])]
+    assert sorted(os.listdir(tmp_path / 'a'))[-1] == 'G_0005.dot'
+
+
+def test_watcher_skips_invalid_programs(tmp_path):
+    path = tmp_path / 'bad.gg'
+    path.write_text("undirected graph G { A -- B; };\nrun H with (output='x');\n")
+    watcher = Watcher(str(tmp_path), IncrementalBuilder(validate=True))
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        result, = watcher.start()
+
+    assert result.rebuilt == []
+    assert "Unknown graph 'H'" in result.errors[0].message
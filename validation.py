@@ -3,8 +3,10 @@ Semantic validation for the Graphgif AST.
 This module provides validation rules and error checking for the AST.
 """
 
-from typing import List, Dict, Set, Optional
-from graphgif_model import *
+from operator import itemgetter
+from typing import List, Dict, Set, Optional, Union
+from models import *
+from visitors import BaseASTVisitor
 
 
 class ValidationError(Exception):
@@ -46,10 +48,7 @@ class SemanticValidator(BaseASTVisitor):
             self.visit_var_decl(var_decl)
         
         for graph_decl in node.graph_declarations:
-            if graph_decl.name in self.graphs:
-                self.add_error(f"Duplicate graph name: {graph_decl.name}", graph_decl)
-            else:
-                self.graphs[graph_decl.name] = graph_decl
+            self.declare_graph(graph_decl)
         
         # Second pass: validate graph contents
         for graph_decl in node.graph_declarations:
@@ -83,46 +82,70 @@ class SemanticValidator(BaseASTVisitor):
     
     def visit_graph_decl(self, node: GraphDecl) -> None:
         """Validate graph declaration."""
-        self.current_graph_name = node.name
-        self.current_graph_nodes = set()
-        
-        # Validate global attributes
-        for global_attr in node.global_attributes:
-            self._validate_attribute_reference(global_attr.attributes, node)
+        self.begin_graph(node)
         
         # Collect all nodes declared in this graph
         for statement in node.statements:
             if isinstance(statement, NodeDecl):
-                if isinstance(statement.nodes, NodeList):
-                    self.current_graph_nodes.update(statement.nodes.nodes)
-                elif isinstance(statement.nodes, NodeVarRef):
-                    self._validate_node_var_ref(statement.nodes, node)
+                self.declare_nodes(statement, node)
         
         # Validate statements
         super().visit_graph_decl(node)
         
+        self.end_graph()
+    
+    # Checks making up the traversal, also run one statement at a time by analysis.ValidationPlugin
+    
+    def declare_graph(self, node: GraphDecl) -> None:
+        """Record a graph for the commands, reporting a duplicate name."""
+        if node.name in self.graphs:
+            self.add_error(f"Duplicate graph name: {node.name}", node)
+        else:
+            self.graphs[node.name] = node
+    
+    def begin_graph(self, node: GraphDecl) -> None:
+        """Start validating a graph's statements, checking its global attributes."""
+        self.current_graph_name = node.name
+        self.current_graph_nodes = set()
+        for global_attr in node.global_attributes:
+            self._validate_attribute_reference(global_attr.attributes, node)
+    
+    def declare_nodes(self, node: NodeDecl, graph: GraphDecl) -> None:
+        """Add the nodes of a node declaration to the current graph, checking a variable reference."""
+        if isinstance(node.nodes, NodeList):
+            self.current_graph_nodes.update(node.nodes.nodes)
+        elif isinstance(node.nodes, NodeVarRef):
+            self._validate_node_var_ref(node.nodes, graph)
+    
+    def end_graph(self) -> None:
         self.current_graph_name = None
         self.current_graph_nodes = set()
     
+    def validate_edge_endpoints(self, node: EdgeDecl) -> None:
+        """Warn about edge endpoints not declared in the current graph."""
+        if node.source not in self.current_graph_nodes:
+            self.add_warning(f"Edge source '{node.source}' not declared in current graph", node)
+        
+        if node.target not in self.current_graph_nodes:
+            self.add_warning(f"Edge target '{node.target}' not declared in current graph", node)
+    
+    def validate_attributes(self, node: Union[NodeDecl, EdgeDecl]) -> None:
+        """Check the attributes of a node or edge declaration."""
+        if node.attributes:
+            self._validate_attribute_reference(node.attributes, node)
+    
     def visit_node_decl(self, node: NodeDecl) -> None:
         """Validate node declaration."""
         if isinstance(node.nodes, NodeVarRef):
             self._validate_node_var_ref(node.nodes, node)
         
-        if node.attributes:
-            self._validate_attribute_reference(node.attributes, node)
+        self.validate_attributes(node)
     
     def visit_edge_decl(self, node: EdgeDecl) -> None:
         """Validate edge declaration."""
         # Check if nodes exist in current graph or are declared elsewhere
-        if node.source not in self.current_graph_nodes:
-            self.add_warning(f"Edge source '{node.source}' not declared in current graph", node)
-        
-        if node.target not in self.current_graph_nodes:
-            self.add_warning(f"Edge target '{node.target}' not declared in current graph", node)
-        
-        if node.attributes:
-            self._validate_attribute_reference(node.attributes, node)
+        self.validate_edge_endpoints(node)
+        self.validate_attributes(node)
     
     def visit_command(self, node: Command) -> None:
         """Validate command."""
@@ -131,7 +154,7 @@ class SemanticValidator(BaseASTVisitor):
         
         # Validate argument paths (basic validation)
         for arg in node.arguments:
-            if not arg.path.components:
+            if isinstance(arg.argument_value, Path) and not arg.argument_value.components:
                 self.add_error(f"Empty path in argument '{arg.name}'", node)
     
     def _validate_node_var_ref(self, var_ref: NodeVarRef, context_node: ASTNode):
@@ -206,6 +229,8 @@ class GraphAnalyzer(BaseASTVisitor):
     def reset(self):
         self.graphs = {}
         self.current_graph = None
+        # (graph name, 'weak' | 'strong') -> Components
+        self._components = {}
     
     def visit_program(self, node: Program) -> None:
         """Analyze all graphs in the program."""
@@ -214,6 +239,12 @@ class GraphAnalyzer(BaseASTVisitor):
     
     def visit_graph_decl(self, node: GraphDecl) -> None:
         """Analyze graph declaration."""
+        self.begin_graph_decl(node)
+        super().visit_graph_decl(node)
+        self.end_graph_decl(node)
+
+    def begin_graph_decl(self, node: GraphDecl) -> None:
+        """Start collecting a graph's information, before its statements are visited."""
         self.current_graph = {
             'name': node.name,
             'direction': node.direction,
@@ -229,11 +260,13 @@ class GraphAnalyzer(BaseASTVisitor):
             if isinstance(global_attr.attributes, AttrList):
                 attrs = {attr.key: attr.value.value for attr in global_attr.attributes.attributes}
                 self.current_graph['global_attributes'][global_attr.attr_type.value] = attrs
-        
-        super().visit_graph_decl(node)
-        
+
+    def end_graph_decl(self, node: GraphDecl) -> None:
+        """Record the graph collected since begin_graph_decl."""
         self.graphs[node.name] = self.current_graph
         self.current_graph = None
+        self._components.pop((node.name, 'weak'), None)
+        self._components.pop((node.name, 'strong'), None)
     
     def visit_node_decl(self, node: NodeDecl) -> None:
         """Analyze node declaration."""
@@ -248,6 +281,9 @@ class GraphAnalyzer(BaseASTVisitor):
     
     def visit_edge_decl(self, node: EdgeDecl) -> None:
         """Analyze edge declaration."""
+        if self.current_graph is None:
+            # Edges of edge variables belong to no graph until used
+            return
         edge_info = {
             'source': node.source,
             'target': node.target,
@@ -270,42 +306,176 @@ class GraphAnalyzer(BaseASTVisitor):
         """Get information about all graphs."""
         return self.graphs.copy()
     
-    def is_connected(self, graph_name: str) -> bool:
-        """Check if a graph is connected (simplified check)."""
+    def _edge_index(self, graph_name: str) -> Optional[tuple]:
+        """(nodes, sources, targets, symmetric) of a graph, with nodes as indices into nodes."""
         graph = self.get_graph_info(graph_name)
-        if not graph:
-            return False
-        
-        nodes = graph['nodes']
+        if graph is None:
+            return None
+        nodes = sorted(graph['nodes'])
+        index = {node: i for i, node in enumerate(nodes)}
         edges = graph['edges']
-        
-        if len(nodes) <= 1:
-            return True
-        
-        # Build adjacency list
-        adj = {node: set() for node in nodes}
-        for edge in edges:
-            adj[edge['source']].add(edge['target'])
-            if graph['direction'] == GraphDirection.UNDIRECTED or edge['operator'] == '--':
-                adj[edge['target']].add(edge['source'])
-        
-        # BFS to check connectivity
-        if not nodes:
-            return True
-        
-        start_node = next(iter(nodes))
-        visited = set()
-        queue = [start_node]
-        visited.add(start_node)
-        
-        while queue:
-            node = queue.pop(0)
-            for neighbor in adj[node]:
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    queue.append(neighbor)
-        
-        return len(visited) == len(nodes)
+        sources = list(map(index.__getitem__, map(itemgetter('source'), edges)))
+        targets = list(map(index.__getitem__, map(itemgetter('target'), edges)))
+        operators = list(map(itemgetter('operator'), edges))
+        # A <- B is an edge from B to A
+        for i in [i for i, operator in enumerate(operators) if operator == '<-']:
+            sources[i], targets[i] = targets[i], sources[i]
+        if graph['direction'] == GraphDirection.UNDIRECTED:
+            symmetric = [True] * len(edges)
+        else:
+            symmetric = [operator == '--' for operator in operators]
+        return nodes, sources, targets, symmetric
+
+    def weak_components(self, graph_name: str) -> Optional['Components']:
+        """Components of a graph ignoring edge directions, computed once per graph."""
+        key = (graph_name, 'weak')
+        if key not in self._components:
+            edge_index = self._edge_index(graph_name)
+            if edge_index is None:
+                return None
+            nodes, sources, targets, _ = edge_index
+            self._components[key] = Components(nodes, _weak_labels(len(nodes), sources, targets))
+        return self._components[key]
+
+    def strong_components(self, graph_name: str) -> Optional['Components']:
+        """Strongly connected components of a graph, computed once per graph."""
+        key = (graph_name, 'strong')
+        if key not in self._components:
+            edge_index = self._edge_index(graph_name)
+            if edge_index is None:
+                return None
+            nodes, sources, targets, symmetric = edge_index
+            adjacency = [[] for _ in nodes]
+            for source, target, both in zip(sources, targets, symmetric):
+                adjacency[source].append(target)
+                if both:
+                    adjacency[target].append(source)
+            self._components[key] = Components(nodes, _strong_labels(adjacency))
+        return self._components[key]
+
+    def is_connected(self, graph_name: str) -> bool:
+        """Check if a graph is (weakly) connected; unknown graphs are not."""
+        components = self.weak_components(graph_name)
+        return components is not None and components.count <= 1
+
+    def is_strongly_connected(self, graph_name: str) -> bool:
+        """Check if every node of a graph is reachable from every other one along edge directions."""
+        components = self.strong_components(graph_name)
+        return components is not None and components.count <= 1
+
+
+class Components:
+    """
+    Component labelling of a graph's nodes: labels[i] is the component of nodes[i].
+    Components are numbered from 0; see weak_components and strong_components for the order.
+    """
+
+    def __init__(self, nodes: List[str], labels: List[int]):
+        self.nodes = nodes
+        self.labels = labels
+        self.count = max(labels) + 1 if labels else 0
+        self._index = None
+
+    def sizes(self) -> List[int]:
+        """Number of nodes in each component."""
+        sizes = [0] * self.count
+        for label in self.labels:
+            sizes[label] += 1
+        return sizes
+
+    def component_of(self, node: str) -> int:
+        """Component of a node; raises KeyError for nodes not in the graph."""
+        if self._index is None:
+            self._index = {name: i for i, name in enumerate(self.nodes)}
+        return self.labels[self._index[node]]
+
+    def members(self, component: int) -> List[str]:
+        """Nodes of a component, in sorted order."""
+        return [node for node, label in zip(self.nodes, self.labels) if label == component]
+
+    def groups(self) -> List[List[str]]:
+        """Nodes of every component, indexed by component."""
+        groups = [[] for _ in range(self.count)]
+        for node, label in zip(self.nodes, self.labels):
+            groups[label].append(node)
+        return groups
+
+
+def _weak_labels(count: int, sources: List[int], targets: List[int]) -> List[int]:
+    """
+    Union-find with union by size and path halving. Components are numbered in the order
+    of their first node.
+    """
+    parent = list(range(count))
+    size = [1] * count
+    for a, b in zip(sources, targets):
+        while parent[a] != a:
+            parent[a] = a = parent[parent[a]]
+        while parent[b] != b:
+            parent[b] = b = parent[parent[b]]
+        if a == b:
+            continue
+        if size[a] < size[b]:
+            a, b = b, a
+        parent[b] = a
+        size[a] += size[b]
+
+    labels = []
+    numbers = {}
+    for node in range(count):
+        root = node
+        while parent[root] != root:
+            root = parent[root]
+        labels.append(numbers.setdefault(root, len(numbers)))
+    return labels
+
+
+def _strong_labels(adjacency: List[List[int]]) -> List[int]:
+    """
+    Tarjan's algorithm with an explicit stack, so depth is not bounded by the recursion limit.
+    Components are numbered as they are completed, which is a reverse topological order of
+    the condensed graph: no edge leads from a component to a higher-numbered one.
+    """
+    count = len(adjacency)
+    index = [-1] * count
+    low = [0] * count
+    on_stack = [False] * count
+    labels = [-1] * count
+    stack = []
+    counter = component = 0
+    for root in range(count):
+        if index[root] != -1:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, iter(adjacency[root]))]
+        while work:
+            node, neighbors = work[-1]
+            for neighbor in neighbors:
+                if index[neighbor] == -1:
+                    index[neighbor] = low[neighbor] = counter
+                    counter += 1
+                    stack.append(neighbor)
+                    on_stack[neighbor] = True
+                    work.append((neighbor, iter(adjacency[neighbor])))
+                    break
+                if on_stack[neighbor] and index[neighbor] < low[node]:
+                    low[node] = index[neighbor]
+            else:
+                work.pop()
+                if work and low[node] < low[work[-1][0]]:
+                    low[work[-1][0]] = low[node]
+                if low[node] == index[node]:
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        labels[member] = component
+                        if member == node:
+                            break
+                    component += 1
+    return labels
 
 
 def validate_ast(ast: Program) -> SemanticValidator:
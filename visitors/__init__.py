@@ -1,15 +1,29 @@
 """
 Visitor classes for GraphGif AST traversal.
 This package provides visitor pattern implementations for AST analysis and transformation.
+Visitors are imported from their modules on first use.
 """
 
-from .base_visitor import ASTVisitor, BaseASTVisitor
-from .pretty_printer import GraphgifPrettyPrinter
-from .statistics_visitor import GraphStatisticsVisitor
+from importlib import import_module
 
-__all__ = [
-    'ASTVisitor',
-    'BaseASTVisitor', 
-    'GraphgifPrettyPrinter',
-    'GraphStatisticsVisitor'
-]
+# Public names and the modules defining them
+_LAZY = {
+    'ASTVisitor': '.base_visitor',
+    'BaseASTVisitor': '.base_visitor',
+    'GraphgifPrettyPrinter': '.pretty_printer',
+    'GraphStatisticsVisitor': '.statistics_visitor',
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
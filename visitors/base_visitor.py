@@ -1,14 +1,48 @@
 """
 Base visitor classes for GraphGif AST traversal.
 This module provides the visitor pattern implementation for AST traversal.
+visit(node) dispatches on type(node) through a table resolved once per visitor class;
+walk(node) traverses iteratively, calling enter_*/leave_* methods instead of visit_*.
 """
 
 from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional
 from models import (
     Program, VarDecl, GraphDecl, NodeDecl, EdgeDecl, Command,
     AttrList, NodeList, EdgeList
 )
 
+# Method name suffix of each visitable AST class; subclasses of these dispatch like their base
+NODE_NAMES = {
+    Program: 'program',
+    VarDecl: 'var_decl',
+    GraphDecl: 'graph_decl',
+    NodeDecl: 'node_decl',
+    EdgeDecl: 'edge_decl',
+    Command: 'command',
+    AttrList: 'attr_list',
+    NodeList: 'node_list',
+    EdgeList: 'edge_list',
+}
+
+# Children of each visitable AST class, in the order BaseASTVisitor visits them.
+# Children that are not visitable (None, variable references) are skipped.
+CHILDREN: Dict[type, Callable[[Any], list]] = {
+    Program: lambda node: [*node.variable_declarations, *node.graph_declarations, *node.commands],
+    VarDecl: lambda node: [node.value],
+    GraphDecl: lambda node: [*(attr.attributes for attr in node.global_attributes), *node.statements],
+    NodeDecl: lambda node: [node.nodes, node.attributes],
+    EdgeDecl: lambda node: [node.attributes],
+    EdgeList: lambda node: node.edges,
+}
+
+
+def _node_name(node_type: type) -> Optional[str]:
+    for base in node_type.__mro__:
+        if base in NODE_NAMES:
+            return NODE_NAMES[base]
+    return None
+
 
 class ASTVisitor(ABC):
     """Abstract visitor for traversing the AST."""
@@ -55,49 +89,105 @@ class ASTVisitor(ABC):
 
 
 class BaseASTVisitor(ASTVisitor):
-    """Base implementation of AST visitor with default traversal behavior."""
-    
+    """
+    Base implementation of AST visitor with default traversal behavior.
+    Method tables are built per visitor class on first use, so methods added to a class
+    afterwards are not picked up.
+    """
+
+    # Per class: AST type -> visit_* function, or None for types without one
+    _visit_table: Dict[type, Optional[Callable]] = {}
+    # Per class: AST type -> (enter_*, leave_*, children) for walk, or None
+    _walk_table: Dict[type, Optional[tuple]] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._visit_table = {}
+        cls._walk_table = {}
+
+    def visit(self, node: Any) -> Any:
+        """Dispatch node to its visit_* method; values without one (None, variable references) are ignored."""
+        table = self._visit_table
+        try:
+            method = table[type(node)]
+        except KeyError:
+            name = _node_name(type(node))
+            method = table[type(node)] = getattr(type(self), f'visit_{name}', None) if name else None
+        if method is not None:
+            return method(self, node)
+        return None
+
+    def walk(self, node: Any) -> None:
+        """
+        Traverse node and its descendants in visiting order without recursion, calling
+        enter_<name>(node) before a node's children and leave_<name>(node) after them
+        (e.g. enter_graph_decl), for whichever of these methods the visitor defines.
+        """
+        table = self._walk_table
+        stack: List[tuple] = [(node, False)]
+        while stack:
+            node, leaving = stack.pop()
+            try:
+                entry = table[type(node)]
+            except KeyError:
+                entry = table[type(node)] = self._walk_entry(type(node))
+            if entry is None:
+                continue
+            enter, leave, children = entry
+            if leaving:
+                leave(self, node)
+                continue
+            if enter is not None:
+                enter(self, node)
+            if leave is not None:
+                stack.append((node, True))
+            if children is not None:
+                stack.extend((child, False) for child in reversed(children(node)))
+
+    @classmethod
+    def _walk_entry(cls, node_type: type) -> Optional[tuple]:
+        name = _node_name(node_type)
+        if name is None:
+            return None
+        children = next((CHILDREN[base] for base in node_type.__mro__ if base in CHILDREN), None)
+        return getattr(cls, f'enter_{name}', None), getattr(cls, f'leave_{name}', None), children
+
     def visit_program(self, node: Program) -> None:
         """Visit a Program node and traverse its children."""
+        visit = self.visit
         for var_decl in node.variable_declarations:
-            self.visit_var_decl(var_decl)
+            visit(var_decl)
         for graph_decl in node.graph_declarations:
-            self.visit_graph_decl(graph_decl)
+            visit(graph_decl)
         for command in node.commands:
-            self.visit_command(command)
+            visit(command)
     
     def visit_var_decl(self, node: VarDecl) -> None:
         """Visit a VarDecl node."""
-        if isinstance(node.value, NodeList):
-            self.visit_node_list(node.value)
-        elif isinstance(node.value, AttrList):
-            self.visit_attr_list(node.value)
-        elif isinstance(node.value, EdgeList):
-            for edge in node.value.edges:
-                self.visit_edge_decl(edge)
+        self.visit(node.value)
+
+    def visit_edge_list(self, node: EdgeList) -> None:
+        """Visit an EdgeList node and its edges."""
+        visit = self.visit
+        for edge in node.edges:
+            visit(edge)
     
     def visit_graph_decl(self, node: GraphDecl) -> None:
         """Visit a GraphDecl node and traverse its children."""
+        visit = self.visit
         for global_attr in node.global_attributes:
-            if isinstance(global_attr.attributes, AttrList):
-                self.visit_attr_list(global_attr.attributes)
+            visit(global_attr.attributes)
         for statement in node.statements:
-            if isinstance(statement, NodeDecl):
-                self.visit_node_decl(statement)
-            elif isinstance(statement, EdgeDecl):
-                self.visit_edge_decl(statement)
+            visit(statement)
     
     def visit_node_decl(self, node: NodeDecl) -> None:
         """Visit a NodeDecl node."""
-        if isinstance(node.nodes, NodeList):
-            self.visit_node_list(node.nodes)
-        if isinstance(node.attributes, AttrList):
-            self.visit_attr_list(node.attributes)
+        self.visit(node.nodes)
+        self.visit(node.attributes)
     
     def visit_edge_decl(self, node: EdgeDecl) -> None:
         """Visit an EdgeDecl node."""
-        if isinstance(node.attributes, AttrList):
-            self.visit_attr_list(node.attributes)
+        self.visit(node.attributes)
     
     def visit_command(self, node: Command) -> None:
         """Visit a Command node."""
@@ -33,12 +33,12 @@ class GraphStatisticsVisitor(BaseASTVisitor):
     
     def visit_var_decl(self, node: VarDecl) -> None:
         """Count variable declarations."""
-        self.variable_count += 1
+        self.count_variable(node)
         super().visit_var_decl(node)
     
     def visit_graph_decl(self, node: GraphDecl) -> None:
         """Count graph declarations."""
-        self.graph_count += 1
+        self.count_graph(node)
         super().visit_graph_decl(node)
     
     def visit_node_decl(self, node: NodeDecl) -> None:
@@ -49,16 +49,34 @@ class GraphStatisticsVisitor(BaseASTVisitor):
     
     def visit_edge_decl(self, node: EdgeDecl) -> None:
         """Count edge declarations and collect edge information."""
+        self.count_edge(node)
+        super().visit_edge_decl(node)
+    
+    def visit_command(self, node: Command) -> None:
+        """Count commands."""
+        self.count_command(node)
+        super().visit_command(node)
+    
+    # Counting of a single node, also done one node at a time by analysis.StatisticsPlugin
+    
+    def count_variable(self, node: VarDecl) -> None:
+        """Count a variable declaration."""
+        self.variable_count += 1
+    
+    def count_graph(self, node: GraphDecl) -> None:
+        """Count a graph declaration."""
+        self.graph_count += 1
+    
+    def count_edge(self, node: EdgeDecl) -> None:
+        """Count an edge declaration and record its endpoints."""
         self.edge_count += 1
         self.edges.append((node.source, node.target))
         self.nodes.add(node.source)
         self.nodes.add(node.target)
-        super().visit_edge_decl(node)
     
-    def visit_command(self, node: Command) -> None:
-        """Count commands."""
+    def count_command(self, node: Command) -> None:
+        """Count a command."""
         self.command_count += 1
-        super().visit_command(node)
     
     def visit_node_list(self, node: NodeList) -> None:
         """Collect nodes from node lists."""
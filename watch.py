@@ -0,0 +1,123 @@
+"""
+Watch mode for GraphGif.
+    python watch.py DIR [--backend antlr] [--interval 0.5] [--debounce 0.3]
+polls a directory for .gg files by mtime and size, waits for bursts of edits to settle and
+rebuilds the changed files incrementally. Parser, caches and fingerprints stay loaded between
+rebuilds, so only the first build pays for imports and grammar deserialisation.
+"""
+
+import os
+import sys
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from errors import GraphgifError
+from incremental import BuildResult, IncrementalBuilder, parse_declarations
+
+DEFAULT_INTERVAL = 0.5  # seconds between scans
+DEFAULT_DEBOUNCE = 0.3  # seconds without changes before rebuilding
+
+# Program parsed at startup to load the parser and fill its prediction caches
+WARM_UP_SOURCE = """
+var node warm = A, B;
+var attributes style = [color='red'];
+directed graph Warm {
+    node $style;
+    $warm;
+    A -> B [label='x'];
+};
+run Warm with (algorithm=bfs);
+"""
+
+
+def warm_up(backend: str):
+    """Parse a small program so the first real rebuild finds the parser ready."""
+    parse_declarations(WARM_UP_SOURCE, backend)
+
+
+class Watcher:
+    """
+    Polls directory for .gg files and rebuilds them through an IncrementalBuilder.
+    A change is acted on once debounce seconds pass without further changes.
+    """
+
+    def __init__(self, directory: str, builder: IncrementalBuilder, interval: float = DEFAULT_INTERVAL,
+                 debounce: float = DEFAULT_DEBOUNCE, extension: str = '.gg'):
+        self.directory = directory
+        self.builder = builder
+        self.interval = interval
+        self.debounce = debounce
+        self.extension = extension
+        self._snapshot: Dict[str, Tuple[int, int]] = {}
+        self._pending: Set[str] = set()
+        self._last_change = None
+
+    def scan(self) -> Dict[str, Tuple[int, int]]:
+        """(mtime, size) of every watched file, by absolute path."""
+        files = {}
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if name.endswith(self.extension):
+                    path = os.path.abspath(os.path.join(root, name))
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    files[path] = (stat.st_mtime_ns, stat.st_size)
+        return files
+
+    def start(self) -> List[BuildResult]:
+        """Take the initial snapshot and build every file; unchanged graphs are skipped."""
+        self._snapshot = self.scan()
+        return self.rebuild(sorted(self._snapshot))
+
+    def poll(self, now: Optional[float] = None) -> List[BuildResult]:
+        """Scan once; rebuild the changed files if they have settled."""
+        now = time.monotonic() if now is None else now
+        current = self.scan()
+        changed = {path for path in current.keys() | self._snapshot.keys()
+                   if current.get(path) != self._snapshot.get(path)}
+        self._snapshot = current
+        if changed:
+            self._pending |= changed
+            self._last_change = now
+            return []
+        if self._pending and now - self._last_change >= self.debounce:
+            paths = sorted(self._pending)
+            self._pending.clear()
+            return self.rebuild(paths)
+        return []
+
+    def rebuild(self, paths: List[str]) -> List[BuildResult]:
+        results = []
+        for path in paths:
+            if path not in self._snapshot:
+                self.builder.forget(path)
+                continue
+            try:
+                results.append(self.builder.build_file(path))
+            except (GraphgifError, OSError, ValueError) as e:
+                # Keep watching; the next edit of the file gets another chance
+                print(f"{path}: {e}", file=sys.stderr)
+        return results
+
+    def run(self):
+        for result in self.start():
+            report(result)
+        while True:
+            time.sleep(self.interval)
+            for result in self.poll():
+                report(result)
+
+
+def report(result: BuildResult):
+    if result.errors:
+        print(f"{result.path}: {len(result.errors)} errors")
+        return
+    rebuilt = ', '.join(result.rebuilt) or 'nothing'
+    print(f"{result.path}: rebuilt {rebuilt} ({len(result.unchanged)} unchanged)")
+
+
+if __name__ == "__main__":
+    from cli import main
+    sys.exit(main(['watch', *sys.argv[1:]]))